@@ -1,5 +1,7 @@
+import bisect
 import pygame
 import laser  # Import the laser module
+from assets import load_image
 # Re-confirming imports and structure
 
 # Alien specific constants
@@ -8,12 +10,17 @@ ALIEN_LASER_SPEED = 4
 FRENZY_SPEED_MULTIPLIER = 2.0 # Example: Aliens move twice as fast in frenzy mode
 
 class Alien(pygame.sprite.Sprite):
-    def __init__(self, type, x, y): # Removed speed_modifier parameter
+    # A round creates dozens of these; slots keep per-instance attributes out of __dict__
+    __slots__ = ("type", "image", "rect", "base_speed", "is_frenzied", "column", "row")
+
+    def __init__(self, type, x, y, column=0, row=0): # Removed speed_modifier parameter
         super().__init__()
         self.type = type
+        self.column = column # Slot in the formation; aliens created on their own share column 0
+        self.row = row
         path = f"Graphics/alien_{type}.png"
         try:
-            self.image = pygame.image.load(path).convert_alpha()
+            self.image = load_image(path) # Shared by every alien of this type
         except (pygame.error, FileNotFoundError) as e:
             print(f"Warning: Could not load alien graphic '{path}'. Error: {e}. Using placeholder for alien.")
             self.image = pygame.Surface((30, 30))
@@ -42,3 +49,26 @@ class Alien(pygame.sprite.Sprite):
         laser_instance = laser.AlienLaser(self.rect.center, laser_speed, screen_height)
         return laser_instance
 
+
+class AlienFormation(pygame.sprite.Group):
+    # The aliens group, plus an index of each column's living aliens ordered top to bottom.
+    # Kills, empty() and add() all go through add_internal/remove_internal, so the index
+    # stays current without rescanning, and the front line is one lookup per column.
+    def __init__(self, *sprites):
+        self.columns = {} # column -> living aliens in that column, top row first
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        bisect.insort(self.columns.setdefault(sprite.column, []), sprite, key=lambda alien: alien.row)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        column = self.columns[sprite.column]
+        column.remove(sprite)
+        if not column:
+            del self.columns[sprite.column]
+
+    def front_line(self):
+        # The lowest living alien of every column, i.e. the ones with a clear shot
+        return [column[-1] for column in self.columns.values()]
@@ -0,0 +1,137 @@
+# On-disk cache of decoded assets, in the spirit of build/web-cache: entries are named by
+# a hash of the source file's bytes plus everything that shapes the decoded result (cache
+# version, the display's pixel format, the mixer's sample format), so a changed asset,
+# display or mixer setup simply misses and writes a new entry.
+#
+# Images are stored as raw pixels already in the display's native layout and come back
+# as surfaces over a copy-on-write memory map of the entry (no PNG decode, no convert, and
+# no copy unless something draws on the image, which then changes only its own pages).
+# Sounds are stored as the mixer's PCM and handed to pygame.mixer.Sound(buffer=...), which
+# skips the OGG decode. Music is streamed by pygame.mixer.music and isn't cached.
+#
+# assets.py uses this once main.py enables it; anything that goes wrong here falls back to
+# decoding the original file.
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import pygame
+
+# Asset cache specific constants
+ASSET_CACHE_DIR = os.path.join("build", "asset-cache")
+ASSET_CACHE_VERSION = 1
+MAGIC = b"EIAC"
+HEADER = struct.Struct("<4sHBxHH4s") # magic, version, kind, width, height, pixel layout
+KIND_IMAGE = 1
+KIND_SOUND = 2
+DATA_OFFSET = 32 # Pixel data starts aligned, after the header
+
+def _pixel_layout(surface):
+    # The byte order of a 32-bit surface's pixels as a frombuffer()/tobytes() format,
+    # e.g. "BGRA" for the usual little-endian ARGB8888 display format; None if unusual
+    if surface.get_bytesize() != 4:
+        return None
+    channels = dict(zip("RGBA", surface.get_masks()))
+    layout = ""
+    for index in range(4):
+        shift = 8 * (index if sys.byteorder == "little" else 3 - index)
+        channel = next((name for name, mask in channels.items() if mask == 0xFF << shift), None)
+        if channel is None:
+            return None
+        layout += channel
+    return layout
+
+class AssetCache:
+    def __init__(self, directory=ASSET_CACHE_DIR):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._maps = [] # Open memory maps backing cached surfaces; they live as long as the process
+
+    def _entry_path(self, source_bytes, *variant):
+        key = hashlib.sha1(source_bytes)
+        key.update(repr((ASSET_CACHE_VERSION,) + variant).encode())
+        return os.path.join(self.directory, key.hexdigest() + ".bin")
+
+    def _write(self, path, header, payload):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temporary_path = path + ".tmp"
+            with open(temporary_path, "wb") as entry:
+                entry.write(header.ljust(DATA_OFFSET, b"\0"))
+                entry.write(payload)
+            os.replace(temporary_path, path) # Never leave a half-written entry under the real name
+        except OSError as e:
+            print(f"Warning: Could not write asset cache entry '{path}'. Error: {e}. It will be decoded again next launch.")
+
+    def _map(self, path, kind):
+        # The entry's memory map, or None if it's missing or doesn't look like a current entry
+        try:
+            with open(path, "rb") as entry:
+                # Copy-on-write: a read-only map would make drawing on the image crash the process
+                mapped = mmap.mmap(entry.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            return None, None
+        header = HEADER.unpack_from(mapped) if len(mapped) >= DATA_OFFSET else None
+        if not header or header[0] != MAGIC or header[1] != ASSET_CACHE_VERSION or header[2] != kind:
+            mapped.close()
+            return None, None
+        return mapped, header
+
+    def load_image(self, path):
+        # Same result as pygame.image.load(path).convert_alpha(); raises like it on failure
+        with open(path, "rb") as source:
+            source_bytes = source.read()
+        display_format = pygame.display.get_surface()
+        variant = (KIND_IMAGE, display_format.get_bitsize(), display_format.get_masks()) if display_format else (KIND_IMAGE,)
+        entry_path = self._entry_path(source_bytes, *variant)
+
+        mapped, header = self._map(entry_path, KIND_IMAGE)
+        if mapped:
+            _, _, _, width, height, layout = header
+            try:
+                image = pygame.image.frombuffer(memoryview(mapped)[DATA_OFFSET:], (width, height), layout.decode())
+                self._maps.append(mapped)
+                self.hits += 1
+                return image
+            except (ValueError, pygame.error) as e:
+                mapped.close()
+                print(f"Warning: Could not use cached '{path}'. Error: {e}. Decoding it instead.")
+
+        self.misses += 1
+        image = pygame.image.load(path).convert_alpha()
+        layout = _pixel_layout(image)
+        if layout:
+            header = HEADER.pack(MAGIC, ASSET_CACHE_VERSION, KIND_IMAGE, image.get_width(), image.get_height(), layout.encode())
+            self._write(entry_path, header, pygame.image.tobytes(image, layout))
+        return image
+
+    def load_sound(self, path):
+        # Same result as pygame.mixer.Sound(path); raises like it (e.g. mixer not initialized)
+        mixer_format = pygame.mixer.get_init()
+        if not mixer_format:
+            raise pygame.error("mixer not initialized")
+        with open(path, "rb") as source:
+            source_bytes = source.read()
+        entry_path = self._entry_path(source_bytes, KIND_SOUND, mixer_format)
+
+        mapped, _ = self._map(entry_path, KIND_SOUND)
+        if mapped:
+            try:
+                sound = pygame.mixer.Sound(buffer=memoryview(mapped)[DATA_OFFSET:]) # Copied into the mixer's own chunk
+                self.hits += 1
+                return sound
+            except pygame.error as e:
+                print(f"Warning: Could not use cached '{path}'. Error: {e}. Decoding it instead.")
+            finally:
+                mapped.close()
+
+        self.misses += 1
+        sound = pygame.mixer.Sound(path)
+        self._write(entry_path, HEADER.pack(MAGIC, ASSET_CACHE_VERSION, KIND_SOUND, 0, 0, b"PCM "), sound.get_raw())
+        return sound
+
+    def report(self):
+        return f"{self.hits} cached, {self.misses} decoded ({self.directory})"
@@ -0,0 +1,76 @@
+import pygame
+
+# Decoded images and plain-colour sprite surfaces are shared by every sprite that uses
+# them, instead of each of the 1,000+ sprites in a round holding its own copy.
+# Sprites never draw onto their image, so sharing is safe.
+_images = {}
+_solid_surfaces = {}
+_sounds = {}
+_masks = {} # surface -> its collision mask, or None when every pixel is solid
+_full_masks = {}
+_disk_cache = None # asset_cache.AssetCache once enabled; decoded files are then kept on disk between launches
+
+def enable_disk_cache(directory=None):
+    # Off by default (tests and tools decode as before); main.py turns it on
+    global _disk_cache
+    from asset_cache import AssetCache, ASSET_CACHE_DIR
+    _disk_cache = AssetCache(directory or ASSET_CACHE_DIR)
+    return _disk_cache
+
+def disable_disk_cache():
+    global _disk_cache
+    _disk_cache = None
+
+def load_image(path):
+    # Raises like pygame.image.load() on failure, so callers keep their own fallbacks
+    image = _images.get(path)
+    if image is None:
+        image = _disk_cache.load_image(path) if _disk_cache else pygame.image.load(path).convert_alpha()
+        _images[path] = image
+    return image
+
+def load_sound(path, volume):
+    # Decoding an OGG is the slow part of building a spaceship, so each file is decoded
+    # once. Raises like pygame.mixer.Sound() (including when the mixer isn't initialized).
+    sound = _sounds.get(path)
+    if sound is None:
+        sound = _disk_cache.load_sound(path) if _disk_cache else pygame.mixer.Sound(path)
+        _sounds[path] = sound
+    sound.set_volume(volume)
+    return sound
+
+def solid_surface(size, color):
+    key = (size, color)
+    surface = _solid_surfaces.get(key)
+    if surface is None:
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        _solid_surfaces[key] = surface
+    return surface
+
+def mask_for(surface):
+    # Built the first time a surface is tested, then shared like the surface itself. Fully
+    # opaque surfaces (lasers, bombs, blocks) get None: their rect is already exact.
+    try:
+        return _masks[surface]
+    except KeyError:
+        mask = pygame.mask.from_surface(surface)
+        if mask.count() == surface.get_width() * surface.get_height():
+            mask = None
+        _masks[surface] = mask
+        return mask
+
+def full_mask(size):
+    # Solid masks for testing a plain rectangle (like a projectile's swept rect) against a mask
+    mask = _full_masks.get(size)
+    if mask is None:
+        mask = pygame.mask.Mask(size, fill=True)
+        _full_masks[size] = mask
+    return mask
+
+def clear_cache():
+    _images.clear()
+    _solid_surfaces.clear()
+    _sounds.clear()
+    _masks.clear()
+    _full_masks.clear()
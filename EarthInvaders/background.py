@@ -0,0 +1,60 @@
+import collections
+import sys
+import threading
+
+# Browser builds (pygbag) have no threads; there the queued work is drained by pump() instead
+THREADS_AVAILABLE = sys.platform != "emscripten"
+
+class BatchWorker:
+    # Hands queued items to a sink in batches on a daemon thread, keeping file and
+    # network I/O off the frame path. put() is a plain deque append, which is atomic,
+    # so the game loop never waits on a lock.
+    def __init__(self, sink, max_batch=512, interval=0.25, threaded=None, name="batch-worker"):
+        self.sink = sink
+        self.max_batch = max_batch
+        self.interval = interval # Seconds between drains when nobody calls wake()
+        self.threaded = THREADS_AVAILABLE if threaded is None else threaded
+        self.items = collections.deque()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+        if self.threaded:
+            self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+            self._thread.start()
+
+    def put(self, item):
+        self.items.append(item)
+
+    def wake(self):
+        # Ask the worker to drain now instead of at the next interval
+        self._wakeup.set()
+
+    def pump(self):
+        # Without a thread, call this from somewhere cheap (e.g. an idle screen)
+        if not self.threaded:
+            self._drain()
+
+    def _drain(self):
+        while self.items:
+            batch = []
+            while self.items and len(batch) < self.max_batch:
+                batch.append(self.items.popleft())
+            try:
+                self.sink(batch)
+            except Exception as e:
+                print(f"Warning: Background {self.sink.__qualname__} failed on a batch of {len(batch)}. Error: {e}")
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self._drain()
+
+    def close(self):
+        # Flushes everything still queued
+        if self._thread:
+            self._stopping = True
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+        self._drain()
@@ -1,4 +1,5 @@
 import pygame
+from assets import solid_surface
 
 # Bomb specific constants
 BOMB_SURFACE_WIDTH = 12
@@ -8,15 +9,19 @@ BOMB_COLOR_G = 165
 BOMB_COLOR_B = 0
 
 class Bomb(pygame.sprite.Sprite):
+    __slots__ = ("image", "rect", "swept_rect", "speed", "screen_height")
+
     def __init__(self, position, speed, screen_height):
         super().__init__()
-        self.image = pygame.Surface((BOMB_SURFACE_WIDTH, BOMB_SURFACE_HEIGHT))  # A bit larger and different aspect ratio than lasers
-        self.image.fill((BOMB_COLOR_R, BOMB_COLOR_G, BOMB_COLOR_B))  # Dark red color for bombs
+        # A bit larger and different aspect ratio than lasers, dark orange
+        self.image = solid_surface((BOMB_SURFACE_WIDTH, BOMB_SURFACE_HEIGHT), (BOMB_COLOR_R, BOMB_COLOR_G, BOMB_COLOR_B))
         self.rect = self.image.get_rect(center=position)
+        self.swept_rect = self.rect.copy() # Everything the bomb passed through this frame
         self.speed = speed
         self.screen_height = screen_height
 
     def update(self):
         self.rect.y += self.speed  # Move downwards
+        self.swept_rect.update(self.rect.x, self.rect.y - self.speed, self.rect.width, self.rect.height + self.speed)
         if self.rect.top > self.screen_height:
             self.kill()
@@ -0,0 +1,155 @@
+# Gameplay video capture. The game loop copies each frame into the next free surface of
+# a preallocated ring (one blit, no allocation) and a writer thread saves filled slots as
+# a PNG sequence or appends them to a raw RGB file. If the writer falls a whole ring
+# behind, frames are dropped and counted instead of making the loop wait.
+#
+# In the game: F9 starts and stops capturing (see main.py --capture-format / --capture-dir).
+# Headless, with the bot playing:
+#   python capture.py --frames 1800 --format raw
+# then e.g.
+#   ffmpeg -f rawvideo -pix_fmt rgb24 -s 750x700 -r 60 -i captures/<session>/frames-750x700.rgb out.mp4
+#
+# Run from the EarthInvaders directory (assets are loaded by relative path).
+
+import os
+import sys
+import threading
+import time
+import pygame
+from background import THREADS_AVAILABLE
+
+# Capture specific constants
+CAPTURE_DIR = "captures"
+CAPTURE_FORMATS = ("png", "raw")
+RING_SLOTS = 16 # About a quarter of a second of slack at 60 FPS
+WRITER_IDLE_WAIT_S = 0.1
+
+class FrameCapture:
+    def __init__(self, size, directory=CAPTURE_DIR, format="png", slots=RING_SLOTS, threaded=None):
+        if format not in CAPTURE_FORMATS:
+            raise ValueError(f"Unknown capture format {format!r}, expected one of {CAPTURE_FORMATS}")
+        self.size = tuple(size)
+        self.format = format
+        self.directory = os.path.join(directory, time.strftime("%Y%m%d-%H%M%S"))
+        self._ring = [pygame.Surface(self.size) for _ in range(slots)]
+        self._head = 0 # Frames copied in; only the game loop writes it
+        self._tail = 0 # Frames written out; only the writer writes it
+        self.dropped = 0
+        self.written = 0
+        self.failed = False
+        self._raw_file = None
+
+        self.threaded = THREADS_AVAILABLE if threaded is None else threaded
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+        if self.threaded:
+            self._thread = threading.Thread(target=self._run, name="frame-capture", daemon=True)
+            self._thread.start()
+
+    @property
+    def captured(self):
+        return self._head
+
+    def capture(self, surface):
+        # Called by the game loop with the finished frame
+        if self.failed or self._head - self._tail >= len(self._ring):
+            self.dropped += 1
+            return False
+        self._ring[self._head % len(self._ring)].blit(surface, (0, 0))
+        self._head += 1
+        self._wakeup.set()
+        return True
+
+    def pump(self):
+        # Without a writer thread, frames are only written when this is called
+        if not self.threaded:
+            self._write_pending()
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(WRITER_IDLE_WAIT_S)
+            self._wakeup.clear()
+            self._write_pending()
+        self._write_pending()
+
+    def _write_pending(self):
+        while self._tail < self._head and not self.failed:
+            frame = self._ring[self._tail % len(self._ring)]
+            try:
+                self._write(frame, self._tail)
+            except (OSError, pygame.error) as e:
+                print(f"Warning: Could not write captured frame to '{self.directory}'. Error: {e}. Capture stopped.")
+                self.failed = True
+                return
+            self.written += 1
+            self._tail += 1 # Only now may the loop reuse the slot
+
+    def _write(self, frame, index):
+        if self._raw_file is None and not os.path.isdir(self.directory):
+            os.makedirs(self.directory, exist_ok=True)
+        if self.format == "png":
+            pygame.image.save(frame, os.path.join(self.directory, f"frame-{index:06d}.png"))
+        else:
+            if self._raw_file is None:
+                self._raw_file = open(os.path.join(self.directory, f"frames-{self.size[0]}x{self.size[1]}.rgb"), "wb")
+            self._raw_file.write(pygame.image.tobytes(frame, "RGB"))
+
+    def close(self):
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+        else:
+            self._write_pending()
+        if self._raw_file:
+            self._raw_file.close()
+            self._raw_file = None
+
+    def report(self):
+        return f"{self.captured} frames captured, {self.written} written, {self.dropped} dropped -> {self.directory}"
+
+def _capture_bot_session(args):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from game import Game
+    from input_provider import BotInput
+    from render_queue import RenderQueue, queue_game_scene
+
+    pygame.init()
+    screen = pygame.display.set_mode((750, 700))
+    bot = BotInput()
+    game = Game(750, 700, input_provider=bot)
+    bot.game = game
+    render_queue = RenderQueue()
+    clock = pygame.time.Clock()
+    capture = FrameCapture(screen.get_size(), directory=args.out, format=args.format)
+    started = time.perf_counter()
+    try:
+        for _ in range(args.frames):
+            pygame.event.pump()
+            bot.begin_frame(())
+            if game.game_over:
+                game.reset_game(new_round_started=False)
+            game.update()
+            screen.fill((0, 0, 0))
+            queue_game_scene(render_queue, game)
+            render_queue.flush(screen)
+            capture.capture(screen)
+            capture.pump()
+            if args.fps:
+                clock.tick(args.fps)
+    finally:
+        capture.close()
+        pygame.quit()
+    print(f"Capture: {capture.report()} in {time.perf_counter() - started:.1f}s")
+    return 1 if capture.failed else 0
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Capture a bot-played Earth Invaders session")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--format", choices=CAPTURE_FORMATS, default="png")
+    parser.add_argument("--out", default=CAPTURE_DIR)
+    parser.add_argument("--fps", type=int, default=60, help="Pace the game like a real session (0 runs unthrottled)")
+    sys.exit(_capture_bot_session(parser.parse_args()))
@@ -0,0 +1,96 @@
+# Swept collision for projectiles. Lasers and bombs keep a swept_rect covering everything
+# they passed through during their last update, and these helpers test that instead of
+# where they ended up, so a projectile moving further than a target is tall in one frame
+# still hits it. They follow pygame.sprite.groupcollide/spritecollide, including the kill
+# flags, and keep to one C-level colliderect per pair like the pygame defaults do.
+#
+# With pixel_perfect, pairs whose rects overlap are then checked against the target's
+# mask, so shots through the transparent corners of aliens, the super alien and the
+# spaceship miss. Masks come from assets.mask_for (built once per image), and only the
+# few pairs that pass the rect test ever touch one. Benchmark: python collision.py
+
+from assets import mask_for, full_mask
+
+def swept_rect(sprite):
+    # Sprites that don't move in steps (aliens, blocks, the spaceship) are tested where they are
+    return getattr(sprite, "swept_rect", sprite.rect)
+
+def rect_hits_sprite_pixels(rect, sprite):
+    # Whether a solid rectangle covers any opaque pixel of sprite (its rects already overlap)
+    mask = mask_for(sprite.image)
+    if mask is None:
+        return True # Solid image: the rect test was exact
+    offset = (rect.x - sprite.rect.x, rect.y - sprite.rect.y)
+    return mask.overlap(full_mask(rect.size), offset) is not None
+
+def sweep_groupcollide(projectiles, targets, kill_projectiles, kill_targets, pixel_perfect=False):
+    # {projectile: [targets it swept through]}, like pygame.sprite.groupcollide
+    collisions = {}
+    for projectile in projectiles.sprites():
+        swept = swept_rect(projectile)
+        swept_colliderect = swept.colliderect
+        hit = [target for target in targets if swept_colliderect(target.rect)]
+        if hit and pixel_perfect:
+            hit = [target for target in hit if rect_hits_sprite_pixels(swept, target)]
+        if hit:
+            collisions[projectile] = hit
+            if kill_projectiles:
+                projectile.kill()
+            if kill_targets: # Straight away, so a second projectile can't hit the same target
+                for target in hit:
+                    target.kill()
+    return collisions
+
+def sweep_spritecollide(sprite, projectiles, kill_projectiles, pixel_perfect=False):
+    # Projectiles that swept through sprite, like pygame.sprite.spritecollide
+    colliderect = sprite.rect.colliderect
+    hit = [projectile for projectile in projectiles if colliderect(swept_rect(projectile))]
+    if hit and pixel_perfect:
+        hit = [projectile for projectile in hit if rect_hits_sprite_pixels(swept_rect(projectile), sprite)]
+    if kill_projectiles:
+        for projectile in hit:
+            projectile.kill()
+    return hit
+
+def _benchmark(frames=20000):
+    # Player lasers against a full formation, the game's largest per-frame test. Nothing is
+    # killed, so lasers keep overlapping aliens far longer than in play (where a hit ends the
+    # laser); that makes this an upper bound on what the mask tests add.
+    import os
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from game import Game
+    from laser import Laser
+
+    pygame.init()
+    pygame.display.set_mode((750, 700))
+    game = Game(750, 700)
+    aliens = game.aliens_group
+    columns = sorted({alien.rect.left for alien in aliens})
+    lasers = pygame.sprite.Group()
+    for index, left in enumerate(columns[:3]):
+        laser = Laser((left + 1 + index * 15, 0), 7, 700)
+        lasers.add(laser)
+
+    def run(pixel_perfect):
+        hits = 0
+        started = time.perf_counter()
+        for frame in range(frames):
+            y = frame % 700 # Lasers anywhere on screen, as in play; about a third of frames overlap an alien rect
+            for laser in lasers:
+                laser.rect.y = y
+                laser.swept_rect.update(laser.rect.x, y, laser.rect.width, laser.rect.height + 7)
+            hits += len(sweep_groupcollide(lasers, aliens, False, False, pixel_perfect))
+        return (time.perf_counter() - started) / frames * 1e6, hits
+
+    run(True) # Build the masks outside the timing, as a real session would in its first frames
+    rect_us, rect_hits = run(False)
+    pixel_us, pixel_hits = run(True)
+    print(f"{len(lasers)} lasers x {len(aliens)} aliens, {frames} frames")
+    print(f"  rect only:     {rect_us:6.2f} us/frame, {rect_hits} hits")
+    print(f"  pixel perfect: {pixel_us:6.2f} us/frame, {pixel_hits} hits ({pixel_us / rect_us - 1:+.0%})")
+    pygame.quit()
+
+if __name__ == "__main__":
+    _benchmark()
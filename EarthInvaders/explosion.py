@@ -1,17 +1,31 @@
 import pygame
+from timers import monotonic_ms
+
+# Explosion specific constants
+EXPLOSION_DURATION_MS = 200
 
 class Explosion(pygame.sprite.Sprite):
-    def __init__(self, center_position, image_surface, duration=200): # duration in milliseconds
+    __slots__ = ("image", "rect", "spawn_time", "duration", "timer")
+
+    def __init__(self, center_position, image_surface, duration=EXPLOSION_DURATION_MS, timers=None): # duration in milliseconds
         super().__init__()
 
         self.image = image_surface
         self.rect = self.image.get_rect(center=center_position)
 
-        self.spawn_time = pygame.time.get_ticks()
         self.duration = duration
+        if timers is not None:
+            # Removed by the game's TimerScheduler, so nothing has to poll it every frame
+            self.spawn_time = timers.now()
+            self.timer = timers.call_later(duration, self.kill)
+        else:
+            self.spawn_time = monotonic_ms()
+            self.timer = None
 
     def update(self):
-        current_time = pygame.time.get_ticks()
+        if self.timer is not None:
+            return
+        current_time = monotonic_ms()
 
         if current_time - self.spawn_time > self.duration:
             self.kill() # Remove sprite after duration
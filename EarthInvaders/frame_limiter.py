@@ -0,0 +1,119 @@
+import asyncio
+import sys
+import time
+
+# Frame limiter specific constants
+DEFAULT_TARGET_FPS = 60
+MIN_TARGET_FPS = 30
+TARGET_FPS_STEP = 10 # How much the target drops when the device can't keep up
+STATS_WINDOW_FRAMES = 120 # Frames per evaluation window (2 seconds at 60 FPS)
+DOWNSHIFT_MISS_RATIO = 0.25 # Lower the target if more than a quarter of a window misses its deadline
+UPSHIFT_COST_RATIO = 0.6 # Raise it again once frames fit comfortably in the faster budget
+SPIN_MARGIN_S = 0.001 # Last stretch before a deadline is covered by yielding, not a timed sleep
+
+class FrameLimiter:
+    # Paces the asyncio main loop: measures what each frame actually cost and sleeps
+    # for the rest of the frame budget, so the loop neither busy-spins a core nor
+    # relies on the browser for its cadence.
+    #
+    # Gameplay speeds are per frame, so lowering the target slows the game down;
+    # that's preferred over an uneven cadence on devices that can't hold it.
+    def __init__(self, target_fps=DEFAULT_TARGET_FPS, min_fps=MIN_TARGET_FPS, adaptive=True,
+                 clock=time.perf_counter, sleep=asyncio.sleep, precise=None):
+        self.max_fps = target_fps
+        self.target_fps = target_fps
+        self.min_fps = min(min_fps, target_fps)
+        self.adaptive = adaptive
+        self.clock = clock
+        self.sleep = sleep
+        # Under pygbag every await lasts at least one browser animation frame, so yielding
+        # repeatedly to hit a deadline precisely would overshoot by whole frames instead
+        self.precise = sys.platform != "emscripten" if precise is None else precise
+
+        self.frame_start = None
+        self.last_frame_cost = 0.0
+        self.frames = 0
+        self.missed_deadlines = 0
+        self.achieved_fps = 0.0
+
+        self._window_start = None
+        self._window_frames = 0
+        self._window_misses = 0
+        self._window_cost = 0.0
+
+    @property
+    def frame_budget(self):
+        return 1.0 / self.target_fps
+
+    async def wait(self):
+        # Call once at the end of every gameplay frame
+        now = self.clock()
+        if self.frame_start is None:
+            self.frame_start = now
+        if self._window_start is None:
+            self._window_start = now
+
+        cost = now - self.frame_start
+        deadline = self.frame_start + self.frame_budget
+        self.last_frame_cost = cost
+        self.frames += 1
+        self._window_frames += 1
+        self._window_cost += cost
+
+        if now >= deadline:
+            # Over budget: still yield so the event loop (and the browser) gets a turn,
+            # but start the next frame right away instead of trying to catch up
+            self.missed_deadlines += 1
+            self._window_misses += 1
+            await self.sleep(0)
+            self.frame_start = self.clock()
+        else:
+            remaining = deadline - now
+            if self.precise:
+                if remaining > SPIN_MARGIN_S:
+                    await self.sleep(remaining - SPIN_MARGIN_S)
+                while self.clock() < deadline:
+                    await self.sleep(0)
+            else:
+                await self.sleep(remaining)
+            # Schedule from the deadline rather than the wakeup time so oversleeping doesn't
+            # accumulate, unless we woke so late that the next frame is already due
+            woke = self.clock()
+            self.frame_start = deadline if woke - deadline < self.frame_budget else woke
+
+        if self._window_frames >= STATS_WINDOW_FRAMES:
+            self._end_window()
+
+    async def wait_idle(self, fps):
+        # Low-power pacing for static screens; kept out of the gameplay statistics
+        await self.sleep(1.0 / fps)
+        self.frame_start = None
+        self._window_start = None
+        self._window_frames = 0
+        self._window_misses = 0
+        self._window_cost = 0.0
+
+    def _end_window(self):
+        elapsed = self.clock() - self._window_start
+        if elapsed > 0:
+            self.achieved_fps = self._window_frames / elapsed
+
+        if self.adaptive:
+            miss_ratio = self._window_misses / self._window_frames
+            average_cost = self._window_cost / self._window_frames
+            if miss_ratio > DOWNSHIFT_MISS_RATIO and self.target_fps > self.min_fps:
+                self.target_fps = max(self.min_fps, self.target_fps - TARGET_FPS_STEP)
+            elif self._window_misses == 0 and self.target_fps < self.max_fps:
+                faster_fps = min(self.max_fps, self.target_fps + TARGET_FPS_STEP)
+                if average_cost < UPSHIFT_COST_RATIO / faster_fps:
+                    self.target_fps = faster_fps
+
+        self._window_start = self.clock()
+        self._window_frames = 0
+        self._window_misses = 0
+        self._window_cost = 0.0
+
+    def report(self):
+        return (f"target {self.target_fps} FPS, achieved {self.achieved_fps:.1f} FPS, "
+                f"last frame {self.last_frame_cost * 1000:.2f} ms, "
+                f"missed {self.missed_deadlines}/{self.frames} deadlines")
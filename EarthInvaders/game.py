@@ -4,10 +4,16 @@ import traceback # Added import
 from spaceship import Spaceship
 from obstacle import Obstacle
 from obstacle import grid
-from alien import Alien
+from alien import Alien, AlienFormation
 from super_alien import SuperAlien
 from bomb import Bomb
-from explosion import Explosion
+from explosion import Explosion, EXPLOSION_DURATION_MS
+from collision import sweep_groupcollide, sweep_spritecollide
+from assets import load_image, load_sound
+from input_provider import KeyboardInput
+from quality_governor import FULL_QUALITY
+from timers import TimerScheduler
+from state_digest import digest as world_digest
 
 # Game specific constants
 ALIEN_SHOOT_PROBABILITY = 0.005
@@ -22,36 +28,51 @@ FRENZY_ALIEN_COUNT = 5
 FRENZY_SHOOT_PROBABILITY = 0.1
 
 class Game:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, telemetry=None, input_provider=None, clock=None, pixel_perfect=False,
+                 rng=random):
         self.screen_width = screen_width
         self.screen_height = screen_height
+        # Every random decision goes through rng; pass a seeded random.Random (and a clock) to replay a game exactly
+        self.rng = rng
+        # Every deadline in the game goes through here; clock is in ms and defaults to timers.monotonic_ms
+        self.timers = TimerScheduler(clock)
+        self.telemetry = telemetry # Optional Telemetry sink for gameplay events
+        self.input_provider = input_provider or KeyboardInput() # What flies the spaceship (see input_provider.py)
         # self.victory = False # Removed
         self.game_over = False
         self.game_speed_modifier = 1.0
         self.alien_descents = 0 # Re-adding for tracking alien descents
 
         self.lives = 3
-        self.spaceship_respawn_time = 0  # Timestamp for when respawn should occur
+        self._respawn_timer = None # Pending respawn after losing a life
         self.invincibility_duration_ms = 2000 # Duration of invincibility in ms
         self.respawn_delay_ms = 2000 # Delay before respawn in ms
 
         # Super Alien spawn timer attributes
         self.super_alien_spawn_time_min = 20000  # milliseconds (20 seconds)
         self.super_alien_spawn_time_max = 40000  # milliseconds (40 seconds)
-        self.super_alien_next_spawn_time = pygame.time.get_ticks() + random.randint(self.super_alien_spawn_time_min, self.super_alien_spawn_time_max)
+        self._super_alien_timer = None
+        self._schedule_super_alien()
 
         # Essential group initializations, even if other parts fail
         self.spaceship_group = pygame.sprite.GroupSingle()
-        self.aliens_group = pygame.sprite.Group()
+        self.aliens_group = AlienFormation()
         self.alien_lasers_group = pygame.sprite.Group()
         self.super_alien_group = pygame.sprite.GroupSingle()
         self.bombs_group = pygame.sprite.Group()
         self.explosions_group = pygame.sprite.Group()
+        self.collision_checks = 0 # Sprite pairs tested for collisions so far, for the metrics endpoint
+        self.pixel_perfect = pixel_perfect # Test aliens, the super alien and the spaceship by their opaque pixels
+        self.quality = FULL_QUALITY # Cosmetic detail; lowered by main.py's QualityGovernor under load
+        self._last_alien_laser_sound = float("-inf") # Ticks of the last alien laser sound, for throttling
+
+        # Built once here and reset in place by later rounds (see reset_game)
+        self._spaceship = None
+        self._alien_roster = [] # (alien, starting topleft) for every alien in the formation
+        self._round_setup_steps = [] # Leftover new-round work, run a slice per frame by advance_round_setup()
 
         try:
-            # Removed speed_modifier from Spaceship constructor
-            initial_spaceship = Spaceship(self.screen_width, self.screen_height)
-            self.spaceship_group.add(initial_spaceship)
+            self._spawn_spaceship()
 
             self.obstacles = self.create_obstacles()
             self.create_aliens() # Will pass game_speed_modifier
@@ -65,16 +86,14 @@ class Game:
 
             # Explosion sound
             try:
-                self.explosion_sound = pygame.mixer.Sound("Sounds/explosion.ogg")
-                self.explosion_sound.set_volume(0.3)
+                self.explosion_sound = load_sound("Sounds/explosion.ogg", 0.3)
             except (pygame.error, FileNotFoundError) as e:
                 print(f"Warning: Could not load 'Sounds/explosion.ogg'. Error: {e}. Explosions will be silent.")
                 self.explosion_sound = None # Set to None if loading fails
 
             # Alien laser sound
             try:
-                self.alien_laser_sound = pygame.mixer.Sound("Sounds/alien_laser.ogg")
-                self.alien_laser_sound.set_volume(0.3)  # Adjust volume as needed
+                self.alien_laser_sound = load_sound("Sounds/alien_laser.ogg", 0.3)
             except (pygame.error, FileNotFoundError) as e:
                 print(f"Warning: Could not load 'Sounds/alien_laser.ogg'. Error: {e}. Alien lasers will be silent.")
                 self.alien_laser_sound = None
@@ -83,8 +102,7 @@ class Game:
 
             # Super Explosion sound
             try:
-                self.super_explosion_sound = pygame.mixer.Sound("Sounds/epic_explosion.ogg")
-                self.super_explosion_sound.set_volume(0.5) # Adjust volume as needed
+                self.super_explosion_sound = load_sound("Sounds/epic_explosion.ogg", 0.5)
             except (pygame.error, FileNotFoundError) as e:
                 print(f"Warning: Could not load 'Sounds/epic_explosion.ogg'. Error: {e}. Super explosions will use default sound or be silent.")
                 self.super_explosion_sound = None # Fallback to None
@@ -92,17 +110,18 @@ class Game:
             # Pre-load explosion images
             self.super_explosion_img = None
             self.regular_explosion_img = None
+            self._regular_explosion_surface_cache = None
             self.explosion_placeholder_img = pygame.Surface((30,30)) # Default placeholder size
             self.explosion_placeholder_img.fill((255,255,0)) # Yellow
 
             try:
-                self.super_explosion_img = pygame.image.load("Graphics/explosion.png").convert_alpha()
+                self.super_explosion_img = load_image("Graphics/explosion.png")
             except (pygame.error, FileNotFoundError) as e:
                 print(f"Warning: Could not load 'Graphics/explosion.png'. Error: {e}. Super explosions will use placeholder.")
                 # self.super_explosion_img remains None or use placeholder
 
             try:
-                self.regular_explosion_img = pygame.image.load("Graphics/explosion2.png").convert_alpha()
+                self.regular_explosion_img = load_image("Graphics/explosion2.png")
             except (pygame.error, FileNotFoundError) as e:
                 print(f"Warning: Could not load 'Graphics/explosion2.png'. Error: {e}. Regular explosions will use placeholder.")
                 # self.regular_explosion_img remains None or use placeholder
@@ -112,6 +131,24 @@ class Game:
         finally:
             pass
 
+    def _emit(self, kind, **fields):
+        if self.telemetry:
+            self.telemetry.emit(kind, **fields)
+
+    def _create_spaceship(self, start_invincible=False):
+        spaceship = Spaceship(self.screen_width, self.screen_height, start_invincible=start_invincible, timers=self.timers)
+        spaceship.telemetry = self.telemetry # So shots fired are reported too
+        spaceship.input = self.input_provider
+        return spaceship
+
+    def _spawn_spaceship(self, start_invincible=False):
+        # The same Spaceship is reset and re-added for every life and round
+        if self._spaceship is None:
+            self._spaceship = self._create_spaceship(start_invincible=start_invincible)
+        else:
+            self._spaceship.reset(start_invincible=start_invincible)
+        self.spaceship_group.add(self._spaceship)
+
     def create_obstacles(self):
         obstacle_width = len(grid[0]) * 3
         gap = (self.screen_width - (4 * obstacle_width))/5
@@ -123,6 +160,7 @@ class Game:
         return obstacles
     
     def create_aliens(self):
+        self._alien_roster = []
         for row in range(5):
             for column in range(11):
                 x = 75 + column * 55
@@ -136,8 +174,58 @@ class Game:
                     alien_type = 1
 
                 # Removed speed_modifier from Alien constructor
-                alien = Alien(alien_type, x, y)
+                alien = Alien(alien_type, x, y, column, row)
                 self.aliens_group.add(alien)
+                self._alien_roster.append((alien, (x, y)))
+
+    def restore_aliens(self):
+        # Returns the original aliens to formation for a new round instead of constructing 55 more
+        self.aliens_group.empty()
+        for alien, topleft in self._alien_roster:
+            alien.rect.topleft = topleft
+            alien.is_frenzied = False
+        self.aliens_group.add([alien for alien, _ in self._alien_roster])
+
+    def update(self):
+        # One gameplay frame: everything main.py runs while PLAYING and not game over
+        self.timers.advance() # Respawns, super alien spawns, ship state and explosions that are due
+        self.advance_round_setup() # Finishes a round reset a slice at a time
+        self._check_and_activate_frenzy_mode()
+        self.spaceship_group.update()
+        self.move_aliens()
+        self.alien_shoot()
+        self.alien_lasers_group.update() # Update lasers before checking round clear
+
+        if self.check_round_clear():
+            self.reset_game(new_round_started=True)
+        else:
+            # Only run these other updates if a round isn't immediately cleared and reset
+            self.handle_bomb_dropping()
+            self.super_alien_group.update()
+            self.bombs_group.update()
+            self.check_collisions()
+            self.check_hostile_projectile_collisions()
+
+    def state_digest(self):
+        # Stable hash of the simulated world this frame (see state_digest.py)
+        return world_digest(self)
+
+    @property
+    def alien_roster(self):
+        # Every alien the formation started the round with, dead or alive, in row-major order
+        return tuple(alien for alien, _ in self._alien_roster)
+
+    @property
+    def spaceship(self):
+        # The player's ship, also while it waits to respawn (spaceship_group is empty then)
+        return self._spaceship
+
+    def advance_round_setup(self):
+        # Called once per gameplay frame; restores one obstacle per frame after a reset, so
+        # the frame that starts a round costs no more than a normal one. Shields finish
+        # rebuilding within the first few frames, while the aliens are still at the top.
+        if self._round_setup_steps:
+            self._round_setup_steps.pop(0)()
 
     def move_aliens(self):
         # Still move all aliens first
@@ -180,7 +268,8 @@ class Game:
     def check_collisions(self):
         if self.spaceship_group.sprite:
             # Player laser vs Aliens
-            alien_collisions = pygame.sprite.groupcollide(self.spaceship_group.sprite.lasers_group, self.aliens_group, True, True)
+            self.collision_checks += len(self.spaceship_group.sprite.lasers_group) * len(self.aliens_group)
+            alien_collisions = sweep_groupcollide(self.spaceship_group.sprite.lasers_group, self.aliens_group, True, True, self.pixel_perfect)
             if alien_collisions:
                 if self.explosion_sound:
                     self.explosion_sound.play()
@@ -188,30 +277,15 @@ class Game:
                 for aliens_hit_by_laser in alien_collisions.values(): # aliens_hit_by_laser is a list of aliens
                     for alien in aliens_hit_by_laser:
                         self.score += ALIEN_SCORE_VALUE
+                        self._emit("alien_killed", alien_type=alien.type, score=self.score)
                         self._check_and_award_extra_life()
 
-                        explosion_surface_to_use = None
-                        if self.regular_explosion_img and self.super_explosion_img:
-                            target_w = int(self.super_explosion_img.get_width() * 0.105) # Changed from 0.175
-                            target_h = int(self.super_explosion_img.get_height() * 0.105) # Changed from 0.175
-                            # Ensure minimum dimensions
-                            target_w = max(1, target_w)
-                            target_h = max(1, target_h)
-                            explosion_surface_to_use = pygame.transform.smoothscale(self.regular_explosion_img, (target_w, target_h))
-                        elif self.regular_explosion_img: # Super image failed, but regular loaded
-                             explosion_surface_to_use = self.regular_explosion_img # Use as is
-                        else: # Regular image failed (or both)
-                            # Fallback: create a new placeholder surface with desired smaller size for regular aliens
-                            placeholder_size = 20
-                            explosion_surface_to_use = pygame.Surface((placeholder_size, placeholder_size))
-                            explosion_surface_to_use.fill((255, 255, 0)) # Yellow
-
-                        explosion = Explosion(center_position=alien.rect.center, image_surface=explosion_surface_to_use)
-                        self.explosions_group.add(explosion)
+                        self._add_explosion(alien.rect.center, self._regular_explosion_surface())
 
             # Player laser vs Obstacles
             for obstacle in self.obstacles:
-                obstacle_collisions = pygame.sprite.groupcollide(self.spaceship_group.sprite.lasers_group, obstacle.blocks_group, True, False)
+                self.collision_checks += len(self.spaceship_group.sprite.lasers_group) * len(obstacle.blocks_group)
+                obstacle_collisions = sweep_groupcollide(self.spaceship_group.sprite.lasers_group, obstacle.blocks_group, True, False)
                 if obstacle_collisions:
                     for collided_blocks in obstacle_collisions.values():
                         for block in collided_blocks:
@@ -221,10 +295,12 @@ class Game:
             if self.super_alien_group.sprite: # Check if super alien exists
                 super_alien = self.super_alien_group.sprite
                 if self.spaceship_group.sprite: # Ensure spaceship and its lasers exist
-                    lasers_hit_super_alien = pygame.sprite.spritecollide(super_alien, self.spaceship_group.sprite.lasers_group, True)
+                    self.collision_checks += len(self.spaceship_group.sprite.lasers_group)
+                    lasers_hit_super_alien = sweep_spritecollide(super_alien, self.spaceship_group.sprite.lasers_group, True, self.pixel_perfect)
                     if lasers_hit_super_alien:
                         super_alien.kill() # Kill the super alien
                         self.score += super_alien.points
+                        self._emit("super_alien_killed", points=super_alien.points, score=self.score)
                         self._check_and_award_extra_life()
 
                         if self.super_explosion_sound:
@@ -242,27 +318,66 @@ class Game:
                              super_explosion_surface = pygame.Surface((placeholder_size, placeholder_size))
                              super_explosion_surface.fill((255,255,0))
 
-                        explosion = Explosion(center_position=super_alien.rect.center, image_surface=super_explosion_surface)
-                        self.explosions_group.add(explosion)
+                        self._add_explosion(super_alien.rect.center, super_explosion_surface)
+
+    def _add_explosion(self, center, surface, duration=EXPLOSION_DURATION_MS):
+        # Explosions are cosmetic, so the quality governor may shorten or skip them
+        scale = self.quality.explosion_scale
+        if scale:
+            self.explosions_group.add(Explosion(center_position=center, image_surface=surface, duration=int(duration * scale), timers=self.timers))
+
+    def _play_alien_laser_sound(self):
+        if not self.alien_laser_sound:
+            return
+        gap = self.quality.alien_laser_sound_gap_ms
+        if gap:
+            now = self.timers.now()
+            if now - self._last_alien_laser_sound < gap:
+                return
+            self._last_alien_laser_sound = now
+        self.alien_laser_sound.play()
+
+    def _regular_explosion_surface(self):
+        # Scaled once and reused, rather than a fresh smoothscale for every alien killed
+        if self._regular_explosion_surface_cache is None:
+            if self.regular_explosion_img and self.super_explosion_img:
+                target_w = int(self.super_explosion_img.get_width() * 0.105) # Changed from 0.175
+                target_h = int(self.super_explosion_img.get_height() * 0.105) # Changed from 0.175
+                # Ensure minimum dimensions
+                target_w = max(1, target_w)
+                target_h = max(1, target_h)
+                surface = pygame.transform.smoothscale(self.regular_explosion_img, (target_w, target_h))
+            elif self.regular_explosion_img: # Super image failed, but regular loaded
+                surface = self.regular_explosion_img # Use as is
+            else: # Regular image failed (or both)
+                # Fallback: a placeholder surface with desired smaller size for regular aliens
+                placeholder_size = 20
+                surface = pygame.Surface((placeholder_size, placeholder_size))
+                surface.fill((255, 255, 0)) # Yellow
+            self._regular_explosion_surface_cache = surface
+        return self._regular_explosion_surface_cache
 
     def alien_shoot(self):
-        if self.aliens_group.sprites():
-            for alien in self.aliens_group.sprites():
-                # Determine shoot probability based on frenzy state
-                current_shoot_probability = FRENZY_SHOOT_PROBABILITY if getattr(alien, 'is_frenzied', False) else ALIEN_SHOOT_PROBABILITY
-
-                if random.random() < current_shoot_probability:
-                    new_laser = alien.fire_laser(self.screen_height)
-                    self.alien_lasers_group.add(new_laser)
-                    if self.alien_laser_sound:
-                        self.alien_laser_sound.play()
+        # Only the front line fires, so shots never start inside the formation. Each column
+        # rolls once, scaled by how many aliens it has left, which keeps the overall fire rate
+        # of every alien rolling on its own while costing one roll per column.
+        for column in self.aliens_group.columns.values():
+            alien = column[-1]
+            # Determine shoot probability based on frenzy state
+            current_shoot_probability = FRENZY_SHOOT_PROBABILITY if getattr(alien, 'is_frenzied', False) else ALIEN_SHOOT_PROBABILITY
+
+            if self.rng.random() < current_shoot_probability * len(column):
+                new_laser = alien.fire_laser(self.screen_height)
+                self.alien_lasers_group.add(new_laser)
+                self._play_alien_laser_sound()
 
     def check_hostile_projectile_collisions(self):
         # Alien laser vs Player Spaceship
         if self.spaceship_group.sprite: # Check if spaceship exists
             player_spaceship = self.spaceship_group.sprite # Convenience variable
 
-            collided_lasers = pygame.sprite.spritecollide(player_spaceship, self.alien_lasers_group, True)
+            self.collision_checks += len(self.alien_lasers_group)
+            collided_lasers = sweep_spritecollide(player_spaceship, self.alien_lasers_group, True, self.pixel_perfect)
             if collided_lasers:
                 player_shield_active = getattr(player_spaceship, 'shield_active', False)
                 if player_shield_active:
@@ -281,8 +396,7 @@ class Game:
                          explosion_img_to_use = pygame.Surface((placeholder_size, placeholder_size))
                          explosion_img_to_use.fill((255,165,0)) # Orange placeholder for player
 
-                    player_explosion = Explosion(center_position=explosion_pos, image_surface=explosion_img_to_use, duration=1000)
-                    self.explosions_group.add(player_explosion)
+                    self._add_explosion(explosion_pos, explosion_img_to_use, duration=1000)
 
                     # Play sound
                     if self.super_explosion_sound:
@@ -293,15 +407,17 @@ class Game:
 
                     self.lives -= 1
                     player_spaceship.kill()
+                    self._emit("player_died", cause="laser", lives=self.lives, score=self.score)
 
                     if self.lives > 0:
-                        self.spaceship_respawn_time = pygame.time.get_ticks() + self.respawn_delay_ms
+                        self._respawn_timer = self.timers.call_later(self.respawn_delay_ms, self.handle_spaceship_respawn)
                     else:
                         self.game_over = True
 
         # Alien laser vs Obstacles
         for obstacle in self.obstacles:
-            obstacle_collisions = pygame.sprite.groupcollide(self.alien_lasers_group, obstacle.blocks_group, True, False)
+            self.collision_checks += len(self.alien_lasers_group) * len(obstacle.blocks_group)
+            obstacle_collisions = sweep_groupcollide(self.alien_lasers_group, obstacle.blocks_group, True, False)
             if obstacle_collisions:
                 for collided_blocks in obstacle_collisions.values(): # Corrected: iterate through values()
                     for block in collided_blocks:
@@ -312,7 +428,8 @@ class Game:
             # Store a reference to the spaceship sprite for convenience
             player_spaceship = self.spaceship_group.sprite
 
-            bombs_hitting_player = pygame.sprite.spritecollide(player_spaceship, self.bombs_group, True)
+            self.collision_checks += len(self.bombs_group)
+            bombs_hitting_player = sweep_spritecollide(player_spaceship, self.bombs_group, True, self.pixel_perfect)
             if bombs_hitting_player:
                 player_shield_active = getattr(player_spaceship, 'shield_active', False)
                 if player_shield_active:
@@ -331,8 +448,7 @@ class Game:
                          explosion_img_to_use = pygame.Surface((placeholder_size, placeholder_size))
                          explosion_img_to_use.fill((255,165,0)) # Orange placeholder for player
 
-                    player_explosion = Explosion(center_position=explosion_pos, image_surface=explosion_img_to_use, duration=1000) # Duration updated
-                    self.explosions_group.add(player_explosion)
+                    self._add_explosion(explosion_pos, explosion_img_to_use, duration=1000) # Duration updated
 
                     # Play sound
                     if self.super_explosion_sound:
@@ -344,9 +460,10 @@ class Game:
                     self.lives -= 1
                     # print(f"Player hit by bomb! Lives remaining: {self.lives}") # Debug print
                     player_spaceship.kill() # Kill the spaceship sprite
+                    self._emit("player_died", cause="bomb", lives=self.lives, score=self.score)
 
                     if self.lives > 0:
-                        self.spaceship_respawn_time = pygame.time.get_ticks() + self.respawn_delay_ms
+                        self._respawn_timer = self.timers.call_later(self.respawn_delay_ms, self.handle_spaceship_respawn)
                     else:
                         # print("Game Over!") # Debug print
                         self.game_over = True
@@ -367,7 +484,8 @@ class Game:
             # 1. Find bombs that hit blocks of this obstacle.
             # 2. If any, process destruction for this obstacle and those bombs.
 
-            bombs_that_hit_this_obstacle = pygame.sprite.groupcollide(
+            self.collision_checks += len(self.bombs_group) * len(obstacle.blocks_group)
+            bombs_that_hit_this_obstacle = sweep_groupcollide(
                 self.bombs_group,
                 obstacle.blocks_group,
                 False, # Don't kill bombs yet, we need to know which ones to kill after processing
@@ -395,8 +513,7 @@ class Game:
                      explosion_img = pygame.Surface((placeholder_size, placeholder_size))
                      explosion_img.fill((200,200,0)) # Different color, e.g., olive
 
-                big_explosion = Explosion(center_position=explosion_pos, image_surface=explosion_img, duration=1200) # Longer duration
-                self.explosions_group.add(big_explosion)
+                self._add_explosion(explosion_pos, explosion_img, duration=1200) # Longer duration
 
                 # Play sound (as per plan step 3)
                 if self.super_explosion_sound:
@@ -404,8 +521,9 @@ class Game:
                 elif self.explosion_sound:
                     self.explosion_sound.play()
 
-                # Destroy all blocks in this obstacle
-                obstacle.blocks_group.empty() # Removes all sprites from the group, effectively destroying them
+                # Destroy all blocks in this obstacle, and clear its cached surface
+                obstacle.destroy()
+                self._emit("shield_destroyed", obstacle=obstacle_index, blocks=len(all_blocks))
 
                 # Kill the bombs that caused this destruction
                 for bomb in bombs_that_hit_this_obstacle.keys():
@@ -418,6 +536,7 @@ class Game:
     def _check_and_award_extra_life(self): # Helper method
         while self.score >= self.next_life_score:
             self.lives += 1
+            self._emit("extra_life", lives=self.lives, threshold=self.next_life_score)
             self.next_life_score += self.points_for_extra_life
 
     def _check_and_activate_frenzy_mode(self):
@@ -427,6 +546,7 @@ class Game:
             for alien in self.aliens_group.sprites():
                 alien.is_frenzied = True
             self.frenzy_mode_activated_this_round = True
+            self._emit("frenzy_activated", aliens_left=len(self.aliens_group), level=self.current_level_number)
 
     def reset_game(self, new_round_started=False): # Signature changed
         if new_round_started:
@@ -439,32 +559,30 @@ class Game:
         self.alien_descents = 0 # Re-adding reset for alien_descents
         self.game_over = False # Always reset game_over flag
         self.lives = 3 # Reset lives
-        self.spaceship_respawn_time = 0 # Reset respawn timer
+        if self._respawn_timer:
+            self._respawn_timer.cancel() # Reset respawn timer
 
         # Spaceship
         if self.spaceship_group.sprite:
             self.spaceship_group.sprite.kill() # Kill the old sprite
 
-        # Removed speed_modifier from Spaceship constructor
-        spaceship = Spaceship(self.screen_width, self.screen_height)
-        self.spaceship_group.add(spaceship)
+        self._spawn_spaceship()
 
         # Conditional score reset:
         # Conditional score reset:
         if not new_round_started: # Only reset score if it's NOT a new round (i.e., it's from Game Over)
             self.score = 0
             # Reset Super Alien spawn timer on full game reset
-            self.super_alien_next_spawn_time = pygame.time.get_ticks() + random.randint(self.super_alien_spawn_time_min, self.super_alien_spawn_time_max)
+            self._schedule_super_alien()
 
         # Always reset frenzy mode for new round or new game
         self.frenzy_mode_activated_this_round = False
 
-        # Obstacles
-        self.obstacles = self.create_obstacles()
+        # Obstacles are restored in place over the next few frames
+        self._round_setup_steps = [obstacle.restore for obstacle in self.obstacles]
 
         # Aliens
-        self.aliens_group.empty()
-        self.create_aliens()
+        self.restore_aliens()
         self.aliens_direction = 1
 
         # Alien Lasers
@@ -478,10 +596,17 @@ class Game:
         # Game State
         self.game_over = False
 
+    def _schedule_super_alien(self):
+        if self._super_alien_timer:
+            self._super_alien_timer.cancel()
+        delay = self.rng.randint(self.super_alien_spawn_time_min, self.super_alien_spawn_time_max)
+        self.super_alien_next_spawn_time = self.timers.now() + delay
+        self._super_alien_timer = self.timers.call_later(delay, self.spawn_super_alien)
+
     def spawn_super_alien(self):
-        current_time = pygame.time.get_ticks()
-        if not self.super_alien_group.sprite and current_time >= self.super_alien_next_spawn_time:
-            super_alien = SuperAlien(self.screen_width, self.screen_height)
+        # Runs when the spawn timer expires
+        if not self.super_alien_group.sprite:
+            super_alien = SuperAlien(self.screen_width, self.screen_height, rng=self.rng)
             self.super_alien_group.add(super_alien)
 
             # Fire initial bomb burst
@@ -503,8 +628,8 @@ class Game:
 
                 super_alien.initial_bomb_burst_fired = True
 
-            # Reset the timer for the next spawn
-            self.super_alien_next_spawn_time = current_time + random.randint(self.super_alien_spawn_time_min, self.super_alien_spawn_time_max)
+        # Reset the timer for the next spawn (one still crossing the screen just waits for the next)
+        self._schedule_super_alien()
 
     def handle_bomb_dropping(self):
         if self.super_alien_group.sprite:
@@ -526,28 +651,11 @@ class Game:
                 # Optional: Add a small delay here before returning True,
                 # or handle delay in main.py after this returns True.
                 # For now, immediate signal.
+                self._emit("round_cleared", level=self.current_level_number, score=self.score)
                 return True
         return False
 
     def handle_spaceship_respawn(self):
-        if self.lives > 0 and not self.spaceship_group.sprite and self.spaceship_respawn_time > 0:
-            current_time = pygame.time.get_ticks()
-            if current_time >= self.spaceship_respawn_time:
-                # Removed speed_modifier from Spaceship constructor
-                spaceship = Spaceship(self.screen_width, self.screen_height, start_invincible=True)
-
-                # Set invincibility on the new spaceship instance
-                # This requires Spaceship class to handle these attributes.
-                # For now, we're just setting the time on Game, Spaceship will need to use it.
-                # The actual attribute setting on spaceship will be part of Spaceship.py modification.
-                # spaceship.invincible = True # This will be done in Spaceship.__init__ or by a method
-                # spaceship.invincible_until = current_time + self.invincibility_duration_ms
-
-                self.spaceship_group.add(spaceship)
-                self.spaceship_respawn_time = 0 # Reset respawn timer
-
-                # Store time for when invincibility should end for the NEWLY created spaceship
-                # This is a bit tricky. The spaceship itself should manage its invincibility state.
-                # For now, let's assume Spaceship will have an activate_invincibility method or similar.
-                # For this subtask, we'll just add the spaceship.
-                # The plan step for Spaceship.py will handle making it invincible.
+        # Runs when the respawn timer set on losing a life expires
+        if self.lives > 0 and not self.spaceship_group.sprite:
+            self._spawn_spaceship(start_invincible=True) # The ship runs its own invincibility timer
@@ -0,0 +1,219 @@
+import bisect
+import heapq
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import namedtuple
+from background import BatchWorker
+
+# High score specific constants
+HIGH_SCORE_FILE = "high_scores.dat"
+HIGH_SCORE_MAGIC = b"EIHS"
+HIGH_SCORE_VERSION = 1
+TOP_CAPACITY = 100 # How many full entries are kept in memory for top-N queries
+MERGE_THRESHOLD = 4096 # Pending scores folded into the main rank index at once
+COMPACT_EVERY = 50000 # Appended records before the log is rewritten in sorted order
+READ_CHUNK_RECORDS = 65536
+
+# File layout: header | compacted scores, ascending | compacted records, descending | appended records
+HEADER = struct.Struct("<4sHHQ") # magic, version, reserved, compacted record count
+NAME_BYTES = 12
+RECORD = struct.Struct(f"<qd{NAME_BYTES}s") # score, timestamp, name (e.g. the kiosk that submitted it)
+
+HighScore = namedtuple("HighScore", ["score", "timestamp", "name"])
+
+def _sort_key(record):
+    return (-record[0], record[1]) # Highest score first, earliest first on ties
+
+def _pack(entry):
+    return RECORD.pack(entry.score, entry.timestamp, entry.name.encode("utf-8")[:NAME_BYTES])
+
+def _unpack(raw):
+    score, timestamp, name = raw
+    return HighScore(score, timestamp, name.rstrip(b"\0").decode("utf-8", "replace"))
+
+def _iter_records(f, count):
+    # Streams `count` records from the current file position without loading them all at once
+    while count > 0:
+        chunk = min(count, READ_CHUNK_RECORDS)
+        data = f.read(chunk * RECORD.size)
+        usable = len(data) // RECORD.size
+        for raw in RECORD.iter_unpack(data[:usable * RECORD.size]):
+            yield _unpack(raw)
+        if usable < chunk:
+            return # Truncated file, e.g. a crash mid-append
+        count -= chunk
+
+class HighScoreStore:
+    # Append-only high score log with an in-memory rank index. Ranks come from a
+    # sorted array of every score ever submitted (bisect, O(log n)), the best entries
+    # are kept in full for top-N queries, and all file writes happen on a BatchWorker
+    # so recording a score at game over never touches the disk on the frame path.
+    def __init__(self, path=HIGH_SCORE_FILE, threaded=None, compact_every=COMPACT_EVERY):
+        self.path = path
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._scores = array("q") # Compacted/merged scores, ascending
+        self._merging = [] # Scores being folded into _scores by the worker
+        self._pending = [] # Recently added scores, ascending
+        self._top = [] # Best HighScore entries, best first
+        self._tail_count = 0 # Records appended after the compacted section
+
+        self._load()
+        self.worker = BatchWorker(self._write_batch, threaded=threaded, name="high-score-writer")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._scores) + len(self._merging) + len(self._pending)
+
+    def submit(self, score, name=""):
+        # Records a score and returns its rank; the disk write happens later on the worker
+        entry = HighScore(int(score), time.time(), name)
+        with self._lock:
+            rank = self._rank_locked(entry.score)
+            bisect.insort(self._pending, entry.score)
+            self._add_to_top(entry)
+        self.worker.put(entry)
+        self.worker.wake()
+        return rank
+
+    def rank(self, score):
+        # 1-based position the score would take among all recorded scores
+        with self._lock:
+            return self._rank_locked(score)
+
+    def _rank_locked(self, score):
+        better = len(self._scores) - bisect.bisect_right(self._scores, score)
+        better += len(self._merging) - bisect.bisect_right(self._merging, score)
+        better += len(self._pending) - bisect.bisect_right(self._pending, score)
+        return better + 1
+
+    def top(self, n=10):
+        with self._lock:
+            return self._top[:n]
+
+    def best(self):
+        with self._lock:
+            return self._top[0] if self._top else None
+
+    def _add_to_top(self, entry):
+        if len(self._top) < TOP_CAPACITY or _sort_key(entry) < _sort_key(self._top[-1]):
+            keys = [_sort_key(e) for e in self._top]
+            self._top.insert(bisect.bisect_right(keys, _sort_key(entry)), entry)
+            del self._top[TOP_CAPACITY:]
+
+    def pump(self):
+        # Browser builds have no writer thread; call this from an idle screen
+        self.worker.pump()
+
+    def close(self):
+        self.worker.close()
+
+    # --- Disk side, only ever run on the worker (or from pump()) ---
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                header = f.read(HEADER.size)
+                magic, version, _, count = HEADER.unpack(header)
+                if magic != HIGH_SCORE_MAGIC or version != HIGH_SCORE_VERSION:
+                    raise ValueError(f"unrecognized header {magic!r} v{version}")
+
+                scores = array("q")
+                scores.frombytes(f.read(count * scores.itemsize))
+                if sys.byteorder != "little":
+                    scores.byteswap()
+                if len(scores) != count:
+                    raise ValueError("compacted section is truncated")
+
+                records_start = f.tell()
+                top = list(_iter_records(f, min(count, TOP_CAPACITY)))
+                tail_start = records_start + count * RECORD.size
+                f.seek(tail_start)
+                tail = list(_iter_records(f, sys.maxsize))
+                file_size = f.seek(0, os.SEEK_END)
+        except (OSError, ValueError, struct.error) as e:
+            corrupt_path = self.path + ".corrupt"
+            print(f"Warning: Could not read high scores '{self.path}'. Error: {e}. Moving it to '{corrupt_path}' and starting fresh.")
+            os.replace(self.path, corrupt_path)
+            return
+
+        # Drop a partial record left by a crash mid-append, or every later append would be misaligned
+        aligned_size = tail_start + len(tail) * RECORD.size
+        if file_size > aligned_size:
+            os.truncate(self.path, aligned_size)
+
+        self._scores = scores
+        self._tail_count = len(tail)
+        self._top = top
+        self._pending = sorted(entry.score for entry in tail)
+        for entry in tail:
+            self._add_to_top(entry)
+        self._fold_pending()
+
+    def _write_batch(self, entries):
+        new_file = not os.path.exists(self.path)
+        with open(self.path, "ab") as f:
+            if new_file:
+                f.write(HEADER.pack(HIGH_SCORE_MAGIC, HIGH_SCORE_VERSION, 0, 0))
+            f.write(b"".join(_pack(entry) for entry in entries))
+        self._tail_count += len(entries)
+
+        if self._tail_count >= self.compact_every:
+            self.compact()
+        self._fold_pending()
+
+    def _fold_pending(self):
+        # Merges pending scores into the main index outside the lock; rank() keeps
+        # counting them through _merging until the new array is swapped in
+        with self._lock:
+            if len(self._pending) < MERGE_THRESHOLD:
+                return
+            self._merging, self._pending = self._pending, []
+            merging = self._merging
+        merged = array("q", heapq.merge(self._scores, merging))
+        with self._lock:
+            self._scores = merged
+            self._merging = []
+
+    def compact(self):
+        # Rewrites the log as one sorted section so the next load needs no sorting or parsing
+        if not os.path.exists(self.path):
+            return
+        temp_path = self.path + ".tmp"
+        with open(self.path, "rb") as src:
+            count = HEADER.unpack(src.read(HEADER.size))[3]
+            src.seek(HEADER.size + count * 8)
+            compacted = _iter_records(src, count)
+            with open(self.path, "rb") as tail_src:
+                tail_src.seek(HEADER.size + count * 8 + count * RECORD.size)
+                tail = sorted(_iter_records(tail_src, sys.maxsize), key=_sort_key)
+            total = count + len(tail)
+
+            scores = array("q") # Written ahead of the records, so collected while streaming them
+            with open(temp_path, "wb") as dst:
+                dst.seek(HEADER.size + total * 8)
+                buffer = []
+                for entry in heapq.merge(compacted, tail, key=_sort_key):
+                    scores.append(entry.score)
+                    buffer.append(_pack(entry))
+                    if len(buffer) >= READ_CHUNK_RECORDS:
+                        dst.write(b"".join(buffer))
+                        buffer.clear()
+                dst.write(b"".join(buffer))
+
+                scores.reverse() # Records are best first, the rank index is ascending
+                if sys.byteorder != "little":
+                    scores.byteswap()
+                dst.seek(0)
+                dst.write(HEADER.pack(HIGH_SCORE_MAGIC, HIGH_SCORE_VERSION, 0, total))
+                dst.write(scores.tobytes())
+        os.replace(temp_path, self.path)
+
+        # The rank index already holds every score; only the file layout changed
+        self._tail_count = 0
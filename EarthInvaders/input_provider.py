@@ -0,0 +1,157 @@
+import pygame
+from obstacle import BLOCK_SIZE, OBSTACLE_TRANSPARENT_COLOR
+from alien import FRENZY_SPEED_MULTIPLIER
+from spaceship import PLAYER_LASER_SPEED
+
+# Input provider specific constants
+# Dodge-and-shoot bot tuning
+BOT_LOOKAHEAD_FRAMES = 45 # How far ahead falling lasers and bombs are projected
+BOT_SHIELD_FRAMES = 4 # Raise the shield if every way of moving gets hit within this many frames
+BOT_AIM_TOLERANCE = 8 # Fire when this close to lined up with the target
+
+# Every provider answers the same two questions, once per frame:
+#   begin_frame(events) -> keys pressed this frame, for the menu/pause/restart handling in main.py
+#   pressed()           -> held keys, indexable by pygame key constant like pygame.key.get_pressed()
+# The spaceship only ever calls pressed(), so it can't tell a human from a script or the bot.
+
+class HeldKeys(frozenset):
+    # Set of held keys that can be indexed like pygame.key.get_pressed()
+    def __getitem__(self, key):
+        return key in self
+
+NO_KEYS = HeldKeys()
+
+class KeyboardInput:
+    def begin_frame(self, events):
+        return [event.key for event in events if event.type == pygame.KEYDOWN]
+
+    def pressed(self):
+        return pygame.key.get_pressed()
+
+class ScriptedInput:
+    # Replays a fixed script of (frames, held_keys, presses) steps: `held_keys` are held for
+    # `frames` frames and `presses` are sent on the first of them. Holds nothing once the
+    # script runs out. Used for tests and reproducible demo runs.
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.frame = 0
+        self._step = -1
+        self._frames_left = 0
+        self._held = NO_KEYS
+
+    @property
+    def finished(self):
+        return self._frames_left == 0 and self._step >= len(self.steps) - 1
+
+    def begin_frame(self, events):
+        self.frame += 1
+        if self._frames_left > 0:
+            self._frames_left -= 1
+            return []
+        self._step += 1
+        if self._step >= len(self.steps):
+            self._held = NO_KEYS
+            return []
+        frames, held, *presses = self.steps[self._step]
+        self._held = HeldKeys(held)
+        self._frames_left = frames - 1
+        return list(presses[0]) if presses else []
+
+    def pressed(self):
+        return self._held
+
+class BotInput:
+    # Plays by itself. Each frame it projects the falling lasers and bombs forward and picks
+    # whichever of left/stay/right gets hit latest (or never), leaning towards the nearest
+    # alien it can shoot from a gap in the shields, and fires when lined up. If every move
+    # gets hit within a few frames it raises the shield.
+    # Restarts from the game over screen, so it can be left running for hours.
+    # `game` may be set after construction, since main.py builds the Game lazily.
+    def __init__(self, game=None):
+        self.game = game
+        self._held = NO_KEYS
+
+    def begin_frame(self, events):
+        self._held = self._decide()
+        if self.game is None:
+            return [pygame.K_RETURN] # Kicks off the game from the menu
+        if self.game.game_over:
+            return [pygame.K_n, pygame.K_RETURN] # Back to the menu, then straight into a new game
+        # ENTER only does anything on the menu screen, so keep pressing it in case that's where we are
+        return [pygame.K_RETURN]
+
+    def pressed(self):
+        return self._held
+
+    def _decide(self):
+        game = self.game
+        ship = game.spaceship_group.sprite if game else None
+        if ship is None:
+            return NO_KEYS
+
+        held = set()
+        dx = 0
+        targets = game.super_alien_group.sprites() or game.aliens_group.sprites()
+        if targets:
+            # Prefer targets that can be shot from a gap between the shields
+            aim = {sprite: self._aim_x(sprite, ship) for sprite in targets}
+            target = min(targets, key=lambda sprite: (self._shielded(aim[sprite], ship.rect.top),
+                                                      abs(aim[sprite] - ship.rect.centerx)))
+            dx = aim[target] - ship.rect.centerx
+            if abs(dx) <= BOT_AIM_TOLERANCE:
+                held.add(pygame.K_SPACE)
+        wanted = 1 if dx > ship.speed else -1 if dx < -ship.speed else 0
+
+        projectiles = [projectile for group in (game.alien_lasers_group, game.bombs_group) for projectile in group
+                       if projectile.rect.top < ship.rect.bottom
+                       and not self._shielded(projectile.rect.centerx, projectile.rect.bottom)]
+        # Safest move first, then the one heading for the target, then standing still
+        direction = max((wanted, 0, -wanted, 1, -1),
+                        key=lambda move: self._frames_until_hit(ship, projectiles, move))
+        safe_for = self._frames_until_hit(ship, projectiles, direction)
+        if direction:
+            held.add(pygame.K_RIGHT if direction > 0 else pygame.K_LEFT)
+        if safe_for <= BOT_SHIELD_FRAMES:
+            held.add(pygame.K_UP)
+        return HeldKeys(held)
+
+    def _aim_x(self, sprite, ship):
+        # Where the target will be by the time a laser fired now gets up to it (edge bounces ignored)
+        game = self.game
+        if sprite in game.super_alien_group:
+            velocity = sprite.speed
+        else:
+            velocity = int(sprite.base_speed * game.game_speed_modifier)
+            if sprite.is_frenzied:
+                velocity = int(velocity * FRENZY_SPEED_MULTIPLIER)
+            velocity *= game.aliens_direction
+        frames = max(0, ship.rect.top - sprite.rect.bottom) / PLAYER_LASER_SPEED
+        return int(sprite.rect.centerx + velocity * frames)
+
+    def _frames_until_hit(self, ship, projectiles, direction):
+        # First frame a projectile would overlap the ship if it kept moving in `direction`,
+        # or BOT_LOOKAHEAD_FRAMES + 1 if nothing does within the lookahead
+        rect = ship.rect
+        max_x = self.game.screen_width - rect.width
+        soonest = BOT_LOOKAHEAD_FRAMES + 1
+        for projectile in projectiles:
+            speed = max(projectile.speed, 1)
+            first = max(1, -(-(rect.top - projectile.rect.bottom) // speed)) # Frames until it reaches the ship's top
+            last = min((rect.bottom - projectile.rect.top) // speed, soonest - 1)
+            for frame in range(first, last + 1):
+                x = min(max(rect.x + direction * ship.speed * frame, 0), max_x)
+                if x < projectile.rect.right and x + rect.width > projectile.rect.left:
+                    soonest = frame
+                    break
+        return soonest
+
+    def _shielded(self, x, y):
+        # True if an intact shield block lies between height y and the ship in column x
+        for obstacle in self.game.obstacles:
+            rect = obstacle.rect
+            if not (rect.left <= x < rect.right) or y >= rect.bottom or not obstacle.blocks_group:
+                continue
+            for local_y in range(max(0, y - rect.top), rect.height, BLOCK_SIZE):
+                if obstacle.surface.get_at((x - rect.left, local_y))[:3] != OBSTACLE_TRANSPARENT_COLOR:
+                    return True
+        return False
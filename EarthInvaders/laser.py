@@ -1,4 +1,5 @@
 import pygame
+from assets import solid_surface
 # Ensuring file is re-processed
 
 # Laser specific constants
@@ -15,30 +16,36 @@ ALIEN_LASER_COLOR_G = 0
 ALIEN_LASER_COLOR_B = 0
 
 class Laser(pygame.sprite.Sprite):
+    __slots__ = ("image", "rect", "swept_rect", "speed", "screen_height")
+
     def __init__(self, position, speed, screen_height):
         super().__init__()
-        self.image = pygame.Surface((PLAYER_LASER_WIDTH, PLAYER_LASER_HEIGHT))
-        self.image.fill((PLAYER_LASER_COLOR_R, PLAYER_LASER_COLOR_G, PLAYER_LASER_COLOR_B))
+        self.image = solid_surface((PLAYER_LASER_WIDTH, PLAYER_LASER_HEIGHT), (PLAYER_LASER_COLOR_R, PLAYER_LASER_COLOR_G, PLAYER_LASER_COLOR_B))
         self.rect = self.image.get_rect(center = position)
+        self.swept_rect = self.rect.copy() # Everything the laser passed through this frame
         self.speed = speed
         self.screen_height = screen_height
 
     def update(self):
         self.rect.y -= self.speed
+        self.swept_rect.update(self.rect.x, self.rect.y, self.rect.width, self.rect.height + self.speed)
         if self.rect.y > self.screen_height + 15 or self.rect.y < 0:
             self.kill()
 
 
 class AlienLaser(pygame.sprite.Sprite):
+    __slots__ = ("image", "rect", "swept_rect", "speed", "screen_height")
+
     def __init__(self, position, speed, screen_height):
         super().__init__()
-        self.image = pygame.Surface((ALIEN_LASER_WIDTH, ALIEN_LASER_HEIGHT))
-        self.image.fill((ALIEN_LASER_COLOR_R, ALIEN_LASER_COLOR_G, ALIEN_LASER_COLOR_B))  # Red color
+        self.image = solid_surface((ALIEN_LASER_WIDTH, ALIEN_LASER_HEIGHT), (ALIEN_LASER_COLOR_R, ALIEN_LASER_COLOR_G, ALIEN_LASER_COLOR_B))  # Red color
         self.rect = self.image.get_rect(center=position)
+        self.swept_rect = self.rect.copy() # Everything the laser passed through this frame
         self.speed = speed
         self.screen_height = screen_height
 
     def update(self):
         self.rect.y += self.speed
+        self.swept_rect.update(self.rect.x, self.rect.y - self.speed, self.rect.width, self.rect.height + self.speed)
         if self.rect.top > self.screen_height:
             self.kill()
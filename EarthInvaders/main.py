@@ -2,31 +2,84 @@
 # This is a new Earth Invaders Pygame developed in Python v3.10 [5/12/24]
 # Enjoy!
 
+from startup_profile import StartupProfiler
+startup = StartupProfiler() # Started before the heavier imports so they show up in the breakdown
+
 import pygame
 import sys
 import random # Ensure random is imported at the top of main.py
 import asyncio # Import asyncio
+import argparse
+import time
 from game import Game
-
-
-pygame.init()
-
-# Attempt to initialize the mixer, but don't crash if it fails
-try:
-    pygame.mixer.init()
-except pygame.error as e:
-    print(f"Warning: Could not initialize mixer. Error: {e}. Game will continue without sound.")
-    # Optionally, disable sound-related functionality further if needed
-
-# Background music
-try:
-    pygame.mixer.music.load("Sounds/dark_music.ogg")
-    pygame.mixer.music.set_volume(0.4)
-    pygame.mixer.music.play(-1)
-except pygame.error as e:
-    print(f"Warning: Could not load background music 'Sounds/dark_music.ogg'. Error: {e}. Game will continue without music.")
-
-font = pygame.font.Font("Font/monogram.ttf", 40)
+from frame_limiter import FrameLimiter, DEFAULT_TARGET_FPS
+from high_scores import HighScoreStore
+from telemetry import Telemetry
+from render_pipeline import RenderPipeline, SCALE_MODES, SCALE_QUALITIES, DEFAULT_SCALE_MODE
+from memory_report import MemoryReport
+from render_queue import RenderQueue, queue_game_scene
+from input_provider import KeyboardInput, BotInput
+from metrics import EngineMetrics, MetricsServer
+from capture import FrameCapture, CAPTURE_DIR, CAPTURE_FORMATS
+from quality_governor import QualityGovernor, FULL_QUALITY
+from sampling_profiler import SamplingProfiler, PROFILE_DIR
+from score_client import ScoreClient
+from background import THREADS_AVAILABLE
+from sim_thread import SimulationThread
+import assets
+startup.mark("modules imported")
+
+def parse_size(text):
+    width, _, height = text.lower().partition("x")
+    return (int(width), int(height))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Earth Invaders")
+    parser.add_argument("--fps", type=int, default=DEFAULT_TARGET_FPS, help="Target frames per second")
+    parser.add_argument("--fixed-fps", action="store_true", help="Keep the target FPS even when frames run over budget")
+    parser.add_argument("--frame-stats", action="store_true", help="Print achieved FPS and missed deadlines on exit")
+    parser.add_argument("--fixed-quality", action="store_true", help="Never shed cosmetic detail (stars, explosions, sounds, HUD) under load")
+    parser.add_argument("--kiosk", default="local", help="Name recorded with each high score")
+    parser.add_argument("--score-server", default=None, metavar="URL",
+                        help="Also report final scores to this leaderboard, e.g. http://127.0.0.1:8770 (see score_server.py)")
+    parser.add_argument("--telemetry", action="store_true", help="Record gameplay events to telemetry/*.jsonl.gz")
+    parser.add_argument("--scale-mode", choices=SCALE_MODES, default=DEFAULT_SCALE_MODE, help="How the fixed-size playfield is upscaled to the window")
+    parser.add_argument("--scale-quality", choices=tuple(SCALE_QUALITIES), default="nearest", help="Filtering used when upscaling")
+    parser.add_argument("--window-size", type=parse_size, default=None, help="Initial window size, e.g. 1500x1400")
+    parser.add_argument("--vsync", action="store_true", help="Sync presentation to the display refresh where supported")
+    parser.add_argument("--memory-report", type=int, default=0, metavar="FRAMES",
+                        help="Print per-round memory use by entity type, sampling every FRAMES gameplay frames")
+    parser.add_argument("--startup-profile", action="store_true", help="Print how long each startup step took")
+    parser.add_argument("--no-asset-cache", action="store_true", help="Decode images and sounds from their files instead of the on-disk cache")
+    parser.add_argument("--pixel-perfect", action="store_true", help="Shots must touch opaque pixels, not just sprite rectangles")
+    parser.add_argument("--threaded-sim", action="store_true",
+                        help="Run the simulation on its own thread at a fixed rate; the render loop draws its latest snapshot")
+    parser.add_argument("--bot", action="store_true", help="Let the dodge-and-shoot bot play instead of the keyboard")
+    parser.add_argument("--metrics-port", type=int, default=0, metavar="PORT",
+                        help="Serve Prometheus metrics at http://127.0.0.1:PORT/metrics (desktop builds)")
+    parser.add_argument("--capture", action="store_true", help="Start capturing gameplay frames right away (F9 toggles)")
+    parser.add_argument("--capture-format", choices=CAPTURE_FORMATS, default="png", help="PNG sequence or one raw RGB file")
+    parser.add_argument("--capture-dir", default=CAPTURE_DIR, help="Where captured sessions are written")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help="Where F10 writes collapsed-stack profiles for flame graphs")
+    # pygbag and IDE launchers may pass arguments of their own, so ignore anything unknown
+    args, _ = parser.parse_known_args()
+    return args
+
+args = parse_args()
+
+# Decoded images and sounds are kept on disk so later launches skip PNG/OGG decoding. Not
+# in the browser, where the file system is in memory and starts empty on every visit.
+asset_cache = None if args.no_asset_cache or sys.platform == "emscripten" else assets.enable_disk_cache()
+
+# Only what the main menu needs is set up before it's shown. pygame.init() would also start
+# the mixer and every other subsystem; audio, music and the game world are deferred (see below).
+# SDL's timer isn't started either, so game timers run on timers.monotonic_ms, not get_ticks().
+with startup.step("pygame display + font init"):
+    pygame.display.init()
+    pygame.font.init()
+
+with startup.step("load font"):
+    font = pygame.font.Font("Font/monogram.ttf", 40)
 
 # Title Configuration
 TITLE_TEXT = "Robert Miller Presents Earth Invaders Revenge"
@@ -44,19 +97,40 @@ STAR_COLORS = [
    
 GREY = (29,29,27)
 
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("RPM Presents Earth Invaders X")
-
-# Create title surface for main menu (original title)
-# Repositioning will be handled in the drawing section for the menu
-title_surface = font.render(TITLE_TEXT, True, TITLE_COLOR)
+# Everything is drawn into `screen` at the fixed internal resolution; the pipeline upscales it to the window
+with startup.step("open window"):
+    render_pipeline = RenderPipeline((SCREEN_WIDTH, SCREEN_HEIGHT), window_size=args.window_size, mode=args.scale_mode,
+                                     quality=args.scale_quality, vsync=args.vsync, caption="RPM Presents Earth Invaders X")
+screen = render_pipeline.surface
 
-# Prompt for Main Menu
 PROMPT_TEXT = "Press ENTER to Start"
 PROMPT_COLOR = (255, 255, 255)  # White
-prompt_surface = font.render(PROMPT_TEXT, True, PROMPT_COLOR)
 
-clock = pygame.time.Clock()
+with startup.step("render menu text"):
+    # Create title surface for main menu (original title)
+    # Repositioning will be handled in the drawing section for the menu
+    title_surface = font.render(TITLE_TEXT, True, TITLE_COLOR)
+
+    # Prompt for Main Menu
+    prompt_surface = font.render(PROMPT_TEXT, True, PROMPT_COLOR)
+
+    # Static overlay text is rendered once and reused on the idle screens
+    paused_surface = font.render("PAUSED", True, (255, 255, 255)) # White
+    resume_surface = font.render("Press P to Resume", True, (200, 200, 200)) # Light grey
+    game_over_surface = font.render("GAME OVER", True, (255, 0, 0)) # Red
+    restart_text_surface = font.render("Press N for New Game", True, (255, 255, 255)) # White
+
+# Menus, pause and game over don't animate, so they only need a few wakeups a second for input
+IDLE_FPS = 10
+
+frame_limiter = FrameLimiter(target_fps=args.fps, adaptive=not args.fixed_fps)
+# Sheds cosmetic work within a fraction of a second of frames running hot; the frame
+# limiter only lowers the target FPS if that wasn't enough
+quality_governor = None if args.fixed_quality else QualityGovernor()
+
+# The loop publishes a snapshot once per frame; the endpoint thread only ever reads the latest one
+engine_metrics = EngineMetrics() if args.metrics_port else None
+metrics_server = MetricsServer(engine_metrics, args.metrics_port) if engine_metrics else None
 
 def initialize_stars(width, height, num_stars):
     star_list = []
@@ -70,7 +144,143 @@ def initialize_stars(width, height, num_stars):
         star_list.append({'x': star_x, 'y': star_y, 'size': star_size, 'color': star_color, 'speed': star_scroll_speed})
     return star_list
 
-game = Game(SCREEN_WIDTH, SCREEN_HEIGHT)
+input_provider = BotInput() if args.bot else KeyboardInput()
+
+def start_capture():
+    capture = FrameCapture(screen.get_size(), directory=args.capture_dir, format=args.capture_format)
+    print(f"Capturing gameplay to {capture.directory}")
+    return capture
+
+def stop_capture(capture):
+    capture.close()
+    print(f"Capture: {capture.report()}")
+
+def start_profiler():
+    # With --threaded-sim Game.update runs on the simulation thread, so that's the one to sample
+    thread_id = simulation._thread.ident if simulation and simulation._thread else None
+    profiler = SamplingProfiler(thread_id=thread_id) # None samples this (the render loop's) thread
+    profiler.start()
+    print("Profiling the game loop; press F10 again to stop")
+    return profiler
+
+def stop_profiler(profiler):
+    profiler.stop()
+    try:
+        path = profiler.write(args.profile_dir)
+        print(f"Profile: {profiler.report()} -> {path}")
+    except OSError as e:
+        print(f"Warning: Could not write profile to '{args.profile_dir}'. Error: {e}. Profile discarded.")
+
+# Built by the deferred startup steps while the menu is showing
+telemetry = None
+high_scores = None
+score_client = None
+game = None
+simulation = None # Owns the game with --threaded-sim
+
+def init_audio():
+    # Attempt to initialize the mixer, but don't crash if it fails
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        print(f"Warning: Could not initialize mixer. Error: {e}. Game will continue without sound.")
+        return
+
+    # Background music
+    try:
+        pygame.mixer.music.load("Sounds/dark_music.ogg")
+        pygame.mixer.music.set_volume(0.4)
+        pygame.mixer.music.play(-1)
+    except pygame.error as e:
+        print(f"Warning: Could not load background music 'Sounds/dark_music.ogg'. Error: {e}. Game will continue without music.")
+
+def load_high_scores():
+    global high_scores
+    high_scores = HighScoreStore()
+
+def start_score_client():
+    # Unsent scores from earlier sessions are picked up from the journal and sent as well
+    global score_client
+    if not args.score_server:
+        return
+    if not THREADS_AVAILABLE:
+        print("Warning: Reporting scores needs threads and sockets, which this build doesn't have. Scores are kept locally only.")
+        return
+    score_client = ScoreClient(args.score_server)
+
+def start_telemetry():
+    global telemetry
+    telemetry = Telemetry() if args.telemetry else None
+
+def build_game():
+    # Loads the sprite images and sounds and lays out aliens and obstacles
+    global game
+    game = Game(SCREEN_WIDTH, SCREEN_HEIGHT, telemetry=telemetry, input_provider=input_provider,
+                pixel_perfect=args.pixel_perfect)
+    if args.bot:
+        input_provider.game = game
+    if args.threaded_sim:
+        start_simulation()
+
+def start_simulation():
+    global simulation
+    if not THREADS_AVAILABLE:
+        print("Warning: --threaded-sim needs threads, which this build doesn't have. The simulation runs in the render loop.")
+        return
+    simulation = SimulationThread(game, input_provider, after_update=after_simulation_update)
+    simulation.start()
+
+def on_game(function, *args, **kwargs):
+    # With --threaded-sim the game belongs to the simulation thread, so changes to it are made
+    # there, between ticks (this waits at most one tick)
+    if simulation:
+        return simulation.run(function, *args, **kwargs)
+    return function(*args, **kwargs)
+
+def set_playing(playing):
+    # Runs through on_game(); the simulation thread only updates the game while playing
+    if simulation:
+        simulation.active = playing
+        if playing and quality_governor:
+            quality_governor.reset() # Windows shouldn't straddle idle screens
+
+def pause_game():
+    set_playing(False)
+    game.timers.pause()
+
+def resume_game():
+    game.timers.resume()
+    set_playing(True)
+
+def new_game():
+    game.reset_game(new_round_started=False)
+    set_playing(True)
+
+# Run one per idle menu frame once the menu is on screen, in this order (the game needs the
+# mixer for its sounds and telemetry to report to). Pressing ENTER runs whatever is left.
+DEFERRED_STARTUP = [
+    ("mixer init + music", init_audio),
+    ("load high scores", load_high_scores),
+    ("start score client", start_score_client),
+    ("start telemetry", start_telemetry),
+    ("build game world", build_game),
+]
+pending_startup = list(DEFERRED_STARTUP)
+
+def run_startup_steps(count=None):
+    # Runs the next `count` deferred steps, or all that are left
+    while pending_startup and count != 0:
+        name, step = pending_startup.pop(0)
+        with startup.step(name):
+            step()
+        if count is not None:
+            count -= 1
+        if not pending_startup:
+            startup.mark("ready to play")
+            if args.startup_profile:
+                print(startup.report())
+                if asset_cache:
+                    print(f"Asset cache: {asset_cache.report()}")
 
 # Game States
 MAIN_MENU = "main_menu"
@@ -78,211 +288,288 @@ PLAYING = "playing"
 PAUSED = "paused"
 current_state = MAIN_MENU
 
-stars = initialize_stars(SCREEN_WIDTH, SCREEN_HEIGHT, NUM_STARS) # Add this line
+memory_report = MemoryReport(every=args.memory_report) if args.memory_report else None
+report_level = 1 # Games start on level 1
+last_rank = None # Rank of the score recorded for the current game over, once recorded
+game_started_at = None
+
+with startup.step("generate stars"):
+    stars = initialize_stars(SCREEN_WIDTH, SCREEN_HEIGHT, NUM_STARS) # Add this line
+
+# HUD text is only re-rendered when a value changes, and under load no more often than
+# the quality level allows
+hud_items = []
+hud_values = None
+hud_frames_since_render = 0
+
+def queue_hud(queue, values):
+    # values: (score, lives, level)
+    global hud_values, hud_frames_since_render
+    hud_frames_since_render += 1
+    if values != hud_values and hud_frames_since_render >= current_quality().hud_every_frames:
+        # Display current score
+        score, lives, level = values
+        score_surface = font.render(f"Score: {score}", True, (255, 255, 255))
+        # Display current lives
+        lives_surface = font.render(f"Lives: {lives}", True, (255, 255, 255)) # White color
+        # Display current level, top-center
+        level_surface = font.render(f"Level: {level}", True, (255, 255, 255))
+        hud_items[:] = [
+            (score_surface, score_surface.get_rect(topright=(SCREEN_WIDTH - 20, 10))),
+            (lives_surface, lives_surface.get_rect(topleft=(20, 10))),
+            (level_surface, level_surface.get_rect(midtop=(SCREEN_WIDTH / 2, 10))),
+        ]
+        hud_values = values
+        hud_frames_since_render = 0
+    for surface, rect in hud_items:
+        queue.add(surface, rect)
+
+def sample_memory(game):
+    # After each update, on whichever thread runs the simulation
+    global report_level
+    if memory_report:
+        memory_report.sample(game)
+        if game.current_level_number != report_level or game.game_over:
+            memory_report.end_round(f"level {report_level}")
+            report_level = game.current_level_number
+
+def govern_quality(game, cost, budget):
+    # On whichever thread runs the simulation, which is the only one that sets game.quality
+    quality_governor.record(cost, budget)
+    game.quality = quality_governor.level
+
+def after_simulation_update(game):
+    # With --threaded-sim the governor weighs what Game.update() cost against the tick it had
+    sample_memory(game)
+    if quality_governor:
+        govern_quality(game, simulation.last_update_seconds, simulation.period)
+
+def current_quality():
+    # The render loop's cosmetics follow the governor directly, without reading the game
+    return quality_governor.level if quality_governor else FULL_QUALITY
+
+def visible_stars():
+    # The quality governor thins the starfield under load; the rest of the list just waits
+    return stars[:int(len(stars) * current_quality().star_fraction)]
+
+def draw_background(surface):
+    surface.fill((0, 0, 0)) # Fill screen with black
+    for star in visible_stars():
+        pygame.draw.rect(surface, star['color'], (star['x'], star['y'], star['size'], star['size']))
+
+def idle_frame_key():
+    # Identifies the static screen currently showing, or None while gameplay is animating
+    if current_state == MAIN_MENU:
+        return (MAIN_MENU,)
+    if current_state == PAUSED:
+        return (PAUSED,)
+    if game.game_over:
+        return ("game_over", game.score)
+    return None
+
+def build_idle_frame(key):
+    if current_state == PAUSED:
+        # The screen still holds the last gameplay frame; freeze it and put the overlay on top once
+        frame = screen.copy()
+        frame.blit(paused_surface, paused_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)))
+        frame.blit(resume_surface, resume_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 40)))
+        return frame
+
+    frame = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    draw_background(frame)
+    if current_state == MAIN_MENU:
+        frame.blit(title_surface, title_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 3)))
+        frame.blit(prompt_surface, prompt_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)))
+    else: # Game Over Screen
+        frame.blit(game_over_surface, game_over_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 60)))
+        final_score_surface = font.render(f"Score: {game.score}", True, (255, 255, 255))
+        frame.blit(final_score_surface, final_score_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)))
+        best = high_scores.best() if high_scores else None # Built by a deferred startup step
+        if best and last_rank:
+            rank_surface = font.render(f"Rank #{last_rank}   Best: {best.score}", True, (200, 200, 200)) # Light grey
+            frame.blit(rank_surface, rank_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 40)))
+        frame.blit(restart_text_surface, restart_text_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 100)))
+    return frame
 
 async def main(): # Define async main function
-    global current_state, game # Ensure global variables are accessible if modified
+    global current_state, game, last_rank, game_started_at # Ensure global variables are accessible if modified
+
+    render_queue = RenderQueue()
+    idle_frame = None
+    idle_key = None
+    menu_shown = False
+    capture = start_capture() if args.capture else None
+    profiler = None # Only exists between F10 presses
 
     running = True
     while running:
+        loop_start = time.perf_counter()
+        needs_present = False
+
         #Checking for events
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False # Set running to False to exit loop
 
+            # The window contents may have been lost or resized, so idle screens must present again
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                needs_present = True
+            if render_pipeline.handle_event(event):
+                needs_present = True
+            # Capture is a recording tool, so it listens to the keyboard even when the bot plays
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+                if capture:
+                    stop_capture(capture)
+                    capture = None
+                else:
+                    capture = start_capture()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F10:
+                if profiler:
+                    stop_profiler(profiler)
+                    profiler = None
+                else:
+                    profiler = start_profiler()
+
+        # Menu, pause and restart keys come from the input provider, like the spaceship controls
+        if simulation:
+            simulation.post_events(events) # The input provider runs on the simulation thread
+            menu_keys = simulation.take_keys()
+        else:
+            menu_keys = input_provider.begin_frame(events)
+        for key in menu_keys:
             # Handle pause toggle if P is pressed
-            if event.type == pygame.KEYDOWN: # This line was unindented
-                if event.key == pygame.K_p:
-                    if current_state == PLAYING:
+            if key == pygame.K_p:
+                # Every game timer (respawns, shields, explosions...) freezes with the game
+                if current_state == PLAYING:
                     current_state = PAUSED
+                    on_game(pause_game)
                 elif current_state == PAUSED:
                     current_state = PLAYING
+                    on_game(resume_game)
 
             # Other keydown events based on state
-            if current_state == MAIN_MENU:
-                if event.key == pygame.K_RETURN:
+            elif current_state == MAIN_MENU:
+                if key == pygame.K_RETURN:
+                    run_startup_steps() # Finish anything the menu didn't get to
                     current_state = PLAYING
-                    game.reset_game(new_round_started=False)
+                    on_game(new_game)
+                    last_rank = None
+                    game_started_at = time.time()
             elif current_state == PLAYING: # This condition is for when the game is active (not paused, not main menu)
                 if game.game_over:
-                    if event.key == pygame.K_n:
+                    if key == pygame.K_n:
                         current_state = MAIN_MENU
-                # Potentially other PLAYING key events for spaceship controls if they are handled here
                 # (Spaceship controls are in spaceship.py's get_user_input, which is fine)
             # Note: No specific keydown events for PAUSED state other than K_p to unpause (handled above)
 
-    #Updating
-    # Only update game logic if in PLAYING state and not game over
-    if current_state == PLAYING and not game.game_over:
-
-        # Update star positions for scrolling effect
-        for star in stars:
-            star['y'] += star['speed']
-            if star['y'] > SCREEN_HEIGHT: # Star has moved off the bottom
-                star['y'] = 0 # Reset to top
-                star['x'] = random.randint(0, SCREEN_WIDTH) # New random x position
-                # Optional: Re-randomize size, color, and speed for variety
-                star['size'] = random.randint(1, 2)
-                star['color'] = random.choice(STAR_COLORS)
-                star['speed'] = random.uniform(0.5, 1.5)
-
-        game.handle_spaceship_respawn() # Add this call
-        game._check_and_activate_frenzy_mode() # Add this call
-        game.spaceship_group.update()
-        game.move_aliens()
-        game.alien_shoot()
-        game.alien_lasers_group.update() # Update lasers before checking round clear
-
-        if game.check_round_clear(): # New call
-            game.reset_game(new_round_started=True)
+        #Updating
+        # Only update game logic if in PLAYING state and not game over
+        if current_state == PLAYING and not game.game_over:
+
+            # Update star positions for scrolling effect
+            for star in visible_stars():
+                star['y'] += star['speed']
+                if star['y'] > SCREEN_HEIGHT: # Star has moved off the bottom
+                    star['y'] = 0 # Reset to top
+                    star['x'] = random.randint(0, SCREEN_WIDTH) # New random x position
+                    # Optional: Re-randomize size, color, and speed for variety
+                    star['size'] = random.randint(1, 2)
+                    star['color'] = random.choice(STAR_COLORS)
+                    star['speed'] = random.uniform(0.5, 1.5)
+
+            if not simulation:
+                game.update()
+                sample_memory(game)
+
+        # Record the final score once; the disk write happens on the high score worker
+        if game is not None and game.game_over and last_rank is None:
+            run_startup_steps() # The game is built last, so this only guards against reordered steps
+            last_rank = high_scores.submit(game.score, args.kiosk)
+            if score_client:
+                # Queued only; the journal write and the upload happen on the client's worker
+                score_client.submit(game.score, args.kiosk, level=game.current_level_number,
+                                    duration_s=round(time.time() - game_started_at, 1) if game_started_at else None)
+
+        if engine_metrics:
+            engine_metrics.publish(game)
+
+        #Drawing
+        key = idle_frame_key()
+        if key is not None:
+            # Static screen: composite it once, then only present again if it changes or gets exposed
+            if key != idle_key:
+                idle_frame = build_idle_frame(key)
+                idle_key = key
+                needs_present = True
+            if needs_present:
+                screen.blit(idle_frame, (0, 0))
+                render_pipeline.present()
+            if pending_startup and current_state == MAIN_MENU:
+                # The menu has been presented by now, so the rest of startup happens behind it
+                if not menu_shown:
+                    startup.mark("first menu frame presented")
+                    menu_shown = True
+                run_startup_steps(1)
+            if high_scores:
+                high_scores.pump() # Browser builds write here, while nothing is animating
+            if telemetry:
+                telemetry.pump()
+            if quality_governor and not simulation: # The simulation thread resets it on resume
+                quality_governor.reset()
+            if engine_metrics:
+                engine_metrics.reset() # Idle frames don't count towards FPS or frame times
+            await frame_limiter.wait_idle(IDLE_FPS)
+            continue
+
+        idle_frame = None
+        idle_key = None
+        draw_background(screen)
+
+        # Gameplay scene, then HUD on top; submitted in one blits() call
+        if simulation:
+            snapshot = simulation.snapshot # One complete tick, never touched again by the simulation
+            render_queue.extend(snapshot.items)
+            queue_hud(render_queue, (snapshot.score, snapshot.lives, snapshot.level))
         else:
-            # Only run these other updates if a round isn't immediately cleared and reset
-            game.spawn_super_alien()
-            game.handle_bomb_dropping()
-            game.super_alien_group.update()
-            game.bombs_group.update()
-            game.explosions_group.update()
-            game.check_collisions()
-            game.check_hostile_projectile_collisions()
-    
-    
-    #Drawing
-    screen.fill((0, 0, 0)) # Fill screen with black
-
-    # Draw stars
-    for star in stars:
-        pygame.draw.rect(screen, star['color'], (star['x'], star['y'], star['size'], star['size']))
-
-    if current_state == MAIN_MENU:
-        # Draw Main Menu
-        # Title position for main menu
-        mm_title_rect = title_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 3))
-        screen.blit(title_surface, mm_title_rect)
-
-        # Prompt position for main menu
-        prompt_rect = prompt_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
-        screen.blit(prompt_surface, prompt_rect)
-
-    elif current_state == PLAYING:
-        if not game.game_over:
-            # Draw active game elements
-            if game.spaceship_group.sprite: # Ensure spaceship exists before drawing its lasers
-                game.spaceship_group.sprite.lasers_group.draw(screen)
-
-            # Handle spaceship blinking for invincibility
-            if game.spaceship_group.sprite: # Check if spaceship exists
-                if getattr(game.spaceship_group.sprite, 'blink_on', True): # Default to True if no attribute
-                    game.spaceship_group.draw(screen)
-                # If blink_on is False, it's simply not drawn for that frame.
-
-            # Add shield drawing logic AFTER spaceship is drawn
-            if game.spaceship_group.sprite and getattr(game.spaceship_group.sprite, 'shield_active', False):
-                shield_aura_surface = getattr(game.spaceship_group.sprite, 'shield_aura_surface', None)
-                if shield_aura_surface:
-                    aura_rect = shield_aura_surface.get_rect(center=game.spaceship_group.sprite.rect.center)
-                    screen.blit(shield_aura_surface, aura_rect)
-
-            for obstacle in game.obstacles:
-                obstacle.blocks_group.draw(screen)
-            game.aliens_group.draw(screen)
-            game.alien_lasers_group.draw(screen)
-            game.super_alien_group.draw(screen)
-            game.bombs_group.draw(screen)
-            game.explosions_group.draw(screen)
-
-            # Display current score during active gameplay
-            score_surface = font.render(f"Score: {game.score}", True, (255, 255, 255))
-            score_rect = score_surface.get_rect(topright=(SCREEN_WIDTH - 20, 10))
-            screen.blit(score_surface, score_rect)
-
-            # New Lives display
-            lives_text = f"Lives: {game.lives}"
-            lives_surface = font.render(lives_text, True, (255, 255, 255)) # White color
-            lives_rect = lives_surface.get_rect(topleft=(20, 10))
-            screen.blit(lives_surface, lives_rect)
-
-            # Display current level
-            level_text = f"Level: {game.current_level_number}"
-            # Using the global 'font' and white color (255,255,255)
-            level_surface = font.render(level_text, True, (255, 255, 255))
-            # Position it, e.g., top-center
-            level_rect = level_surface.get_rect(midtop=(SCREEN_WIDTH / 2, 10))
-            screen.blit(level_surface, level_rect)
-        else: # This means current_state == PLAYING and game.game_over is True
-            # Game Over Screen
-            game_over_surface = font.render("GAME OVER", True, (255, 0, 0)) # Red
-            game_over_rect = game_over_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 60))
-            screen.blit(game_over_surface, game_over_rect)
-
-            final_score_surface = font.render(f"Score: {game.score}", True, (255, 255, 255))
-            final_score_rect = final_score_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
-            screen.blit(final_score_surface, final_score_rect)
-
-            # The prompt text might need updating based on previous subtask (N to go to Menu)
-            # But sticking to "Press N for New Game" as per current subtask's verification items.
-            restart_text_surface = font.render("Press N for New Game", True, (255, 255, 255)) # White
-            restart_text_rect = restart_text_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 60))
-            screen.blit(restart_text_surface, restart_text_rect)
-
-    elif current_state == PAUSED:
-        # 1. Draw the 'frozen' game scene (similar to PLAYING and not game.game_over)
-        if game.spaceship_group.sprite: # Ensure spaceship exists before drawing its lasers
-            game.spaceship_group.sprite.lasers_group.draw(screen)
-
-        # Handle spaceship blinking for invincibility
-        if game.spaceship_group.sprite: # Check if spaceship exists
-            if getattr(game.spaceship_group.sprite, 'blink_on', True): # Default to True if no attribute
-                game.spaceship_group.draw(screen)
-            # If blink_on is False, it's simply not drawn for that frame.
-
-            # Add shield drawing logic AFTER spaceship is drawn in PAUSED state
-            if game.spaceship_group.sprite and getattr(game.spaceship_group.sprite, 'shield_active', False):
-                shield_aura_surface = getattr(game.spaceship_group.sprite, 'shield_aura_surface', None)
-                if shield_aura_surface:
-                    aura_rect = shield_aura_surface.get_rect(center=game.spaceship_group.sprite.rect.center)
-                    screen.blit(shield_aura_surface, aura_rect)
-
-        for obstacle in game.obstacles:
-            obstacle.blocks_group.draw(screen)
-        game.aliens_group.draw(screen)
-        game.alien_lasers_group.draw(screen)
-        game.super_alien_group.draw(screen)
-        game.bombs_group.draw(screen)
-        game.explosions_group.draw(screen)
-
-        # Display current score
-        score_surface = font.render(f"Score: {game.score}", True, (255, 255, 255))
-        score_rect = score_surface.get_rect(topright=(SCREEN_WIDTH - 20, 10))
-        screen.blit(score_surface, score_rect)
-
-        # Display current lives
-        lives_text = f"Lives: {game.lives}"
-        lives_surface = font.render(lives_text, True, (255, 255, 255))
-        lives_rect = lives_surface.get_rect(topleft=(20, 10))
-        screen.blit(lives_surface, lives_rect)
-
-        # Display current level
-        level_text = f"Level: {game.current_level_number}"
-        level_surface = font.render(level_text, True, (255, 255, 255))
-        level_rect = level_surface.get_rect(midtop=(SCREEN_WIDTH / 2, 10))
-        screen.blit(level_surface, level_rect)
-
-        # 2. Render and blit the "PAUSED" message
-        paused_text = "PAUSED"
-        paused_color = (255, 255, 255) # White
-        paused_surface = font.render(paused_text, True, paused_color)
-        paused_rect = paused_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
-        screen.blit(paused_surface, paused_rect)
-
-        # Optional: Add a sub-text like "Press P to Resume"
-        resume_text = "Press P to Resume"
-        resume_color = (200, 200, 200) # Light grey
-        resume_surface = font.render(resume_text, True, resume_color) # Use the same font or a smaller one
-        resume_rect = resume_surface.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 40)) # Position below "PAUSED"
-        screen.blit(resume_surface, resume_rect)
-
-        pygame.display.update() # Moved into the loop
-        await asyncio.sleep(0) # Moved into the loop
+            queue_game_scene(render_queue, game)
+            queue_hud(render_queue, (game.score, game.lives, game.current_level_number))
+        render_queue.flush(screen)
+        if capture:
+            capture.capture(screen) # Gameplay frames only; idle screens don't animate
+            capture.pump()
+
+        if quality_governor and not simulation:
+            # Work done this frame, measured before present() so vsync waits don't count as load
+            govern_quality(game, time.perf_counter() - loop_start, frame_limiter.frame_budget)
+        render_pipeline.present()
+        await frame_limiter.wait()
+
+    if simulation:
+        simulation.stop()
+    if high_scores:
+        high_scores.close()
+    if memory_report:
+        memory_report.end_round(f"level {report_level} (unfinished)")
+    if telemetry:
+        telemetry.close()
+    if score_client:
+        score_client.close()
+    if metrics_server:
+        metrics_server.close()
+    if capture:
+        stop_capture(capture)
+    if profiler:
+        stop_profiler(profiler)
+
+    if args.frame_stats:
+        print(f"Frame pacing: {frame_limiter.report()}")
+        if quality_governor:
+            print(f"Quality: {quality_governor.report()}")
+        if simulation:
+            print(f"Simulation: {simulation.report()}")
+    if args.startup_profile and pending_startup:
+        print(startup.report()) # Quit before startup finished
 
     pygame.quit()
     sys.exit()
@@ -0,0 +1,125 @@
+import os
+import sys
+import tracemalloc
+
+# Memory report specific constants
+# Allocations are attributed to the entity whose module was executing when they happened
+ENTITY_MODULES = {
+    "alien.py": "Alien",
+    "laser.py": "Laser/AlienLaser",
+    "bomb.py": "Bomb",
+    "obstacle.py": "Block",
+    "explosion.py": "Explosion",
+    "super_alien.py": "SuperAlien",
+    "spaceship.py": "Spaceship",
+}
+OTHER = "other"
+TRACEBACK_FRAMES = 4
+
+def rss_kb():
+    # Current resident set size of the process. /proc is Linux-only; elsewhere fall back
+    # to the peak RSS, which still shows steady growth but never shrinks.
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak # Bytes on macOS, KB elsewhere
+
+def _entity_groups(game):
+    # Live sprites per entity type, straight from the game's groups
+    spaceship = game.spaceship_group.sprite
+    return {
+        "Alien": game.aliens_group.sprites(),
+        "Laser/AlienLaser": (spaceship.lasers_group.sprites() if spaceship else []) + game.alien_lasers_group.sprites(),
+        "Bomb": game.bombs_group.sprites(),
+        "Block": [block for obstacle in game.obstacles for block in obstacle.blocks_group],
+        "Explosion": game.explosions_group.sprites(),
+        "SuperAlien": game.super_alien_group.sprites(),
+        "Spaceship": [spaceship] if spaceship else [],
+    }
+
+def _instance_size(sprite):
+    # Shallow Python-side cost of one sprite: the object, its __dict__ and its Rect.
+    # Images are shared between sprites (see assets.py), so they aren't charged here.
+    size = sys.getsizeof(sprite) + sys.getsizeof(sprite.rect)
+    instance_dict = getattr(sprite, "__dict__", None)
+    if instance_dict is not None:
+        size += sys.getsizeof(instance_dict)
+    return size
+
+class MemoryReport:
+    # Per-round memory breakdown by entity type, for checking the browser build's WASM
+    # budget. Every `every` gameplay frames it records live instance counts and sizes,
+    # and uses tracemalloc to attribute the memory still allocated since the previous
+    # sample (net growth; blocks allocated and freed in between don't show up).
+    # tracemalloc itself is slow, so this is a diagnostic mode, not something to ship on.
+    def __init__(self, every=1, out=None):
+        self.every = max(1, every)
+        self.out = out or sys.stdout
+        self._frame = 0
+        self._previous = None
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEBACK_FRAMES)
+        self._reset_round()
+
+    def _reset_round(self):
+        self.frames = 0
+        self.samples = 0
+        self.peak_count = {}
+        self.peak_bytes = {}
+        self.allocated_bytes = {}
+        self.allocation_count = {}
+
+    def _entity_for(self, traceback):
+        for frame in traceback: # Most recent call first
+            entity = ENTITY_MODULES.get(os.path.basename(frame.filename))
+            if entity:
+                return entity
+        return OTHER
+
+    def sample(self, game):
+        self.frames += 1
+        self._frame += 1
+        if self._frame % self.every:
+            return
+        self.samples += 1
+
+        for entity, sprites in _entity_groups(game).items():
+            live_bytes = sum(_instance_size(sprite) for sprite in sprites)
+            self.peak_count[entity] = max(self.peak_count.get(entity, 0), len(sprites))
+            self.peak_bytes[entity] = max(self.peak_bytes.get(entity, 0), live_bytes)
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        if self._previous is not None:
+            for stat in snapshot.compare_to(self._previous, "traceback"):
+                if stat.size_diff > 0:
+                    entity = self._entity_for(stat.traceback)
+                    self.allocated_bytes[entity] = self.allocated_bytes.get(entity, 0) + stat.size_diff
+                    self.allocation_count[entity] = self.allocation_count.get(entity, 0) + max(stat.count_diff, 0)
+        self._previous = snapshot
+
+    def end_round(self, label):
+        if self.samples:
+            print(self.format(label), file=self.out)
+        self._reset_round()
+
+    def format(self, label):
+        lines = [f"Memory report for {label} ({self.frames} frames, {self.samples} samples)",
+                 f"{'entity':<18}{'peak live':>10}{'peak KB':>10}{'net KB/frame':>14}{'allocs/frame':>14}"]
+        entities = list(ENTITY_MODULES.values()) + [OTHER]
+        for entity in dict.fromkeys(entities):
+            per_frame_kb = self.allocated_bytes.get(entity, 0) / 1024 / self.frames
+            per_frame_count = self.allocation_count.get(entity, 0) / self.frames
+            lines.append(f"{entity:<18}{self.peak_count.get(entity, 0):>10}{self.peak_bytes.get(entity, 0) / 1024:>10.1f}"
+                         f"{per_frame_kb:>14.2f}{per_frame_count:>14.1f}")
+        current, peak = tracemalloc.get_traced_memory()
+        lines.append(f"Python heap: {current / 1024:.0f} KB now, {peak / 1024:.0f} KB peak")
+        return "\n".join(lines)
+
+    def close(self):
+        tracemalloc.stop()
@@ -0,0 +1,159 @@
+import collections
+import http.server
+import threading
+import time
+from background import THREADS_AVAILABLE
+from memory_report import rss_kb
+
+# Metrics specific constants
+FRAME_WINDOW = 240 # Recent frames used for FPS and frame-time quantiles
+QUANTILES = (0.5, 0.9, 0.99)
+RATE_WINDOW_S = 1.0 # Collision checks per second are averaged over this long
+METRIC_PREFIX = "earth_invaders"
+SPRITE_GROUPS = ("aliens", "alien_lasers", "player_lasers", "bombs", "explosions", "blocks", "super_alien")
+
+def sprite_counts(game):
+    if game is None:
+        return dict.fromkeys(SPRITE_GROUPS, 0)
+    spaceship = game.spaceship_group.sprite
+    return {
+        "aliens": len(game.aliens_group),
+        "alien_lasers": len(game.alien_lasers_group),
+        "player_lasers": len(spaceship.lasers_group) if spaceship else 0,
+        "bombs": len(game.bombs_group),
+        "explosions": len(game.explosions_group),
+        "blocks": sum(len(obstacle.blocks_group) for obstacle in game.obstacles),
+        "super_alien": len(game.super_alien_group),
+    }
+
+class EngineMetrics:
+    # Game-loop side. publish() is called once per frame and builds a fresh snapshot
+    # (a dict that is never modified afterwards), then swaps it in with one attribute
+    # assignment. Readers on other threads just take whatever `snapshot` points at,
+    # so neither side ever waits on a lock. Anything slow (sorting for quantiles,
+    # reading RSS, formatting) is left to the reader.
+    def __init__(self, window=FRAME_WINDOW, clock=time.perf_counter):
+        self.clock = clock
+        self.snapshot = None
+        self._frame_times = collections.deque(maxlen=window)
+        self._last_frame = None
+        self._frames_total = 0
+        self._frame_seconds_total = 0.0
+        self._rate_started = None
+        self._rate_checks = 0
+        self._checks_per_second = 0.0
+
+    def publish(self, game):
+        now = self.clock()
+        if self._last_frame is not None:
+            frame_time = now - self._last_frame
+            self._frame_times.append(frame_time)
+            self._frames_total += 1
+            self._frame_seconds_total += frame_time
+        self._last_frame = now
+
+        checks = game.collision_checks if game else 0
+        if self._rate_started is None or checks < self._rate_checks: # First frame, or a new Game
+            self._rate_started, self._rate_checks = now, checks
+        elif now - self._rate_started >= RATE_WINDOW_S:
+            self._checks_per_second = (checks - self._rate_checks) / (now - self._rate_started)
+            self._rate_started, self._rate_checks = now, checks
+
+        self.snapshot = {
+            "frame_times": tuple(self._frame_times),
+            "frames_total": self._frames_total,
+            "frame_seconds_total": self._frame_seconds_total,
+            "sprites": sprite_counts(game),
+            "collision_checks_total": checks,
+            "collision_checks_per_second": self._checks_per_second,
+            "game_speed_modifier": game.game_speed_modifier if game else 0.0,
+            "level": game.current_level_number if game else 0,
+        }
+
+    def reset(self):
+        # Called on idle screens: they run at IDLE_FPS, so the gaps between them (and the one
+        # before the next gameplay frame) aren't frame times. Totals keep counting.
+        self._frame_times.clear()
+        self._last_frame = None
+
+def _quantile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+def format_prometheus(snapshot, resident_kb=None):
+    # Prometheus text exposition format (version 0.0.4)
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{METRIC_PREFIX}_{name}{labels} {value}")
+
+    if snapshot is None: # Nothing published yet
+        metric("up", "gauge", "1 once the game loop has published a frame", [("", 0)])
+        return "\n".join(lines) + "\n"
+
+    frame_times = snapshot["frame_times"]
+    ordered = sorted(frame_times)
+    span = sum(frame_times)
+    metric("up", "gauge", "1 once the game loop has published a frame", [("", 1)])
+    metric("fps", "gauge", f"Frames per second over the last {len(frame_times)} frames",
+           [("", round(len(frame_times) / span, 3) if span else 0)])
+    metric("frame_seconds", "summary", "Time between frames",
+           [(f'{{quantile="{q}"}}', f"{_quantile(ordered, q):.6f}") for q in QUANTILES]
+           + [("_sum", f"{snapshot['frame_seconds_total']:.6f}"), ("_count", snapshot["frames_total"])])
+    metric("sprites", "gauge", "Live sprites per group",
+           [(f'{{group="{group}"}}', count) for group, count in snapshot["sprites"].items()])
+    metric("collision_checks_total", "counter", "Sprite pairs tested for collisions since the Game was created",
+           [("", snapshot["collision_checks_total"])])
+    metric("collision_checks_per_second", "gauge", "Sprite pairs tested for collisions per second",
+           [("", round(snapshot["collision_checks_per_second"], 1))])
+    metric("game_speed_modifier", "gauge", "Current alien speed multiplier", [("", snapshot["game_speed_modifier"])])
+    metric("level", "gauge", "Current level number", [("", snapshot["level"])])
+    if resident_kb is not None:
+        metric("resident_memory_bytes", "gauge", "Resident set size of the process", [("", resident_kb * 1024)])
+    return "\n".join(lines) + "\n"
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = format_prometheus(self.server.metrics.snapshot, rss_kb()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Scrapes every few seconds would otherwise fill the console
+
+class MetricsServer:
+    # Serves EngineMetrics snapshots at http://host:port/metrics from a daemon thread.
+    # Localhost only by default; the kiosk's collector scrapes it from the same machine.
+    def __init__(self, metrics, port, host="127.0.0.1"):
+        self.metrics = metrics
+        self._httpd = None
+        self._thread = None
+        if not THREADS_AVAILABLE:
+            print("Warning: Metrics endpoint needs threads and sockets, which this build doesn't have. Metrics are disabled.")
+            return
+        try:
+            self._httpd = http.server.HTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            print(f"Warning: Could not start metrics endpoint on {host}:{port}. Error: {e}. Metrics are disabled.")
+            return
+        self._httpd.metrics = metrics
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-endpoint", daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self):
+        return self._httpd.server_address if self._httpd else None
+
+    def close(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
@@ -1,17 +1,29 @@
 import pygame
+from assets import solid_surface
+
+# Obstacle specific constants
+BLOCK_SIZE = 3
+BLOCK_COLOR = (243,216,63)
+BLOCK_HEALTH = 2
+OBSTACLE_TRANSPARENT_COLOR = (0,0,0) # Colorkey for destroyed parts of the cached obstacle surface
 
 class Block(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    # About a thousand of these per round, so slots and one shared 3x3 surface
+    __slots__ = ("image", "rect", "health", "obstacle")
+
+    def __init__(self, x, y, obstacle=None):
         super().__init__()
-        self.image = pygame.Surface((3,3))
-        self.image.fill((243,216,63))
+        self.image = solid_surface((BLOCK_SIZE,BLOCK_SIZE), BLOCK_COLOR)
         self.rect = self.image.get_rect(topleft = (x,y))
-        self.health = 2
+        self.health = BLOCK_HEALTH
+        self.obstacle = obstacle # Owning Obstacle, whose cached surface needs updating when this block dies
 
     def take_damage(self, amount):
         self.health -= amount
         if self.health <= 0:
             self.kill()
+            if self.obstacle:
+                self.obstacle.clear_block(self)
 
 grid = [
 [0,0,0,0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,0,0,0,0],
@@ -31,10 +43,45 @@ grid = [
 class Obstacle:
     def __init__(self,x, y):
         self.blocks_group = pygame.sprite.Group()
+        # The blocks stay sprites for collisions, but are drawn from one cached surface
+        # that only changes when a block is destroyed, instead of hundreds of 3x3 blits
+        self.rect = pygame.Rect(x, y, len(grid[0]) * BLOCK_SIZE, len(grid) * BLOCK_SIZE)
+        self.surface = pygame.Surface(self.rect.size)
+        if pygame.display.get_surface():
+            self.surface = self.surface.convert()
+        self.surface.fill(OBSTACLE_TRANSPARENT_COLOR)
+        self.surface.set_colorkey(OBSTACLE_TRANSPARENT_COLOR)
+        self.version = 0 # Bumped whenever `surface` changes, so copies of it (render snapshots) know they're stale
+
+        self.blocks = [] # Every block this obstacle started with, kept so restore() can reuse them
         for row in range(len(grid)):
             for column in range(len(grid[0])):
                 if grid[row][column]== 1:
-                    pos_x = x + column * 3
-                    pos_y = y + row * 3
-                    block = Block(pos_x, pos_y)
-                    self.blocks_group.add(block)
\ No newline at end of file
+                    pos_x = x + column * BLOCK_SIZE
+                    pos_y = y + row * BLOCK_SIZE
+                    block = Block(pos_x, pos_y, obstacle=self)
+                    self.blocks.append(block)
+                    self.blocks_group.add(block)
+                    self.surface.fill(BLOCK_COLOR, block.rect.move(-self.rect.x, -self.rect.y))
+        self.intact_surface = self.surface.copy()
+
+    def clear_block(self, block):
+        # Only the dead block's 3x3 region of the cached surface changes
+        self.surface.fill(OBSTACLE_TRANSPARENT_COLOR, block.rect.move(-self.rect.x, -self.rect.y))
+        self.version += 1
+
+    def restore(self):
+        # Back to full strength for a new round, reusing the existing blocks instead of
+        # constructing a few hundred new sprites
+        self.blocks_group.empty()
+        for block in self.blocks:
+            block.health = BLOCK_HEALTH
+        self.blocks_group.add(self.blocks)
+        self.surface.blit(self.intact_surface, (0, 0))
+        self.version += 1
+
+    def destroy(self):
+        # Bomb hit: the whole obstacle goes at once
+        self.blocks_group.empty()
+        self.surface.fill(OBSTACLE_TRANSPARENT_COLOR)
+        self.version += 1
@@ -0,0 +1,75 @@
+from collections import namedtuple
+
+# Quality governor specific constants
+GOVERNOR_WINDOW_FRAMES = 15 # A quarter second at 60 FPS; reacts well before FrameLimiter's 2 second window
+DEGRADE_COST_RATIO = 0.9 # Shed a step when a window's frames average over 90% of the frame budget
+RESTORE_COST_RATIO = 0.5 # Only win it back once frames average under half the budget...
+RESTORE_WINDOWS = 8 # ...for this many windows in a row (two seconds), so it doesn't oscillate
+
+# What each step still spends on cosmetics. Nothing here touches the simulation: stars and
+# the HUD are drawn by main.py, explosions are sprites nothing collides with, and sounds are
+# fire-and-forget.
+QualityLevel = namedtuple("QualityLevel", (
+    "star_fraction", # share of the starfield drawn and scrolled
+    "explosion_scale", # explosion durations are multiplied by this; 0 skips them entirely
+    "alien_laser_sound_gap_ms", # minimum gap between alien laser sounds
+    "hud_every_frames", # HUD text is re-rendered at most this often (and only when it changed)
+))
+
+QUALITY_LEVELS = (
+    QualityLevel(1.0, 1.0, 0, 1),
+    QualityLevel(0.5, 1.0, 0, 1),
+    QualityLevel(0.5, 0.5, 0, 1),
+    QualityLevel(0.25, 0.5, 250, 1),
+    QualityLevel(0.25, 0.0, 250, 10),
+)
+FULL_QUALITY = QUALITY_LEVELS[0]
+
+class QualityGovernor:
+    # Watches what gameplay frames cost against their budget and moves one step along
+    # QUALITY_LEVELS at a time: down as soon as a window runs hot, back up only after
+    # a sustained run of cheap windows.
+    def __init__(self, levels=QUALITY_LEVELS, window=GOVERNOR_WINDOW_FRAMES):
+        self.levels = levels
+        self.window = window
+        self.step = 0
+        self.changes = 0
+        self._window_frames = 0
+        self._window_load = 0.0
+        self._cool_windows = 0
+
+    @property
+    def level(self):
+        return self.levels[self.step]
+
+    def record(self, frame_cost, frame_budget):
+        # Call once per gameplay frame with what the frame cost and what it was allowed
+        self._window_frames += 1
+        self._window_load += frame_cost / frame_budget
+        if self._window_frames >= self.window:
+            self._end_window(self._window_load / self._window_frames)
+            self._window_frames = 0
+            self._window_load = 0.0
+
+    def _end_window(self, load):
+        if load > DEGRADE_COST_RATIO:
+            self._cool_windows = 0
+            if self.step < len(self.levels) - 1:
+                self.step += 1
+                self.changes += 1
+        elif load < RESTORE_COST_RATIO:
+            self._cool_windows += 1
+            if self._cool_windows >= RESTORE_WINDOWS and self.step > 0:
+                self.step -= 1
+                self.changes += 1
+                self._cool_windows = 0
+        else:
+            self._cool_windows = 0 # In between: hold the current step
+
+    def reset(self):
+        # Windows shouldn't straddle idle screens
+        self._window_frames = 0
+        self._window_load = 0.0
+
+    def report(self):
+        return f"quality step {self.step}/{len(self.levels) - 1}, {self.changes} changes"
@@ -0,0 +1,96 @@
+import math
+import os
+import sys
+import pygame
+
+# Render pipeline specific constants
+SCALE_MODES = ("scaled", "blit", "native")
+SCALE_QUALITIES = {"nearest": "0", "linear": "1", "best": "2"} # Values for SDL_RENDER_SCALE_QUALITY
+LETTERBOX_COLOR = (0, 0, 0)
+# The browser already stretches the pygbag canvas, so it presents at native size there
+DEFAULT_SCALE_MODE = "native" if sys.platform == "emscripten" else "scaled"
+
+class RenderPipeline:
+    # The game always draws into `surface` at the fixed internal resolution; present()
+    # gets it onto a window of any size with the aspect ratio kept (letterboxed):
+    #   scaled - pygame.SCALED, the SDL renderer upscales on the GPU
+    #   blit   - one scale blit per frame straight into the window's letterbox area
+    #   native - window is the internal resolution, no scaling at all
+    def __init__(self, internal_size, window_size=None, mode=DEFAULT_SCALE_MODE, quality="nearest", vsync=False, caption=None):
+        if mode not in SCALE_MODES:
+            raise ValueError(f"Unknown scale mode '{mode}', expected one of {SCALE_MODES}")
+        if quality not in SCALE_QUALITIES:
+            raise ValueError(f"Unknown scale quality '{quality}', expected one of {tuple(SCALE_QUALITIES)}")
+        self.internal_size = internal_size
+        self.mode = mode
+        self.quality = quality
+        self.vsync = vsync
+        self._target = None # Letterbox area of the window, for blit mode
+
+        if caption:
+            pygame.display.set_caption(caption)
+
+        if mode == "scaled":
+            # Must be set before the renderer is created
+            os.environ["SDL_RENDER_SCALE_QUALITY"] = SCALE_QUALITIES[quality]
+            self.window = self._set_mode(internal_size, pygame.SCALED | pygame.RESIZABLE)
+            self.surface = self.window
+            if window_size:
+                self._resize_scaled_window(window_size)
+        elif mode == "blit":
+            self.window = self._set_mode(window_size or internal_size, pygame.RESIZABLE)
+            self.surface = pygame.Surface(internal_size).convert() # Display format keeps the scale blit cheap
+            self._layout()
+        else:
+            self.window = self._set_mode(internal_size, 0)
+            self.surface = self.window
+
+    def _set_mode(self, size, flags):
+        if self.vsync:
+            try:
+                return pygame.display.set_mode(size, flags, vsync=1)
+            except pygame.error as e:
+                # vsync needs a hardware renderer (SCALED or OPENGL); fall back rather than fail
+                print(f"Warning: Could not enable vsync. Error: {e}. Continuing without it.")
+                self.vsync = False
+        return pygame.display.set_mode(size, flags)
+
+    def _resize_scaled_window(self, window_size):
+        try:
+            from pygame._sdl2.video import Window
+            Window.from_display_module().size = window_size
+        except (ImportError, AttributeError, pygame.error) as e:
+            print(f"Warning: Could not resize the scaled window to {window_size}. Error: {e}. Using the default size.")
+
+    def _layout(self):
+        # Largest aspect-correct fit; nearest-neighbour sticks to whole multiples so pixels stay square
+        self.window = pygame.display.get_surface() # Resizing may have replaced it
+        window_width, window_height = self.window.get_size()
+        internal_width, internal_height = self.internal_size
+        scale = min(window_width / internal_width, window_height / internal_height)
+        if self.quality == "nearest" and scale >= 1:
+            scale = math.floor(scale)
+        size = (max(1, int(internal_width * scale)), max(1, int(internal_height * scale)))
+        self.dest_rect = pygame.Rect((0, 0), size)
+        self.dest_rect.center = (window_width // 2, window_height // 2)
+
+        self.window.fill(LETTERBOX_COLOR) # Bars are only painted here; present() never touches them
+        self._target = self.window.subsurface(self.dest_rect)
+
+    def handle_event(self, event):
+        # Returns True when the window needs presenting again, e.g. after a resize
+        if event.type in (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED):
+            if self.mode == "blit":
+                self._layout()
+            return True
+        return False
+
+    def present(self):
+        if self.mode == "blit":
+            if self.dest_rect.size == self.internal_size:
+                self._target.blit(self.surface, (0, 0))
+            elif self.quality == "nearest":
+                pygame.transform.scale(self.surface, self.dest_rect.size, self._target)
+            else:
+                pygame.transform.smoothscale(self.surface, self.dest_rect.size, self._target)
+        pygame.display.flip()
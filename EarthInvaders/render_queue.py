@@ -0,0 +1,53 @@
+class RenderQueue:
+    # Collects every (surface, rect) pair for a frame in layer order and submits them
+    # with a single Surface.blits() call instead of one Group.draw() per group.
+    def __init__(self):
+        self.items = []
+
+    def add(self, surface, rect):
+        self.items.append((surface, rect))
+
+    def add_group(self, group):
+        # Same pairs Group.draw() would blit, without its per-sprite dirty rect bookkeeping
+        self.items.extend((sprite.image, sprite.rect) for sprite in group)
+
+    def extend(self, items):
+        # (surface, rect or position) pairs built elsewhere, e.g. a sim_thread.RenderSnapshot's
+        self.items.extend(items)
+
+    def flush(self, target):
+        if self.items:
+            target.blits(self.items, doreturn=False)
+            self.items.clear()
+
+    def clear(self):
+        self.items.clear()
+
+    def __len__(self):
+        return len(self.items)
+
+
+def queue_game_scene(queue, game):
+    # Layer order matches what main.py used to draw group by group
+    spaceship = game.spaceship_group.sprite
+    if spaceship: # Ensure spaceship exists before drawing its lasers
+        queue.add_group(spaceship.lasers_group)
+
+        # Handle spaceship blinking for invincibility; when blink_on is False it's simply not drawn
+        if getattr(spaceship, 'blink_on', True):
+            queue.add(spaceship.image, spaceship.rect)
+
+        # Shield aura goes on top of the spaceship
+        if getattr(spaceship, 'shield_active', False):
+            shield_aura_surface = getattr(spaceship, 'shield_aura_surface', None)
+            if shield_aura_surface:
+                queue.add(shield_aura_surface, shield_aura_surface.get_rect(center=spaceship.rect.center))
+
+    for obstacle in game.obstacles:
+        if obstacle.blocks_group: # Cached surface, kept in sync with the blocks as they're destroyed
+            queue.add(obstacle.surface, obstacle.rect)
+    queue.add_group(game.aliens_group)
+    queue.add_group(game.alien_lasers_group)
+    queue.add_group(game.super_alien_group)
+    queue.add_group(game.bombs_group)
+    queue.add_group(game.explosions_group)
@@ -0,0 +1,137 @@
+# Sampling profiler for live sessions. F10 in main.py starts and stops it; while it runs, a
+# background thread looks at the game loop's stack every few milliseconds and counts each
+# distinct stack. Stopping writes them in collapsed-stack format ("a;b;c count" per line),
+# which flamegraph.pl, speedscope and inferno read directly. Frames are labelled with
+# their qualified names, so Game methods and each sprite class's update() show up as
+# "game.py:Game.check_collisions", "laser.py:AlienLaser.update" and so on.
+#
+# Nothing is installed until it is started, so leaving it in costs nothing.
+# Builds without threads (pygbag) fall back to cProfile, which only knows caller/callee
+# pairs: those profiles are two frames deep and weighted in microseconds, not samples.
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from background import THREADS_AVAILABLE
+
+# Profiler specific constants
+PROFILE_DIR = "profiles"
+SAMPLE_INTERVAL_S = 0.002
+# The sampler can only look once the loop hands over the GIL, which by default happens every
+# 5 ms or when it blocks; without a shorter switch interval samples pile up on blocking calls
+# (the frame limiter's sleep, present()) and pure-Python work like Game.update is undercounted.
+PROFILING_SWITCH_INTERVAL_S = 0.0005
+
+def _is_method(code):
+    # Whether the frame's class can be read from its `self` argument (needed before 3.11)
+    return code.co_argcount > 0 and code.co_varnames[0] == "self"
+
+def _frame_label(code, owner=None):
+    # "module.py:Class.method". co_qualname is 3.11+; before that the class comes from the
+    # frame's `self` (owner), so Laser.update and AlienLaser.update stay apart
+    if owner is not None:
+        qualname = f"{owner.__name__}.{code.co_name}"
+    else:
+        qualname = getattr(code, "co_qualname", code.co_name)
+    return f"{os.path.basename(code.co_filename)}:{qualname}"
+
+class SamplingProfiler:
+    def __init__(self, interval=SAMPLE_INTERVAL_S, thread_id=None, sampling=None):
+        self.interval = interval
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id # The game loop's thread
+        self.sampling = (THREADS_AVAILABLE and hasattr(sys, "_current_frames")) if sampling is None else sampling
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = None
+        self.stopped_at = None
+        self._labels = {} # code object (and class, before 3.11) -> label, so each sample is a dict lookup per frame
+        self._qualnames = hasattr(sys._getframe().f_code, "co_qualname")
+        self._stop = threading.Event()
+        self._thread = None
+        self._cprofile = None
+        self._switch_interval = None
+
+    @property
+    def running(self):
+        return self.started_at is not None and self.stopped_at is None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        if self.sampling:
+            self._switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(PROFILING_SWITCH_INTERVAL_S)
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        else:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop(self):
+        if self._thread:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            sys.setswitchinterval(self._switch_interval)
+        if self._cprofile:
+            self._cprofile.disable()
+            self._collapse_cprofile()
+            self._cprofile = None
+        self.stopped_at = time.perf_counter()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        labels = self._labels
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            key = code
+            owner = None
+            if not self._qualnames and _is_method(code):
+                owner = type(frame.f_locals.get("self"))
+                key = (code, owner)
+            label = labels.get(key)
+            if label is None:
+                label = labels[key] = _frame_label(code, owner)
+            stack.append(label)
+            frame = frame.f_back
+        stack.reverse() # Outermost first, as the collapsed format expects
+        self.stacks[";".join(stack)] += 1
+        self.samples += 1
+
+    def _collapse_cprofile(self):
+        stats = pstats.Stats(self._cprofile).stats
+        for (filename, _, name), (_, _, total_time, _, callers) in stats.items():
+            label = f"{os.path.basename(filename)}:{name}"
+            for (caller_file, _, caller_name), caller_stats in callers.items():
+                caller_total_time = caller_stats[2]
+                microseconds = int(caller_total_time * 1_000_000)
+                if microseconds:
+                    self.stacks[f"{os.path.basename(caller_file)}:{caller_name};{label}"] += microseconds
+            if not callers and total_time:
+                self.stacks[label] += int(total_time * 1_000_000)
+        self.samples = sum(self.stacks.values())
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def write(self, directory=PROFILE_DIR):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, time.strftime("profile-%Y%m%d-%H%M%S.folded"))
+        with open(path, "w") as profile_file:
+            profile_file.write(self.collapsed())
+        return path
+
+    def report(self):
+        elapsed = (self.stopped_at or time.perf_counter()) - (self.started_at or time.perf_counter())
+        unit = "samples" if self.sampling else "us (cProfile)"
+        return f"{self.samples} {unit} over {elapsed:.1f}s, {len(self.stacks)} distinct stacks"
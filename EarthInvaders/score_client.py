@@ -0,0 +1,293 @@
+# Reports final scores and session summaries to the central leaderboard (score_server.py
+# is a local stand-in with the same API). submit() only appends to a deque, so the
+# game-over screen never waits on the disk or the network. A worker thread then:
+#   - appends each submission to a journal file (fsynced) before trying to send it, so
+#     scores survive a crash, a power cut or the leaderboard being down; a restarted
+#     kiosk picks up whatever the journal still holds
+#   - sends them in batches as POST /scores over a small pool of keep-alive connections
+#   - backs off exponentially (with jitter, honouring Retry-After) while sends fail
+#   - journals an ack once the server has taken a batch
+# Every submission carries a unique id and the server ignores ids it has already seen,
+# so a batch retried after a lost reply is never counted twice.
+#
+# Protocol (JSON over HTTP/1.1):
+#   POST /scores  {"submissions": [{"id": ..., "kiosk": ..., "score": ..., ...}, ...]}
+#             ->  {"accepted": [ids], "duplicates": [ids]}
+
+import collections
+import http.client
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+import uuid
+from background import THREADS_AVAILABLE
+
+# Score client specific constants
+SCORE_JOURNAL_FILE = "score_journal.jsonl"
+BATCH_SIZE = 50
+POOL_SIZE = 2 # Idle keep-alive connections kept per leaderboard host
+REQUEST_TIMEOUT_S = 5.0
+SEND_INTERVAL_S = 1.0 # How often the worker looks for new submissions when nobody wakes it
+BACKOFF_BASE_S = 0.5
+BACKOFF_MAX_S = 60.0
+COMPACT_AFTER_ACKS = 500 # Acked entries in the journal before it is rewritten without them
+# Server errors and throttling are retried; any other 4xx means the batch itself is bad
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+class SendError(Exception):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class ConnectionPool:
+    # Keep-alive HTTP connections to one host, shared by any number of threads. A
+    # connection that was idle may have been closed by the server in the meantime, so a
+    # request on a reused one that fails before getting a reply is retried once on a new one.
+    def __init__(self, url, size=POOL_SIZE, timeout=REQUEST_TIMEOUT_S):
+        parts = urllib.parse.urlsplit(url)
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.size = size
+        self.timeout = timeout
+        self.opened = 0
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        self.opened += 1
+        return self._connection_class(self.host, self.port, timeout=self.timeout), False
+
+    def _release(self, connection):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def request(self, method, path, body=None, headers=None):
+        # (status, headers, body bytes); raises OSError or http.client.HTTPException
+        headers = dict(headers or {})
+        while True:
+            connection, reused = self._acquire()
+            try:
+                connection.request(method, self.base_path + path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (ConnectionError, http.client.RemoteDisconnected, http.client.BadStatusLine):
+                connection.close()
+                if reused:
+                    continue # Stale keep-alive connection; try a fresh one
+                raise
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            return response.status, response.headers, data
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+class ScoreClient:
+    def __init__(self, url, journal_path=SCORE_JOURNAL_FILE, batch_size=BATCH_SIZE, threaded=None,
+                 clock=time.monotonic, pool=None):
+        self.url = url
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.clock = clock
+        self.pool = pool or ConnectionPool(url)
+        self.sent = 0
+        self.duplicates = 0 # Already on the server, e.g. a retry after a lost reply
+        self.rejected = 0
+        self.failures = 0
+        self.batches = 0
+        self._incoming = collections.deque() # Filled by the game loop, drained by the worker
+        self._pending = {} # id -> submission: journaled, not yet acked; insertion order is send order
+        self._journal_acks = 0
+        self._consecutive_failures = 0
+        self._retry_at = 0.0
+        self._load_journal()
+
+        self.threaded = THREADS_AVAILABLE if threaded is None else threaded
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+        if self.threaded:
+            self._thread = threading.Thread(target=self._run, name="score-client", daemon=True)
+            self._thread.start()
+
+    def submit(self, score, kiosk, **summary):
+        # Queues a final score plus any session summary fields (level, duration...)
+        submission = {"id": uuid.uuid4().hex, "kiosk": kiosk, "score": int(score), "t": round(time.time(), 3)}
+        submission.update(summary)
+        self._incoming.append(submission)
+        self._wakeup.set()
+        return submission["id"]
+
+    @property
+    def backlog(self):
+        # Submissions not yet acknowledged by the server (approximate while the worker runs)
+        return len(self._incoming) + len(self._pending)
+
+    def pump(self):
+        # Without a thread, call this from an idle screen; it may block for up to a request timeout
+        if not self.threaded:
+            self._cycle()
+
+    def _load_journal(self):
+        acked = set()
+        entries = []
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue # Torn last line from a crash mid-append; its submission was never journaled
+                    if "add" in record:
+                        entries.append(record["add"])
+                    else:
+                        acked.update(record.get("ack", ()))
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Warning: Could not read score journal '{self.journal_path}'. Error: {e}. Unsent scores from earlier sessions are skipped.")
+            return
+        for entry in entries:
+            if entry["id"] not in acked:
+                self._pending[entry["id"]] = entry
+        self._journal_acks = len(acked)
+        if acked:
+            try:
+                self._compact_journal()
+            except OSError as e:
+                print(f"Warning: Could not compact score journal '{self.journal_path}'. Error: {e}. It will be compacted later.")
+
+    def _append_journal(self, records, sync):
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            journal.write("".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records))
+            if sync:
+                journal.flush()
+                os.fsync(journal.fileno())
+
+    def _compact_journal(self):
+        # Rewrites the journal with only the unacked submissions
+        temporary_path = self.journal_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as journal:
+            for submission in self._pending.values():
+                journal.write(json.dumps({"add": submission}, separators=(",", ":")) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(temporary_path, self.journal_path)
+        self._journal_acks = 0
+
+    def _journal_incoming(self):
+        new = []
+        while self._incoming:
+            new.append(self._incoming.popleft())
+        if not new:
+            return
+        try:
+            self._append_journal([{"add": submission} for submission in new], sync=True)
+        except OSError as e:
+            # Still sent this session, just not protected against a crash before then
+            print(f"Warning: Could not write score journal '{self.journal_path}'. Error: {e}. {len(new)} scores are only kept in memory.")
+        for submission in new:
+            self._pending[submission["id"]] = submission
+
+    def _acknowledge(self, ids):
+        for submission_id in ids:
+            self._pending.pop(submission_id, None)
+        try:
+            # Not fsynced: losing an ack only means the server sees a duplicate it will ignore
+            self._append_journal([{"ack": list(ids)}], sync=False)
+            self._journal_acks += len(ids)
+            if self._journal_acks >= COMPACT_AFTER_ACKS:
+                self._compact_journal()
+        except OSError as e:
+            print(f"Warning: Could not record sent scores in '{self.journal_path}'. Error: {e}. They may be sent again.")
+
+    def _send(self, batch):
+        body = json.dumps({"submissions": batch}, separators=(",", ":")).encode("utf-8")
+        try:
+            status, headers, data = self.pool.request("POST", "/scores", body, {"Content-Type": "application/json"})
+        except (OSError, http.client.HTTPException) as e:
+            raise SendError(str(e) or type(e).__name__)
+        if status in RETRY_STATUSES:
+            retry_after = headers.get("Retry-After")
+            raise SendError(f"HTTP {status}", float(retry_after) if retry_after and retry_after.isdigit() else None)
+        if status >= 400:
+            return None
+        try:
+            reply = json.loads(data)
+            return len(reply.get("accepted", ())), len(reply.get("duplicates", ()))
+        except (ValueError, AttributeError) as e:
+            raise SendError(f"unreadable reply: {e}")
+
+    def _send_pending(self):
+        while self._pending and self.clock() >= self._retry_at:
+            batch = list(self._pending.values())[:self.batch_size]
+            try:
+                result = self._send(batch)
+            except SendError as e:
+                self.failures += 1
+                self._consecutive_failures += 1
+                delay = min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2 ** (self._consecutive_failures - 1))
+                delay *= random.uniform(0.5, 1.0) # Jitter, so kiosks that lost the server together don't retry together
+                if e.retry_after is not None:
+                    delay = max(delay, e.retry_after)
+                self._retry_at = self.clock() + delay
+                if self._consecutive_failures == 1:
+                    print(f"Warning: Could not send scores to {self.url}. Error: {e}. Retrying with backoff; scores are kept in '{self.journal_path}'.")
+                return
+            self._consecutive_failures = 0
+            self.batches += 1
+            if result is None:
+                self.rejected += len(batch)
+                print(f"Warning: Leaderboard {self.url} rejected a batch of {len(batch)} scores. They are dropped.")
+            else:
+                accepted, duplicates = result
+                self.sent += accepted
+                self.duplicates += duplicates
+            self._acknowledge([submission["id"] for submission in batch])
+
+    def _cycle(self):
+        self._journal_incoming()
+        self._send_pending()
+
+    def _run(self):
+        while not self._stopping:
+            wait_s = SEND_INTERVAL_S
+            if self._pending:
+                wait_s = min(wait_s, max(0.0, self._retry_at - self.clock()))
+            self._wakeup.wait(wait_s)
+            self._wakeup.clear()
+            if not self._stopping:
+                self._cycle()
+
+    def close(self):
+        # Journals anything still queued; unsent scores go out from the journal next launch
+        if self._thread:
+            self._stopping = True
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+        self._journal_incoming()
+        self.pool.close()
+
+    def report(self):
+        return (f"{self.sent} sent in {self.batches} batches, {self.duplicates} duplicates ignored, "
+                f"{self.rejected} rejected, {self.failures} failed sends, {self.backlog} waiting")
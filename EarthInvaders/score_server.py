@@ -0,0 +1,246 @@
+# Local stand-in for the central leaderboard that score_client.ScoreClient reports to, so
+# the whole submission path can be tested and load-tested offline. It keeps everything in
+# memory, ignores submission ids it has already seen, and can be told to fail some
+# requests (before recording them) or to lose some replies (after recording them, which
+# is what makes clients retry batches the server already has).
+#
+#   python score_server.py serve --port 8770
+#   python score_server.py load --kiosks 50 --scores 200 --fail-rate 0.1 --lost-reply-rate 0.1
+#
+# API (JSON over HTTP/1.1, keep-alive):
+#   POST /scores             {"submissions": [...]} -> {"accepted": [ids], "duplicates": [ids]}
+#   GET  /leaderboard?top=N  -> {"scores": [{"kiosk": ..., "score": ..., ...}, ...]}   best first
+#   GET  /stats              -> request, submission and connection counts
+
+import argparse
+import heapq
+import http.server
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+# Score server specific constants
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8770
+MAX_BODY_BYTES = 1024 * 1024
+DEFAULT_TOP = 10
+
+class Leaderboard:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen = set()
+        self.submissions = []
+        self.requests = 0
+        self.connections = 0
+        self.duplicates = 0
+
+    def record(self, batch):
+        accepted, duplicates = [], []
+        with self._lock:
+            for submission in batch:
+                submission_id = submission["id"]
+                if submission_id in self._seen:
+                    duplicates.append(submission_id)
+                    continue
+                self._seen.add(submission_id)
+                self.submissions.append(submission)
+                accepted.append(submission_id)
+            self.duplicates += len(duplicates)
+        return accepted, duplicates
+
+    def top(self, count):
+        with self._lock:
+            return heapq.nlargest(count, self.submissions, key=lambda submission: submission["score"])
+
+    def stats(self):
+        with self._lock:
+            return {"requests": self.requests, "connections": self.connections,
+                    "submissions": len(self.submissions), "duplicates": self.duplicates}
+
+class _ScoreHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, like the real leaderboard
+
+    def setup(self):
+        super().setup()
+        with self.server.leaderboard._lock:
+            self.server.leaderboard.connections += 1
+
+    def _reply(self, status, payload, headers=()):
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+        leaderboard = self.server.leaderboard
+        if parts.path == "/leaderboard":
+            query = urllib.parse.parse_qs(parts.query)
+            try:
+                count = int(query.get("top", [DEFAULT_TOP])[0])
+            except ValueError:
+                self._reply(400, {"error": "top must be a number"})
+                return
+            self._reply(200, {"scores": leaderboard.top(count)})
+        elif parts.path == "/stats":
+            self._reply(200, leaderboard.stats())
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/scores":
+            self._reply(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True # The unread body would otherwise be taken as the next request
+            self._reply(413, {"error": "batch too large"})
+            return
+        body = self.rfile.read(length)
+        leaderboard = self.server.leaderboard
+        with leaderboard._lock:
+            leaderboard.requests += 1
+        if self.server.latency_s:
+            time.sleep(self.server.latency_s)
+        if random.random() < self.server.fail_rate:
+            self._reply(503, {"error": "injected failure"})
+            return
+        try:
+            batch = json.loads(body)["submissions"]
+            if not all(isinstance(submission.get("id"), str) and isinstance(submission.get("score"), int)
+                       for submission in batch):
+                raise ValueError("every submission needs a string id and an integer score")
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._reply(400, {"error": f"bad batch: {e}"})
+            return
+        accepted, duplicates = leaderboard.record(batch)
+        if random.random() < self.server.lost_reply_rate:
+            self._reply(503, {"error": "injected lost reply"}) # Recorded, but the client can't know that
+            return
+        self._reply(200, {"accepted": accepted, "duplicates": duplicates})
+
+    def log_message(self, format, *args):
+        pass
+
+class _ThreadingServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128 # Every kiosk of a load test may connect at once
+
+class ScoreServer:
+    # Serves a Leaderboard from a daemon thread, one thread per connection
+    def __init__(self, host=DEFAULT_HOST, port=0, fail_rate=0.0, lost_reply_rate=0.0, latency_s=0.0):
+        self.leaderboard = Leaderboard()
+        self._httpd = _ThreadingServer((host, port), _ScoreHandler)
+        self._httpd.leaderboard = self.leaderboard
+        self.fail_rate = fail_rate
+        self.lost_reply_rate = lost_reply_rate
+        self._httpd.latency_s = latency_s
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="score-server", daemon=True)
+        self._thread.start()
+
+    # Failure injection can be changed while the server runs
+    @property
+    def fail_rate(self):
+        return self._httpd.fail_rate
+
+    @fail_rate.setter
+    def fail_rate(self, rate):
+        self._httpd.fail_rate = rate
+
+    @property
+    def lost_reply_rate(self):
+        return self._httpd.lost_reply_rate
+
+    @lost_reply_rate.setter
+    def lost_reply_rate(self, rate):
+        self._httpd.lost_reply_rate = rate
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+def load_test(kiosks, scores, fail_rate=0.0, lost_reply_rate=0.0, latency_s=0.0, timeout_s=120.0, out=None):
+    # Many kiosks, each with its own ScoreClient and journal, submitting against one server.
+    # Checks that every score arrives exactly once; returns the server's stats.
+    from score_client import ScoreClient
+    out = out or sys.stdout
+    server = ScoreServer(fail_rate=fail_rate, lost_reply_rate=lost_reply_rate, latency_s=latency_s)
+    journal_dir = tempfile.mkdtemp(prefix="score-journals-")
+    clients = [ScoreClient(server.url, journal_path=os.path.join(journal_dir, f"kiosk-{i}.jsonl"), threaded=True)
+               for i in range(kiosks)]
+    started = time.perf_counter()
+    submit_times = []
+    try:
+        for round_index in range(scores):
+            for i, client in enumerate(clients):
+                submit_started = time.perf_counter()
+                client.submit(random.randint(0, 50000), f"kiosk-{i}", level=round_index % 10 + 1)
+                submit_times.append(time.perf_counter() - submit_started)
+        deadline = time.perf_counter() + timeout_s
+        while any(client.backlog for client in clients) and time.perf_counter() < deadline:
+            for client in clients:
+                client._wakeup.set() # Skip the idle interval; backoff still applies
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - started
+        submit_times.sort()
+    finally:
+        for client in clients:
+            client.close()
+        server.close()
+        shutil.rmtree(journal_dir, ignore_errors=True)
+
+    stats = server.leaderboard.stats()
+    expected = kiosks * scores
+    unsent = sum(client.backlog for client in clients)
+    print(f"{kiosks} kiosks x {scores} scores in {elapsed:.2f}s ({stats['submissions'] / elapsed:.0f} scores/s): "
+          f"{stats['submissions']}/{expected} recorded, {stats['duplicates']} retried duplicates ignored, "
+          f"{unsent} unsent | {stats['requests']} requests over {stats['connections']} connections | "
+          f"submit() p50 {submit_times[len(submit_times) // 2] * 1e6:.1f} us, "
+          f"p99 {submit_times[int(len(submit_times) * 0.99)] * 1e6:.1f} us", file=out)
+    if stats["submissions"] != expected - unsent:
+        print("Warning: Recorded scores don't match what the kiosks sent.", file=out)
+    stats["unsent"] = unsent
+    return stats
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stand-in Earth Invaders leaderboard")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Accept scores until interrupted")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    load = commands.add_parser("load", help="Submit scores from simulated kiosks to an in-process server")
+    load.add_argument("--kiosks", type=int, default=20)
+    load.add_argument("--scores", type=int, default=100, help="Scores submitted by each kiosk")
+    load.add_argument("--latency-ms", type=float, default=0.0, help="Added to every POST /scores")
+    for command in (serve, load):
+        command.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of batches refused with 503")
+        command.add_argument("--lost-reply-rate", type=float, default=0.0,
+                             help="Fraction of batches recorded but answered with 503")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "serve":
+        server = ScoreServer(args.host, args.port, args.fail_rate, args.lost_reply_rate)
+        print(f"Accepting scores at {server.url}/scores")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.close()
+    else:
+        load_test(args.kiosks, args.scores, args.fail_rate, args.lost_reply_rate, args.latency_ms / 1000)
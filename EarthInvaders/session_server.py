@@ -0,0 +1,457 @@
+# Authoritative session server: hosts many independent headless Game instances in one
+# process on asyncio. Each TCP connection is one session. The client streams the keys it
+# is holding; the server ticks that session's Game at a fixed rate with the latest input
+# and streams state back. Scores come from the server's own simulation, so they can be
+# trusted for validation, and spectators can follow the state stream. Each session's Game
+# runs on its own tick-driven clock and seeded random generator, so a session can be
+# replayed from its seed and inputs (e.g. with state_digest).
+#
+#   python session_server.py serve --port 8765
+#   python session_server.py simulate --players 100 --seconds 30            (against a running server)
+#   python session_server.py simulate --players 100 --seconds 30 --spawn-server
+#
+# Protocol: newline-delimited JSON, one object per line.
+#   server -> client  {"type": "welcome", "session": id, "tick_hz": 30, "seed": n}
+#   client -> server  {"type": "input", "seq": n, "held": ["left", "fire"]}   latest one wins
+#   server -> client  {"type": "state", "tick": t, "ack": seq, "score": ..., "lives": ..., ...}
+#   client -> server  {"type": "restart"}   after a state with "game_over": true
+#   client -> server  {"type": "bye"}
+#   server -> client  {"type": "error", "reason": "..."} just before closing the session
+#
+# Run from the EarthInvaders directory (assets are loaded by relative path).
+
+import argparse
+import asyncio
+import collections
+import json
+import os
+import random
+import sys
+import time
+import pygame
+from game import Game
+from input_provider import HeldKeys, NO_KEYS
+from state_digest import FrameClock
+
+# Session server specific constants
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+TICK_HZ = 30
+TICK_BUDGET_MS = 4.0 # A session's Game.update() may take this long per tick...
+MAX_BUDGET_OVERRUNS = 150 # ...and is closed after going over it this many ticks in a row
+MAX_TICK_LAG = 5 # Ticks a session may fall behind schedule before the backlog is skipped
+MAX_SESSIONS = 500
+OVERLOAD_LATENESS_TICKS = 1.0 # New sessions are turned away while ticks run this many periods late on average
+MAX_LINE_BYTES = 4096
+WRITE_HIGH_WATER = 64 * 1024 # States are dropped while a client has this much unsent
+STALLED_CLIENT_S = 10.0 # Sessions whose client hasn't read anything for this long are closed
+REPORT_EVERY_S = 5.0
+SCREEN_WIDTH = 750
+SCREEN_HEIGHT = 700
+INPUT_KEYS = {"left": pygame.K_LEFT, "right": pygame.K_RIGHT, "fire": pygame.K_SPACE, "shield": pygame.K_UP}
+
+def init_headless_pygame():
+    # Game needs a display surface for convert_alpha() and a mixer for its sounds,
+    # but a server has neither a screen nor speakers
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        print(f"Warning: Could not initialize mixer. Error: {e}. Sessions will load without sounds.")
+
+class RemoteInput:
+    # Input provider (see input_provider.py) fed by a client's input messages
+    def __init__(self):
+        self._held = NO_KEYS
+
+    def set_held(self, names):
+        self._held = HeldKeys(INPUT_KEYS[name] for name in names if name in INPUT_KEYS)
+
+    def begin_frame(self, events):
+        return []
+
+    def pressed(self):
+        return self._held
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+class TickStats:
+    # Aggregate tick latency across all sessions. Lateness is how long after its
+    # scheduled time a tick started; cost is how long Game.update() took.
+    def __init__(self, window=20000):
+        self.lateness = collections.deque(maxlen=window)
+        self.cost = collections.deque(maxlen=window)
+        self.ticks = 0
+        self.skipped_ticks = 0
+        self.budget_overruns = 0
+        self.dropped_states = 0
+        self.coalesced_inputs = 0
+        self.sessions_closed = collections.Counter()
+        self.recent_lateness = 0.0 # Moving average, for admission control
+        self._window_started = time.perf_counter()
+
+    def record(self, lateness, cost):
+        self.lateness.append(lateness)
+        self.cost.append(cost)
+        self.ticks += 1
+        self.recent_lateness += (lateness - self.recent_lateness) * 0.01
+
+    def report(self, sessions):
+        # Latency and tick rate since the previous report; the other counts are running totals
+        now = time.perf_counter()
+        elapsed_s = now - self._window_started
+        self._window_started = now
+        lateness = sorted(self.lateness)
+        cost = sorted(self.cost)
+        closed = ", ".join(f"{reason} {count}" for reason, count in sorted(self.sessions_closed.items())) or "none"
+        text = (f"{sessions} sessions, {self.ticks / elapsed_s if elapsed_s else 0:.0f} ticks/s | "
+                f"tick latency p50 {_percentile(lateness, 0.5) * 1000:.2f} p99 {_percentile(lateness, 0.99) * 1000:.2f} "
+                f"max {(lateness[-1] if lateness else 0) * 1000:.2f} ms | "
+                f"update p50 {_percentile(cost, 0.5) * 1000:.2f} p99 {_percentile(cost, 0.99) * 1000:.2f} ms | "
+                f"skipped {self.skipped_ticks}, over budget {self.budget_overruns}, "
+                f"dropped states {self.dropped_states}, coalesced inputs {self.coalesced_inputs}, closed: {closed}")
+        self.lateness.clear()
+        self.cost.clear()
+        self.ticks = 0
+        return text
+
+class Session:
+    def __init__(self, server, session_id, reader, writer, seed):
+        self.server = server
+        self.id = session_id
+        self.reader = reader
+        self.writer = writer
+        self.seed = seed
+        self.input = RemoteInput()
+        # Game time advances one tick per update, not with the server's wall clock
+        self.clock = FrameClock(1000 / server.tick_hz)
+        self.game = Game(SCREEN_WIDTH, SCREEN_HEIGHT, input_provider=self.input, clock=self.clock,
+                         rng=random.Random(seed))
+        self.tick = 0
+        self.ack = 0 # Last input seq applied
+        self.closed = False
+        self._fresh_input = False
+        self._overruns = 0
+        self._blocked_since = None
+
+    async def run(self):
+        self._send({"type": "welcome", "session": self.id, "tick_hz": self.server.tick_hz, "seed": self.seed})
+        reader_task = asyncio.create_task(self._read_inputs())
+        try:
+            await self._tick_loop()
+        finally:
+            reader_task.cancel()
+            self.writer.close()
+
+    def close(self, reason, message=None):
+        if not self.closed:
+            self.closed = True
+            self.server.stats.sessions_closed[reason] += 1
+            if message:
+                self._send({"type": "error", "reason": message}, force=True)
+
+    async def _read_inputs(self):
+        try:
+            while not self.closed:
+                line = await self.reader.readline()
+                if not line:
+                    self.close("disconnected")
+                    return
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    self.close("bad message", "malformed JSON")
+                    return
+                if not isinstance(message, dict):
+                    self.close("bad message", "messages must be JSON objects")
+                    return
+                kind = message.get("type")
+                if kind == "input":
+                    held = message.get("held", [])
+                    seq = message.get("seq", self.ack)
+                    if not isinstance(held, list) or not all(isinstance(name, str) for name in held) \
+                            or not isinstance(seq, int):
+                        self.close("bad message", "input needs a list of key names and an integer seq")
+                        return
+                    if self._fresh_input:
+                        self.server.stats.coalesced_inputs += 1 # Arrived faster than ticks; only the latest counts
+                    self.input.set_held(held)
+                    self.ack = seq
+                    self._fresh_input = True
+                elif kind == "restart" and self.game.game_over:
+                    self.game.reset_game(new_round_started=False)
+                elif kind == "bye":
+                    self.close("bye")
+                    return
+        except (asyncio.LimitOverrunError, ValueError):
+            self.close("bad message", f"lines are limited to {MAX_LINE_BYTES} bytes")
+        except ConnectionError:
+            self.close("disconnected")
+
+    async def _tick_loop(self):
+        loop = asyncio.get_running_loop()
+        period = 1.0 / self.server.tick_hz
+        budget = self.server.tick_budget_ms / 1000
+        next_tick = loop.time() + period
+        while not self.closed:
+            delay = next_tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.closed:
+                break
+            started = loop.time()
+            lateness = started - next_tick
+            if lateness > period * MAX_TICK_LAG:
+                # Too far behind to catch up; drop the backlog rather than burst-ticking
+                skipped = int(lateness / period)
+                self.server.stats.skipped_ticks += skipped
+                next_tick += skipped * period
+
+            if not self.game.game_over:
+                self.game.update()
+                self.clock.frame += 1
+                self.tick += 1
+            cost = loop.time() - started
+            self.server.stats.record(max(lateness, 0.0), cost)
+            self._fresh_input = False
+
+            if cost > budget:
+                self.server.stats.budget_overruns += 1
+                self._overruns += 1
+                if self._overruns >= MAX_BUDGET_OVERRUNS:
+                    self.close("over budget", "tick budget exceeded")
+                    break
+            else:
+                self._overruns = 0
+
+            self._send(self.state())
+            if self._blocked_since is not None and started - self._blocked_since > STALLED_CLIENT_S:
+                self.close("stalled", "client stopped reading")
+                break
+            next_tick += period
+            if delay <= 0:
+                await asyncio.sleep(0) # Running behind; still let other sessions and I/O in
+
+    def state(self):
+        game = self.game
+        return {
+            "type": "state",
+            "tick": self.tick,
+            "ack": self.ack,
+            "score": game.score,
+            "lives": game.lives,
+            "level": game.current_level_number,
+            "aliens": len(game.aliens_group),
+            "game_over": game.game_over,
+        }
+
+    def _send(self, message, force=False):
+        # Never waits for the client: while its socket buffer is over the high-water mark,
+        # states are dropped (each one supersedes the last anyway) and the stall is timed
+        transport = self.writer.transport
+        if transport.is_closing():
+            return
+        if not force and transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+            self.server.stats.dropped_states += 1
+            if self._blocked_since is None:
+                self._blocked_since = asyncio.get_running_loop().time()
+            return
+        self._blocked_since = None
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+class SessionServer:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, tick_hz=TICK_HZ, tick_budget_ms=TICK_BUDGET_MS,
+                 max_sessions=MAX_SESSIONS, report_every=REPORT_EVERY_S, seed=None, out=None):
+        self.host = host
+        self.port = port
+        self.tick_hz = tick_hz
+        self.tick_budget_ms = tick_budget_ms
+        self.max_sessions = max_sessions
+        self._seeds = random.Random(seed) # Session seeds; a fixed server seed makes them reproducible too
+        self.report_every = report_every
+        self.out = out or sys.stdout
+        self.stats = TickStats()
+        self.sessions = {}
+        self._session_tasks = set()
+        self._next_id = 1
+        self._server = None
+        self._report_task = None
+
+    async def start(self):
+        Game(SCREEN_WIDTH, SCREEN_HEIGHT) # Warms the image and sound caches so the first session doesn't stall the rest
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port, limit=MAX_LINE_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1] # In case port 0 picked one
+        if self.report_every:
+            self._report_task = asyncio.create_task(self._report_loop())
+
+    async def close(self):
+        if self._report_task:
+            self._report_task.cancel()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for session in list(self.sessions.values()):
+            session.close("server shutdown", "server shutting down")
+        # Each session notices within a tick and closes its connection
+        await asyncio.gather(*self._session_tasks, return_exceptions=True)
+
+    async def _handle_client(self, reader, writer):
+        # Backpressure on admissions: a full or already-lagging server turns new players away
+        # rather than making every existing session late
+        if len(self.sessions) >= self.max_sessions:
+            reason = "server full"
+        elif self.stats.recent_lateness > OVERLOAD_LATENESS_TICKS / self.tick_hz:
+            reason = "server busy"
+        else:
+            reason = None
+        if reason:
+            writer.write(json.dumps({"type": "error", "reason": reason}).encode() + b"\n")
+            writer.close()
+            self.stats.sessions_closed["rejected"] += 1
+            return
+        session_id = self._next_id
+        self._next_id += 1
+        session = Session(self, session_id, reader, writer, self._seeds.getrandbits(32))
+        self.sessions[session_id] = session
+        task = asyncio.current_task()
+        self._session_tasks.add(task)
+        try:
+            await session.run()
+        finally:
+            del self.sessions[session_id]
+            self._session_tasks.discard(task)
+
+    async def _report_loop(self):
+        while True:
+            await asyncio.sleep(self.report_every)
+            print(f"Sessions: {self.stats.report(len(self.sessions))}", file=self.out)
+
+# Simulated players for load testing
+
+async def simulated_player(host, port, seconds, results, slow_reader=False):
+    # Holds random key combinations for a random few ticks each, restarts after game over.
+    # A slow reader stops reading for long stretches, to exercise the server's backpressure.
+    try:
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+    except OSError:
+        results["connect_failed"] += 1
+        return
+    welcome = json.loads(await reader.readline())
+    if welcome.get("type") != "welcome":
+        results["rejected"] += 1
+        writer.close()
+        return
+    period = 1.0 / welcome["tick_hz"]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + seconds
+    seq = 0
+    held = []
+
+    async def send_inputs():
+        nonlocal seq, held
+        while loop.time() < deadline:
+            if random.random() < 0.1:
+                held = random.sample(list(INPUT_KEYS), random.randint(0, 2))
+            seq += 1
+            writer.write(json.dumps({"type": "input", "seq": seq, "held": held}).encode() + b"\n")
+            await asyncio.sleep(period)
+
+    sender = asyncio.create_task(send_inputs())
+    try:
+        while loop.time() < deadline:
+            if slow_reader:
+                await asyncio.sleep(1.0)
+            try:
+                line = await asyncio.wait_for(reader.readline(), timeout=max(0.01, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                results["disconnected"] += 1
+                break
+            message = json.loads(line)
+            if message["type"] == "state":
+                results["states"] += 1
+                if message["game_over"]:
+                    results["games_over"] += 1
+                    results["final_scores"].append(message["score"])
+                    writer.write(b'{"type":"restart"}\n')
+            elif message["type"] == "error":
+                results["errors"] += 1
+                break
+    finally:
+        sender.cancel()
+        if not writer.is_closing():
+            writer.write(b'{"type":"bye"}\n')
+            writer.close()
+
+async def simulate(players, seconds, host=DEFAULT_HOST, port=DEFAULT_PORT, slow_readers=0, spawn_server=False,
+                   tick_hz=TICK_HZ, out=None):
+    out = out or sys.stdout
+    server = None
+    if spawn_server:
+        server = SessionServer(host, port, tick_hz=tick_hz, out=out)
+        await server.start()
+        port = server.port
+    results = collections.Counter()
+    results["final_scores"] = []
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(simulated_player(host, port, seconds, results, slow_reader=i < slow_readers))
+             for i in range(players)]
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    if server:
+        print(f"Sessions: {server.stats.report(len(server.sessions))}", file=out)
+        await server.close()
+    scores = results.pop("final_scores")
+    print(f"Simulated {players} players for {elapsed:.1f}s: {results['states']} states "
+          f"({results['states'] / max(players * elapsed, 1e-9):.1f}/s per player), {results['games_over']} games finished, "
+          f"{results['errors']} errors, {results['rejected']} rejected, {results['connect_failed']} failed to connect", file=out)
+    results["final_scores"] = scores
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Earth Invaders session server")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Host sessions until interrupted")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--tick-hz", type=int, default=TICK_HZ)
+    serve.add_argument("--tick-budget-ms", type=float, default=TICK_BUDGET_MS)
+    serve.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    serve.add_argument("--seed", type=int, default=None, help="Makes every session's seed reproducible")
+    sim = commands.add_parser("simulate", help="Connect simulated players")
+    sim.add_argument("--host", default=DEFAULT_HOST)
+    sim.add_argument("--port", type=int, default=DEFAULT_PORT)
+    sim.add_argument("--players", type=int, default=50)
+    sim.add_argument("--seconds", type=float, default=20)
+    sim.add_argument("--slow-readers", type=int, default=0, help="How many players stop reading for long stretches")
+    sim.add_argument("--spawn-server", action="store_true", help="Host the sessions in this process too")
+    sim.add_argument("--tick-hz", type=int, default=TICK_HZ, help="Tick rate of the spawned server")
+    return parser.parse_args(argv)
+
+async def serve(args):
+    server = SessionServer(args.host, args.port, tick_hz=args.tick_hz, tick_budget_ms=args.tick_budget_ms,
+                           max_sessions=args.max_sessions, seed=args.seed)
+    await server.start()
+    print(f"Hosting Earth Invaders sessions on {args.host}:{server.port} at {args.tick_hz} ticks/s")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "serve" or args.spawn_server:
+        init_headless_pygame()
+    try:
+        if args.command == "serve":
+            asyncio.run(serve(args))
+        else:
+            asyncio.run(simulate(args.players, args.seconds, args.host, args.port, args.slow_readers,
+                                 args.spawn_server, args.tick_hz))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,179 @@
+# Runs the simulation (input, Game.update, collisions) on its own thread at a fixed rate,
+# so a slow collision frame doesn't hold up presentation and a slow present (or vsync
+# wait) doesn't hold up the simulation. Used by main.py with --threaded-sim.
+#
+# Once a SimulationThread owns a Game, only that thread touches it. After every tick it
+# publishes a RenderSnapshot: everything the scene draws as (surface, position) pairs plus
+# the HUD values, built fresh and never modified afterwards. The render loop draws
+# whichever snapshot is current, so it always gets one complete tick and never a
+# half-updated one. Sprite images are shared but never drawn onto; obstacle surfaces are
+# (as blocks are destroyed), so snapshots hold a copy taken when the obstacle last changed.
+#
+# Input: the render loop forwards its events with post_events(); the input provider runs
+# on this thread (the bot reads the game to decide), and the menu/pause keys it returns
+# come back through take_keys(). Anything else the render loop wants done to the game
+# (new game, pause) goes through run(), which waits for this thread to do it between ticks.
+
+import collections
+import sys
+import threading
+import time
+from collections import namedtuple
+from render_queue import queue_game_scene
+
+# Simulation thread specific constants
+SIM_RATE_HZ = 60 # Game speeds are per update, tuned for 60 updates a second
+MAX_TICK_LAG = 5 # Ticks the simulation may fall behind before the backlog is skipped
+SWITCH_INTERVAL_S = 0.001 # Shorter GIL slices, so a long update can't hold the render loop for 5 ms at a time
+
+RenderSnapshot = namedtuple("RenderSnapshot", ["tick", "items", "score", "lives", "level", "game_over"])
+
+class SceneRecorder:
+    # Stands in for a RenderQueue in queue_game_scene(), keeping positions instead of the
+    # sprites' (mutable) rects and frozen copies instead of live obstacle surfaces
+    def __init__(self):
+        self.items = []
+        self._obstacles = {} # live obstacle surface -> obstacle, for this tick
+        self._frozen = {} # obstacle -> (version, copy of its surface)
+
+    def add(self, surface, rect):
+        obstacle = self._obstacles.get(surface)
+        if obstacle is not None:
+            version, frozen = self._frozen.get(obstacle, (None, None))
+            if version != obstacle.version:
+                frozen = surface.copy()
+                self._frozen[obstacle] = (obstacle.version, frozen)
+            surface = frozen
+        self.items.append((surface, rect.topleft))
+
+    def add_group(self, group):
+        self.items.extend((sprite.image, sprite.rect.topleft) for sprite in group)
+
+    def capture(self, game, tick=0):
+        self._obstacles = {obstacle.surface: obstacle for obstacle in game.obstacles}
+        if len(self._frozen) > len(self._obstacles): # Obstacles were rebuilt; drop copies of the old ones
+            self._frozen = {obstacle: frozen for obstacle, frozen in self._frozen.items()
+                            if obstacle.surface in self._obstacles}
+        self.items = []
+        queue_game_scene(self, game)
+        return RenderSnapshot(tick, tuple(self.items), game.score, game.lives, game.current_level_number, game.game_over)
+
+class SimulationThread:
+    def __init__(self, game, input_provider, rate_hz=SIM_RATE_HZ, after_update=None, clock=time.perf_counter):
+        self.game = game
+        self.input_provider = input_provider
+        self.period = 1.0 / rate_hz
+        self.after_update = after_update # Called on this thread after each Game.update()
+        self.clock = clock
+        self.active = False # Game.update() only runs while the render loop is in the PLAYING state
+        self.ticks = 0
+        self.updates = 0
+        self.skipped_ticks = 0
+        self.update_seconds = 0.0
+        self.slowest_update = 0.0
+        self.last_update_seconds = 0.0 # What the latest Game.update() cost; read by after_update
+        self._recorder = SceneRecorder()
+        self.snapshot = self._recorder.capture(game) # The current snapshot; swapped with one assignment
+        self._events = collections.deque()
+        self._keys = collections.deque()
+        self._commands = collections.deque()
+        self._stopping = False
+        self._thread = None
+        self._saved_switch_interval = None
+
+    def start(self):
+        self._saved_switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._saved_switch_interval, SWITCH_INTERVAL_S))
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def post_events(self, events):
+        # Render loop side: this frame's events, for the input provider
+        if events:
+            self._events.append(events)
+
+    def take_keys(self):
+        # Render loop side: menu/pause keys the input provider returned since the last call
+        keys = []
+        while self._keys:
+            keys.extend(self._keys.popleft())
+        return keys
+
+    def run(self, function, *args, **kwargs):
+        # Calls function on the simulation thread between ticks and waits for it (at most a
+        # tick); used for the rare changes the render loop makes, like starting a new game
+        if self._thread is None:
+            return function(*args, **kwargs)
+        done = threading.Event()
+        result = []
+        self._commands.append((function, args, kwargs, done, result))
+        done.wait()
+        if isinstance(result[0], BaseException):
+            raise result[0]
+        return result[0]
+
+    def _run_commands(self):
+        finished = []
+        while self._commands:
+            function, args, kwargs, done, result = self._commands.popleft()
+            try:
+                result.append(function(*args, **kwargs))
+            except Exception as e:
+                result.append(e)
+            finished.append(done)
+        if finished:
+            # Republished before run() returns, so the render loop never draws the state from before the call
+            self.snapshot = self._recorder.capture(self.game, self.ticks)
+            for done in finished:
+                done.set()
+
+    def step(self):
+        # One tick: pending commands, input, update, then publish what it looks like
+        self._run_commands()
+        events = []
+        while self._events:
+            events.extend(self._events.popleft())
+        keys = self.input_provider.begin_frame(events)
+        if keys:
+            self._keys.append(keys)
+
+        game = self.game
+        if self.active and not game.game_over:
+            started = self.clock()
+            game.update()
+            cost = self.clock() - started
+            self.updates += 1
+            self.last_update_seconds = cost
+            self.update_seconds += cost
+            self.slowest_update = max(self.slowest_update, cost)
+            if self.after_update:
+                self.after_update(game)
+        self.ticks += 1
+        self.snapshot = self._recorder.capture(game, self.ticks)
+
+    def _run(self):
+        next_tick = self.clock()
+        while not self._stopping:
+            self.step()
+            next_tick += self.period
+            delay = next_tick - self.clock()
+            if delay > 0:
+                time.sleep(delay)
+            elif -delay > MAX_TICK_LAG * self.period:
+                # Too far behind (e.g. the machine stalled): carry on from now rather than racing to catch up
+                self.skipped_ticks += int(-delay / self.period)
+                next_tick = self.clock()
+
+    def stop(self):
+        if self._thread:
+            self._stopping = True
+            self._thread.join()
+            self._thread = None
+            sys.setswitchinterval(self._saved_switch_interval)
+        self._run_commands() # Anyone still waiting in run() gets the call done here instead
+
+    def report(self):
+        mean_ms = self.update_seconds / self.updates * 1000 if self.updates else 0.0
+        return (f"{self.ticks} ticks at {1 / self.period:.0f} Hz, {self.updates} updates "
+                f"(mean {mean_ms:.2f} ms, slowest {self.slowest_update * 1000:.1f} ms), "
+                f"{self.skipped_ticks} ticks skipped")
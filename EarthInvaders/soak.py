@@ -0,0 +1,160 @@
+# Long-running soak test: the bot plays back-to-back games for as long as asked while
+# frame cost, sprite counts and process memory are sampled, so slow leaks and gradual
+# slowdowns show up before players find them.
+#
+#   python soak.py --minutes 180 --csv soak.csv
+#
+# Run from the EarthInvaders directory (assets are loaded by relative path).
+
+import argparse
+import os
+import sys
+import time
+from memory_report import rss_kb
+from metrics import sprite_counts
+
+# Soak specific constants
+SAMPLE_EVERY_S = 30 # Length of each reporting window
+FRAME_DRIFT_WARN = 1.25 # Warn if the last window's mean frame cost is this much above the first
+RSS_GROWTH_WARN_KB_PER_HOUR = 2048
+CSV_COLUMNS = ("elapsed_s", "frames", "games", "level", "frame_mean_ms", "frame_p95_ms", "frame_max_ms", "rss_kb",
+               "aliens", "alien_lasers", "player_lasers", "bombs", "explosions", "blocks", "super_alien")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Earth Invaders soak test")
+    parser.add_argument("--minutes", type=float, default=60, help="How long to run")
+    parser.add_argument("--fps", type=int, default=60, help="Pace frames like the game does (0 runs unthrottled)")
+    parser.add_argument("--sample-every", type=float, default=SAMPLE_EVERY_S, metavar="SECONDS", help="Reporting window length")
+    parser.add_argument("--csv", default=None, help="Also write every window to this CSV file")
+    parser.add_argument("--show", action="store_true", help="Open a real window instead of running headless")
+    return parser.parse_args(argv)
+
+class SoakRecorder:
+    # Collects per-frame costs into windows and keeps one row of stats per window
+    def __init__(self, out=None, csv_file=None):
+        self.out = out or sys.stdout
+        self.csv_file = csv_file
+        self.rows = []
+        self.peak_counts = {}
+        self._costs = []
+        if self.csv_file:
+            self.csv_file.write(",".join(CSV_COLUMNS) + "\n")
+
+    def frame(self, cost_s, game):
+        self._costs.append(cost_s)
+        for name, count in sprite_counts(game).items():
+            if count > self.peak_counts.get(name, 0):
+                self.peak_counts[name] = count
+
+    def end_window(self, elapsed_s, frames, games, game):
+        if not self._costs:
+            return None
+        costs = sorted(self._costs)
+        row = {
+            "elapsed_s": round(elapsed_s, 1),
+            "frames": frames,
+            "games": games,
+            "level": game.current_level_number,
+            "frame_mean_ms": round(sum(costs) / len(costs) * 1000, 3),
+            "frame_p95_ms": round(costs[min(len(costs) - 1, int(len(costs) * 0.95))] * 1000, 3),
+            "frame_max_ms": round(costs[-1] * 1000, 3),
+            "rss_kb": rss_kb(),
+        }
+        row.update(sprite_counts(game))
+        self.rows.append(row)
+        self._costs = []
+        print(" ".join(f"{column}={row[column]}" for column in CSV_COLUMNS), file=self.out)
+        if self.csv_file:
+            self.csv_file.write(",".join(str(row[column]) for column in CSV_COLUMNS) + "\n")
+            self.csv_file.flush()
+        return row
+
+    def summary(self):
+        # Compares the first and last windows; the first one includes warm-up, so drift is
+        # measured from the second window when there is one
+        if not self.rows:
+            return "Soak: no complete windows recorded", []
+        first = self.rows[1] if len(self.rows) > 2 else self.rows[0]
+        last = self.rows[-1]
+        hours = max(last["elapsed_s"] - first["elapsed_s"], 1e-9) / 3600
+        drift = last["frame_mean_ms"] / first["frame_mean_ms"] if first["frame_mean_ms"] else 1.0
+        rss_growth = (last["rss_kb"] - first["rss_kb"]) / hours if len(self.rows) > 1 else 0.0
+        lines = [
+            f"Soak: {last['elapsed_s'] / 60:.1f} min, {last['frames']} frames, {last['games']} games",
+            f"  frame cost {first['frame_mean_ms']:.3f} -> {last['frame_mean_ms']:.3f} ms mean (x{drift:.2f}), "
+            f"worst {max(row['frame_max_ms'] for row in self.rows):.2f} ms",
+            f"  RSS {first['rss_kb']} -> {last['rss_kb']} KB ({rss_growth:+.0f} KB/hour)",
+            "  peak sprites: " + ", ".join(f"{name} {count}" for name, count in sorted(self.peak_counts.items())),
+        ]
+        warnings = []
+        if drift > FRAME_DRIFT_WARN:
+            warnings.append(f"Warning: frame cost grew x{drift:.2f} over the run. Something is accumulating per frame.")
+        if len(self.rows) > 2 and rss_growth > RSS_GROWTH_WARN_KB_PER_HOUR:
+            warnings.append(f"Warning: RSS grew {rss_growth:.0f} KB/hour. Possible leak.")
+        return "\n".join(lines + warnings), warnings
+
+def run(args, out=None):
+    if not args.show:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    import pygame
+    from game import Game
+    from input_provider import BotInput
+    from render_queue import RenderQueue, queue_game_scene
+
+    pygame.init()
+    screen_width, screen_height = 750, 700
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    bot = BotInput()
+    game = Game(screen_width, screen_height, input_provider=bot)
+    bot.game = game
+    render_queue = RenderQueue()
+    clock = pygame.time.Clock()
+
+    csv_file = open(args.csv, "w") if args.csv else None
+    recorder = SoakRecorder(out=out, csv_file=csv_file)
+    started = time.perf_counter()
+    deadline = started + args.minutes * 60
+    next_sample = started + args.sample_every
+    frames = 0
+    games = 1
+    try:
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            pygame.event.pump() # Keep the (possibly dummy) window responsive
+            bot.begin_frame(())
+
+            frame_start = time.perf_counter()
+            if game.game_over:
+                game.reset_game(new_round_started=False)
+                games += 1
+            game.update()
+            # Draw like main.py does, so leaks in rendering show up too
+            screen.fill((0, 0, 0))
+            queue_game_scene(render_queue, game)
+            render_queue.flush(screen)
+            if args.show:
+                pygame.display.flip()
+            recorder.frame(time.perf_counter() - frame_start, game)
+            frames += 1
+
+            if now >= next_sample:
+                recorder.end_window(now - started, frames, games, game)
+                next_sample += args.sample_every
+            if args.fps:
+                clock.tick(args.fps)
+        recorder.end_window(time.perf_counter() - started, frames, games, game)
+    finally:
+        if csv_file:
+            csv_file.close()
+        pygame.quit()
+
+    report, warnings = recorder.summary()
+    print(report, file=out or sys.stdout)
+    return 1 if warnings else 0
+
+if __name__ == "__main__":
+    sys.exit(run(parse_args()))
@@ -0,0 +1,31 @@
+import contextlib
+import time
+
+class StartupProfiler:
+    # Times each startup step (and marks milestones like the first menu frame) relative
+    # to process start, so it's clear what stands between launch and the menu.
+    # Recording is always on and costs a couple of perf_counter() calls per step;
+    # report() is only printed when asked for with --startup-profile.
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.entries = [] # (name, offset from start, duration or None for milestones)
+
+    @contextlib.contextmanager
+    def step(self, name):
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.entries.append((name, began - self.start, time.perf_counter() - began))
+
+    def mark(self, name):
+        self.entries.append((name, time.perf_counter() - self.start, None))
+
+    def report(self):
+        lines = ["Startup profile (ms):", f"  {'at':>8}  {'took':>8}  step"]
+        for name, offset, duration in self.entries:
+            took = f"{duration * 1000:8.1f}" if duration is not None else f"{'-':>8}"
+            lines.append(f"  {offset * 1000:8.1f}  {took}  {name}")
+        total = sum(duration for _, _, duration in self.entries if duration is not None)
+        lines.append(f"  {'':>8}  {total * 1000:8.1f}  total of timed steps")
+        return "\n".join(lines)
@@ -0,0 +1,314 @@
+# Compact binary snapshots of the game world, for streaming or storing gameplay.
+# Every KEYFRAME_INTERVAL frames a keyframe carries the whole state; frames in between
+# only carry the sections that changed since the previous frame. Alien alive flags and
+# obstacle block health are bit-packed, and a formation that moved as one is sent as a
+# single (dx, dy) shift instead of 55 positions.
+#
+#   python state_codec.py        # plays a bot round and prints size and speed statistics
+#
+# Frame layout (little-endian):
+#   header    kind u8 (0 keyframe, 1 delta), tick u32, section flags u16
+#   sections  in flag order, each present only if its flag is set (keyframes set them all)
+
+import collections
+import struct
+from obstacle import BLOCK_HEALTH
+
+# State codec specific constants
+KEYFRAME_INTERVAL = 60
+KEYFRAME = 0
+DELTA = 1
+
+SECTION_STATS = 1 << 0 # score u32, lives u8, level u16
+SECTION_ALIEN_ALIVE = 1 << 1 # alive bitmask over the alien roster
+SECTION_ALIEN_SHIFT = 1 << 2 # every alien moved by the same dx i8, dy i8
+SECTION_ALIEN_POSITIONS = 1 << 3 # x i16, y i16 per roster alien
+SECTION_SHIP = 1 << 4 # x i16, flags u8 (alive, shield, invincible)
+SECTION_PLAYER_LASERS = 1 << 5 # count u8, then x i16, y i16 each
+SECTION_ALIEN_LASERS = 1 << 6
+SECTION_BOMBS = 1 << 7
+SECTION_OBSTACLES = 1 << 8 # changed-obstacle mask u8, then alive and damaged bitmaps per changed obstacle
+SECTION_SUPER_ALIEN = 1 << 9 # present u8, then x i16, y i16 if present
+ALL_SECTIONS = (1 << 10) - 1 & ~SECTION_ALIEN_SHIFT
+
+HEADER = struct.Struct("<BIH")
+STATS = struct.Struct("<IBH")
+POINT = struct.Struct("<hh")
+SHIFT = struct.Struct("<bb")
+SHIP = struct.Struct("<hB")
+SHIP_ALIVE, SHIP_SHIELD, SHIP_INVINCIBLE = 1, 2, 4
+
+# What a frame decodes to. Tuples throughout, so states compare with == and can be kept as history.
+WorldState = collections.namedtuple("WorldState", (
+    "tick", "score", "lives", "level",
+    "alien_alive", # tuple of bools, one per roster alien
+    "alien_positions", # tuple of (x, y), one per roster alien (dead ones keep their last position)
+    "ship", # (x, alive, shield, invincible)
+    "player_lasers", "alien_lasers", "bombs", # tuples of (x, y)
+    "obstacle_blocks", # per obstacle, a tuple of block health values (0 once destroyed)
+    "super_alien", # (x, y) or None
+))
+
+def capture(game, tick):
+    # Reads the world out of a Game; positions are sprite rect topleft corners
+    roster = game.alien_roster
+    ship = game.spaceship
+    spaceship_alive = game.spaceship_group.sprite is not None
+    return WorldState(
+        tick=tick,
+        score=game.score,
+        lives=game.lives,
+        level=game.current_level_number,
+        alien_alive=tuple(alien.alive() for alien in roster),
+        alien_positions=tuple((alien.rect.x, alien.rect.y) for alien in roster),
+        ship=(ship.rect.x, spaceship_alive, ship.shield_active, ship.invincible) if ship else (0, False, False, False),
+        player_lasers=tuple(sprite.rect.topleft for sprite in ship.lasers_group) if ship else (),
+        alien_lasers=tuple(sprite.rect.topleft for sprite in game.alien_lasers_group),
+        bombs=tuple(sprite.rect.topleft for sprite in game.bombs_group),
+        obstacle_blocks=tuple(tuple(min(block.health, BLOCK_HEALTH) if block.alive() else 0 for block in obstacle.blocks)
+                              for obstacle in game.obstacles),
+        super_alien=game.super_alien_group.sprite.rect.topleft if game.super_alien_group.sprite else None,
+    )
+
+def pack_bits(bits):
+    value = 0
+    for index, bit in enumerate(bits):
+        if bit:
+            value |= 1 << index
+    return value.to_bytes((len(bits) + 7) // 8, "little")
+
+def unpack_bits(data, count):
+    value = int.from_bytes(data, "little")
+    return tuple(bool(value >> index & 1) for index in range(count))
+
+def _pack_points(points):
+    if len(points) > 255:
+        raise ValueError(f"Too many projectiles to encode ({len(points)}, limit 255)")
+    return bytes((len(points),)) + b"".join(POINT.pack(x, y) for x, y in points)
+
+def _formation_shift(previous, current, alive):
+    # (dx, dy) if every living alien moved by the same small amount, else None
+    shift = None
+    for (old_x, old_y), (x, y), is_alive in zip(previous, current, alive):
+        if not is_alive:
+            continue
+        moved = (x - old_x, y - old_y)
+        if shift is None:
+            shift = moved
+        elif moved != shift:
+            return None
+    if shift is None or not all(-128 <= d <= 127 for d in shift):
+        return None
+    return shift
+
+class StateEncoder:
+    # Call encode() once per frame with consecutive captured states
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.previous = None
+        self._frames = 0
+
+    def force_keyframe(self):
+        # E.g. when a spectator joins and needs something to start from
+        self.previous = None
+
+    def encode(self, state):
+        previous = self.previous
+        keyframe = previous is None or self._frames % self.keyframe_interval == 0 or \
+            len(state.alien_alive) != len(previous.alien_alive) or len(state.obstacle_blocks) != len(previous.obstacle_blocks)
+        self._frames += 1
+        self.previous = state
+
+        flags = ALL_SECTIONS if keyframe else 0
+        shift = None
+        changed_obstacles = range(len(state.obstacle_blocks)) if keyframe else ()
+        if not keyframe:
+            if (state.score, state.lives, state.level) != (previous.score, previous.lives, previous.level):
+                flags |= SECTION_STATS
+            if state.alien_alive != previous.alien_alive:
+                flags |= SECTION_ALIEN_ALIVE
+            if state.alien_positions != previous.alien_positions:
+                shift = _formation_shift(previous.alien_positions, state.alien_positions, state.alien_alive)
+                # Dead aliens don't move, so a shift only reproduces the positions if they were left alone
+                if shift is not None and all(old == new for old, new, alive in zip(previous.alien_positions, state.alien_positions, state.alien_alive) if not alive):
+                    flags |= SECTION_ALIEN_SHIFT
+                else:
+                    shift = None
+                    flags |= SECTION_ALIEN_POSITIONS
+            if state.ship != previous.ship:
+                flags |= SECTION_SHIP
+            if state.player_lasers != previous.player_lasers:
+                flags |= SECTION_PLAYER_LASERS
+            if state.alien_lasers != previous.alien_lasers:
+                flags |= SECTION_ALIEN_LASERS
+            if state.bombs != previous.bombs:
+                flags |= SECTION_BOMBS
+            changed_obstacles = [index for index, blocks in enumerate(state.obstacle_blocks) if blocks != previous.obstacle_blocks[index]]
+            if changed_obstacles:
+                flags |= SECTION_OBSTACLES
+            if state.super_alien != previous.super_alien:
+                flags |= SECTION_SUPER_ALIEN
+
+        parts = [HEADER.pack(KEYFRAME if keyframe else DELTA, state.tick, flags)]
+        if flags & SECTION_STATS:
+            parts.append(STATS.pack(state.score, state.lives, state.level))
+        if flags & SECTION_ALIEN_ALIVE:
+            parts.append(bytes((len(state.alien_alive),)) + pack_bits(state.alien_alive))
+        if flags & SECTION_ALIEN_SHIFT:
+            parts.append(SHIFT.pack(*shift))
+        if flags & SECTION_ALIEN_POSITIONS:
+            parts.append(b"".join(POINT.pack(x, y) for x, y in state.alien_positions))
+        if flags & SECTION_SHIP:
+            x, alive, shield, invincible = state.ship
+            parts.append(SHIP.pack(x, (SHIP_ALIVE if alive else 0) | (SHIP_SHIELD if shield else 0) | (SHIP_INVINCIBLE if invincible else 0)))
+        if flags & SECTION_PLAYER_LASERS:
+            parts.append(_pack_points(state.player_lasers))
+        if flags & SECTION_ALIEN_LASERS:
+            parts.append(_pack_points(state.alien_lasers))
+        if flags & SECTION_BOMBS:
+            parts.append(_pack_points(state.bombs))
+        if flags & SECTION_OBSTACLES:
+            if len(state.obstacle_blocks) > 8:
+                raise ValueError(f"Too many obstacles to encode ({len(state.obstacle_blocks)}, limit 8)")
+            parts.append(bytes((len(state.obstacle_blocks), pack_bits([index in changed_obstacles for index in range(len(state.obstacle_blocks))])[0])))
+            for index in changed_obstacles:
+                blocks = state.obstacle_blocks[index]
+                parts.append(struct.pack("<H", len(blocks)))
+                parts.append(pack_bits([health > 0 for health in blocks]))
+                parts.append(pack_bits([health == 1 for health in blocks])) # Damaged but standing
+        if flags & SECTION_SUPER_ALIEN:
+            if state.super_alien is None:
+                parts.append(b"\x00")
+            else:
+                parts.append(b"\x01" + POINT.pack(*state.super_alien))
+        return b"".join(parts)
+
+class StateDecoder:
+    def __init__(self):
+        self.previous = None
+
+    def decode(self, data):
+        kind, tick, flags = HEADER.unpack_from(data, 0)
+        offset = HEADER.size
+        previous = self.previous
+        if kind == DELTA and previous is None:
+            raise ValueError("Delta frame received before any keyframe")
+        if kind not in (KEYFRAME, DELTA):
+            raise ValueError(f"Unknown frame kind {kind}")
+        fields = previous._asdict() if previous else {}
+        fields["tick"] = tick
+
+        if flags & SECTION_STATS:
+            fields["score"], fields["lives"], fields["level"] = STATS.unpack_from(data, offset)
+            offset += STATS.size
+        if flags & SECTION_ALIEN_ALIVE:
+            count = data[offset]
+            size = (count + 7) // 8
+            fields["alien_alive"] = unpack_bits(data[offset + 1:offset + 1 + size], count)
+            offset += 1 + size
+        if flags & SECTION_ALIEN_SHIFT:
+            dx, dy = SHIFT.unpack_from(data, offset)
+            offset += SHIFT.size
+            fields["alien_positions"] = tuple((x + dx, y + dy) if alive else (x, y)
+                                              for (x, y), alive in zip(fields["alien_positions"], fields["alien_alive"]))
+        if flags & SECTION_ALIEN_POSITIONS:
+            count = len(fields["alien_alive"])
+            fields["alien_positions"] = tuple(POINT.iter_unpack(data[offset:offset + count * POINT.size]))
+            offset += count * POINT.size
+        if flags & SECTION_SHIP:
+            x, ship_flags = SHIP.unpack_from(data, offset)
+            offset += SHIP.size
+            fields["ship"] = (x, bool(ship_flags & SHIP_ALIVE), bool(ship_flags & SHIP_SHIELD), bool(ship_flags & SHIP_INVINCIBLE))
+        for flag, name in ((SECTION_PLAYER_LASERS, "player_lasers"), (SECTION_ALIEN_LASERS, "alien_lasers"), (SECTION_BOMBS, "bombs")):
+            if flags & flag:
+                count = data[offset]
+                fields[name] = tuple(POINT.iter_unpack(data[offset + 1:offset + 1 + count * POINT.size]))
+                offset += 1 + count * POINT.size
+        if flags & SECTION_OBSTACLES:
+            count, changed = data[offset], data[offset + 1]
+            offset += 2
+            obstacles = list(fields.get("obstacle_blocks", ()))[:count]
+            obstacles += [()] * (count - len(obstacles))
+            for index in range(count):
+                if not changed >> index & 1:
+                    continue
+                (blocks,) = struct.unpack_from("<H", data, offset)
+                size = (blocks + 7) // 8
+                alive = unpack_bits(data[offset + 2:offset + 2 + size], blocks)
+                damaged = unpack_bits(data[offset + 2 + size:offset + 2 + 2 * size], blocks)
+                obstacles[index] = tuple((1 if hurt else 2) if standing else 0 for standing, hurt in zip(alive, damaged))
+                offset += 2 + 2 * size
+            fields["obstacle_blocks"] = tuple(obstacles)
+        if flags & SECTION_SUPER_ALIEN:
+            if data[offset]:
+                fields["super_alien"] = POINT.unpack_from(data, offset + 1)
+                offset += 1 + POINT.size
+            else:
+                fields["super_alien"] = None
+                offset += 1
+        if offset != len(data):
+            raise ValueError(f"Frame has {len(data) - offset} unexpected trailing bytes")
+
+        state = WorldState(**fields)
+        self.previous = state
+        return state
+
+def _benchmark(max_frames=60 * 60 * 5):
+    # Plays one round with the bot (on a simulated 60 FPS clock, so it runs flat out) and
+    # reports how big the stream is and how long encoding and decoding take
+    import os
+    import pickle
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from game import Game
+    from input_provider import BotInput
+    from state_digest import FrameClock
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    frame = 0
+    clock = FrameClock() # Game timers follow simulated frames
+    bot = BotInput()
+    game = Game(750, 700, input_provider=bot, clock=clock)
+    bot.game = game
+
+    states = []
+    level = game.current_level_number
+    while frame < max_frames and not game.game_over and game.current_level_number == level:
+        bot.begin_frame(())
+        game.update()
+        states.append(capture(game, frame))
+        frame += 1
+        clock.frame = frame
+
+    encoder = StateEncoder()
+    started = time.perf_counter()
+    frames = [encoder.encode(state) for state in states]
+    encode_s = time.perf_counter() - started
+
+    decoder = StateDecoder()
+    started = time.perf_counter()
+    decoded = [decoder.decode(data) for data in frames]
+    decode_s = time.perf_counter() - started
+    assert decoded == states, "Round trip mismatch"
+
+    keyframes = [len(data) for data in frames if data[0] == KEYFRAME]
+    deltas = sorted(len(data) for data in frames if data[0] == DELTA)
+    total = sum(keyframes) + sum(deltas)
+    pickled = sum(len(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)) for state in states)
+    outcome = "game over" if game.game_over else ("round cleared" if game.current_level_number != level else "frame limit")
+    print(f"Round of {len(states)} frames ({outcome}), keyframe every {KEYFRAME_INTERVAL}")
+    print(f"  keyframes: {len(keyframes)}, mean {sum(keyframes) / len(keyframes):.0f} B, max {max(keyframes)} B")
+    if deltas:
+        print(f"  deltas:    {len(deltas)}, mean {sum(deltas) / len(deltas):.1f} B, "
+              f"p95 {deltas[min(len(deltas) - 1, int(len(deltas) * 0.95))]} B, max {deltas[-1]} B")
+    print(f"  total {total / 1024:.1f} KB ({total * 60 / len(states) / 1024:.2f} KB/s at 60 FPS); "
+          f"pickled full states would be {pickled / 1024:.1f} KB ({pickled / total:.0f}x larger)")
+    print(f"  encode {encode_s / len(states) * 1e6:.1f} us/frame, decode {decode_s / len(states) * 1e6:.1f} us/frame "
+          f"(capture not included)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    _benchmark()
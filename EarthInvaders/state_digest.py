@@ -0,0 +1,129 @@
+# Per-frame digest of the whole simulated world, for checking that an optimized engine
+# (vectorized formation, array obstacles, pooled projectiles...) behaves exactly like the
+# reference Game. snapshot() lists the state by name in a canonical order; digest() hashes
+# it. Cosmetic state (explosion sprites, quality level, sounds) is left out on purpose,
+# but their timers are in, since they share the game's timer heap.
+#
+# Verify a candidate engine against the reference, from the same seed and bot inputs:
+#   python state_digest.py --frames 5000 --seed 7 --candidate my_module:FastGame
+# The candidate is called like Game(width, height, input_provider=..., clock=..., rng=...).
+# It prints the first frame whose digests differ and which parts of the state differ.
+#
+# Run from the EarthInvaders directory (assets are loaded by relative path).
+
+import hashlib
+import importlib
+import os
+import random
+import sys
+
+# State digest specific constants
+DIGEST_SIZE = 8 # bytes; collisions between two nearly identical frames are not a concern
+FRAME_MS = 1000 / 60
+SCREEN_SIZE = (750, 700)
+
+def _rects(sprites):
+    # Sorted, so engines that keep sprites in a different order (pools, arrays) still match
+    return tuple(sorted(tuple(sprite.rect) for sprite in sprites))
+
+def snapshot(game):
+    ship = game.spaceship_group.sprite
+    super_alien = game.super_alien_group.sprite
+    return {
+        "score": game.score,
+        "lives": game.lives,
+        "level": game.current_level_number,
+        "game_over": game.game_over,
+        "formation": (game.aliens_direction, game.alien_descents, game.game_speed_modifier,
+                      game.frenzy_mode_activated_this_round),
+        "aliens": _rects(game.aliens_group),
+        "frenzied": sum(1 for alien in game.aliens_group if alien.is_frenzied),
+        "spaceship": (tuple(ship.rect), ship.laser_ready, ship.invincible, ship.blink_on,
+                      ship.shield_active, ship.shield_ready) if ship else None,
+        "player_lasers": _rects(ship.lasers_group) if ship else (),
+        "alien_lasers": _rects(game.alien_lasers_group),
+        "bombs": _rects(game.bombs_group),
+        "super_alien": tuple(super_alien.rect) if super_alien else None,
+        "blocks": tuple(tuple(block.health if block.alive() else 0 for block in obstacle.blocks)
+                        for obstacle in game.obstacles),
+        "timers": (game.timers.now(), tuple(game.timers.pending())),
+    }
+
+def digest(game):
+    # repr() of the snapshot is canonical: fixed key order, ints, bools and tuples only
+    return hashlib.blake2b(repr(snapshot(game)).encode(), digest_size=DIGEST_SIZE).hexdigest()
+
+def _first_difference(path, expected, actual):
+    # Narrows nested tuples of the same shape down to the first element that differs
+    while isinstance(expected, tuple) and isinstance(actual, tuple) and len(expected) == len(actual):
+        index = next(i for i, (a, b) in enumerate(zip(expected, actual)) if a != b)
+        path, expected, actual = f"{path}[{index}]", expected[index], actual[index]
+    return f"{path}: reference {expected!r}, candidate {actual!r}"
+
+def diff(reference, candidate):
+    # Human-readable differences between two snapshots
+    return [_first_difference(key, reference[key], candidate.get(key))
+            for key in reference if reference[key] != candidate.get(key)]
+
+class FrameClock:
+    # Game time that advances one frame per step, instead of with the wall clock
+    def __init__(self, frame_ms=FRAME_MS):
+        self.frame = 0
+        self.frame_ms = frame_ms
+
+    def __call__(self):
+        return int(self.frame * self.frame_ms)
+
+def _new_engine(engine_class, seed):
+    from input_provider import BotInput
+    clock = FrameClock()
+    bot = BotInput()
+    game = engine_class(*SCREEN_SIZE, input_provider=bot, clock=clock, rng=random.Random(seed))
+    bot.game = game
+    return game, bot, clock
+
+def _step(game, bot, clock):
+    bot.begin_frame(())
+    if game.game_over:
+        game.reset_game(new_round_started=False)
+    game.update()
+    clock.frame += 1
+
+def verify(reference_class, candidate_class, frames, seed=0, out=None):
+    # Runs both engines in lockstep and returns the first frame they diverge on, or None
+    out = out or sys.stdout
+    reference = _new_engine(reference_class, seed)
+    candidate = _new_engine(candidate_class, seed)
+    for frame in range(frames + 1):
+        if frame:
+            _step(*reference)
+            _step(*candidate)
+        if digest(reference[0]) != digest(candidate[0]):
+            print(f"Diverged at frame {frame}:", file=out)
+            for line in diff(snapshot(reference[0]), snapshot(candidate[0])):
+                print(f"  {line}", file=out)
+            return frame
+    print(f"{frames} frames identical (seed {seed}, final digest {digest(reference[0])})", file=out)
+    return None
+
+def _load_class(spec):
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name or "Game")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Check a game engine against the reference frame by frame")
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reference", default="game:Game")
+    parser.add_argument("--candidate", default="game:Game", help="module:Class to verify (defaults to checking the reference against itself)")
+    cli_args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    pygame.init()
+    pygame.display.set_mode(SCREEN_SIZE)
+    diverged = verify(_load_class(cli_args.reference), _load_class(cli_args.candidate), cli_args.frames, cli_args.seed)
+    pygame.quit()
+    sys.exit(1 if diverged is not None else 0)
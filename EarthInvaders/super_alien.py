@@ -1,5 +1,6 @@
 import pygame
 import random
+from assets import load_image
 
 # Super Alien specific constants
 SUPER_ALIEN_DEFAULT_SPEED = 3
@@ -7,15 +8,19 @@ SUPER_ALIEN_POINTS = 300
 SUPER_ALIEN_BOMB_DROP_CHANCE = 0.01
 
 class SuperAlien(pygame.sprite.Sprite):
-    def __init__(self, screen_width, screen_height, speed=SUPER_ALIEN_DEFAULT_SPEED):
+    __slots__ = ("screen_width", "screen_height", "image", "rect", "spawn_side", "speed", "points",
+                 "bomb_drop_chance", "initial_bomb_burst_fired", "rng")
+
+    def __init__(self, screen_width, screen_height, speed=SUPER_ALIEN_DEFAULT_SPEED, rng=random):
         super().__init__()
+        self.rng = rng # The game's random source, so seeded games replay exactly
         self.screen_width = screen_width
         self.screen_height = screen_height # May not be strictly needed for horizontal movement but good to have
 
-        self.image = pygame.image.load("Graphics/mystery.png").convert_alpha()
+        self.image = load_image("Graphics/mystery.png")
 
         # Determine spawn side (left or right)
-        self.spawn_side = random.choice(["left", "right"])
+        self.spawn_side = self.rng.choice(["left", "right"])
         if self.spawn_side == "left":
             self.rect = self.image.get_rect(midleft=(-self.image.get_width(), 60)) # Spawn just off-screen left, at y=60
             self.speed = speed
@@ -45,4 +50,4 @@ class SuperAlien(pygame.sprite.Sprite):
     # Placeholder for bomb dropping - actual bomb creation will be handled by Game class
     # based on a signal from this update or by Game class directly checking conditions
     def should_drop_bomb(self):
-        return random.random() < self.bomb_drop_chance
+        return self.rng.random() < self.bomb_drop_chance
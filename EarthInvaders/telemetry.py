@@ -0,0 +1,103 @@
+import gzip
+import json
+import os
+import threading
+import time
+from background import THREADS_AVAILABLE
+
+# Telemetry specific constants
+TELEMETRY_DIR = "telemetry"
+RING_CAPACITY = 8192 # Power of two; several seconds of events even at frenzy rates
+FLUSH_INTERVAL_S = 1.0
+EVENTS_PER_FILE = 200000 # Start a new .jsonl.gz file after this many events
+
+class Telemetry:
+    # Structured gameplay events. emit() only stores a tuple in a preallocated ring
+    # buffer; a writer thread copies finished slots out and appends them to gzipped
+    # JSONL files, so the game loop never does I/O or waits on a lock. If the writer
+    # ever falls a whole ring behind, the oldest events are overwritten and counted
+    # in `dropped` rather than stalling the game.
+    def __init__(self, directory=TELEMETRY_DIR, capacity=RING_CAPACITY, threaded=None, clock=time.time):
+        if capacity & (capacity - 1):
+            raise ValueError(f"Telemetry ring capacity must be a power of two, got {capacity}")
+        self.directory = directory
+        self.clock = clock
+        self._ring = [None] * capacity
+        self._mask = capacity - 1
+        self._head = 0 # Events emitted so far; only the game loop writes it
+        self._tail = 0 # Events consumed so far; only the writer writes it
+        self.dropped = 0
+        self.written = 0
+
+        self._file_path = None
+        self._file_events = 0
+        self._session = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self._file_index = 0
+
+        self.threaded = THREADS_AVAILABLE if threaded is None else threaded
+        self._stopping = threading.Event()
+        self._thread = None
+        if self.threaded:
+            self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+            self._thread.start()
+
+    def emit(self, kind, **fields):
+        head = self._head
+        self._ring[head & self._mask] = (self.clock(), kind, fields)
+        self._head = head + 1
+
+    def pump(self):
+        # Browser builds have no writer thread; call this from an idle screen
+        if not self.threaded:
+            self.flush()
+
+    def flush(self):
+        head = self._head
+        start = max(self._tail, head - len(self._ring))
+        self.dropped += start - self._tail
+        events = [self._ring[i & self._mask] for i in range(start, head)]
+
+        # Slots the game loop lapped while we were copying hold newer events than we meant to read
+        lapped = self._head - len(self._ring) - start
+        if lapped > 0:
+            events = events[lapped:]
+            self.dropped += lapped
+        self._tail = head
+        if events:
+            self._write(events)
+
+    def _write(self, events):
+        if self._file_path is None or self._file_events >= EVENTS_PER_FILE:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file_index += 1
+            self._file_path = os.path.join(self.directory, f"events-{self._session}-{self._file_index:03d}.jsonl.gz")
+            self._file_events = 0
+
+        lines = []
+        for timestamp, kind, fields in events:
+            record = {"t": round(timestamp, 4), "event": kind}
+            record.update(fields)
+            lines.append(json.dumps(record, separators=(",", ":")))
+        lines.append("")
+        # Each flush appends one gzip member; gzip readers treat the file as one stream
+        with gzip.open(self._file_path, "at", compresslevel=5, encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        self._file_events += len(events)
+        self.written += len(events)
+
+    def _run(self):
+        while not self._stopping.wait(FLUSH_INTERVAL_S):
+            self._safe_flush()
+
+    def _safe_flush(self):
+        try:
+            self.flush()
+        except OSError as e:
+            print(f"Warning: Could not write telemetry to '{self.directory}'. Error: {e}. Events in this batch are lost.")
+
+    def close(self):
+        if self._thread:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+        self._safe_flush()
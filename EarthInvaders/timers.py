@@ -0,0 +1,82 @@
+import heapq
+import itertools
+import time
+
+class Timer:
+    __slots__ = ("deadline", "callback", "cancelled")
+
+    def __init__(self, deadline, callback):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        # Left in the heap and skipped when it comes up, which keeps cancelling O(1)
+        self.cancelled = True
+
+def monotonic_ms():
+    # Milliseconds from the process's performance counter; runs whether or not SDL's timer
+    # subsystem was started (pygame.time.get_ticks() stays at 0 until it is)
+    return int(time.perf_counter() * 1000)
+
+class TimerScheduler:
+    # One heap of deadlines for everything time-based in a game (respawns, super alien
+    # spawns, invincibility, shields, laser recharge, explosions). advance() runs once per
+    # frame and only touches timers that are due, so the per-frame cost follows the number
+    # of expired timers rather than the number of entities waiting on one.
+    #
+    # Times are in milliseconds. The clock defaults to monotonic_ms and can be injected for
+    # simulations that run on their own tick (or pygame.time.get_ticks, if the caller knows
+    # SDL's timer is running). While paused, time stands still for every timer at once.
+    def __init__(self, clock=None):
+        self._clock = clock if clock else monotonic_ms
+        self._heap = []
+        self._order = itertools.count() # Ties fire in the order they were scheduled
+        self._paused_at = None
+        self._paused_total = 0
+
+    def now(self):
+        if self._paused_at is not None:
+            return self._paused_at
+        return self._clock() - self._paused_total
+
+    def call_at(self, deadline, callback):
+        timer = Timer(deadline, callback)
+        heapq.heappush(self._heap, (deadline, next(self._order), timer))
+        return timer
+
+    def call_later(self, delay_ms, callback):
+        return self.call_at(self.now() + delay_ms, callback)
+
+    def advance(self):
+        # Fires every timer whose deadline has passed; returns how many fired
+        now = self.now()
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][0] <= now:
+            timer = heapq.heappop(heap)[2]
+            if not timer.cancelled:
+                timer.cancelled = True # Spent, so a late cancel() is harmless
+                timer.callback()
+                fired += 1
+        return fired
+
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = self.now()
+
+    def resume(self):
+        if self._paused_at is not None:
+            self._paused_total = self._clock() - self._paused_at
+            self._paused_at = None
+
+    def pending(self):
+        # Deadlines still waiting to fire, soonest first
+        return sorted(deadline for deadline, _, timer in self._heap if not timer.cancelled)
+
+    @property
+    def paused(self):
+        return self._paused_at is not None
+
+    def __len__(self):
+        return len(self._heap)
@@ -0,0 +1,76 @@
+import os
+import pygame
+import pytest
+from asset_cache import AssetCache
+
+class TestAssetCache:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+        self.image_path = "Graphics/alien_1.png"
+        self.sound_path = "Sounds/laser.ogg"
+
+    def test_cached_image_matches_decoded_image(self, tmp_path):
+        decoded = pygame.image.load(self.image_path).convert_alpha()
+        AssetCache(str(tmp_path)).load_image(self.image_path) # Writes the entry
+
+        cache = AssetCache(str(tmp_path)) # A later launch
+        cached = cache.load_image(self.image_path)
+        assert (cache.hits, cache.misses) == (1, 0)
+        assert cached.get_size() == decoded.get_size()
+        assert cached.get_masks() == decoded.get_masks()
+        assert pygame.image.tobytes(cached, "RGBA") == pygame.image.tobytes(decoded, "RGBA")
+
+    def test_cached_image_can_be_drawn_on(self, tmp_path):
+        AssetCache(str(tmp_path)).load_image(self.image_path)
+        entries = sorted(tmp_path.iterdir())
+        stored = [entry.read_bytes() for entry in entries]
+
+        cache = AssetCache(str(tmp_path))
+        cached = cache.load_image(self.image_path)
+        assert cache.hits == 1
+        cached.fill((1, 2, 3, 255)) # Writable like a decoded image
+        assert cached.get_at((0, 0)) == (1, 2, 3, 255)
+        assert [entry.read_bytes() for entry in entries] == stored # The entry on disk is untouched
+        assert cache.load_image(self.image_path).get_at((0, 0)) != (1, 2, 3, 255)
+
+    def test_cached_sound_matches_decoded_sound(self, tmp_path):
+        if not pygame.mixer.get_init():
+            pytest.skip("mixer not available")
+        decoded = pygame.mixer.Sound(self.sound_path)
+        AssetCache(str(tmp_path)).load_sound(self.sound_path)
+
+        cache = AssetCache(str(tmp_path))
+        assert cache.load_sound(self.sound_path).get_raw() == decoded.get_raw()
+        assert cache.hits == 1
+
+    def test_changed_file_misses(self, tmp_path):
+        source = tmp_path / "sprite.png"
+        surface = pygame.Surface((4, 4), pygame.SRCALPHA)
+        surface.fill((255, 0, 0, 255))
+        pygame.image.save(surface, str(source))
+        cache = AssetCache(str(tmp_path / "cache"))
+        cache.load_image(str(source))
+
+        surface.fill((0, 0, 255, 255))
+        pygame.image.save(surface, str(source))
+        reloaded = cache.load_image(str(source)) # Keyed by content, not by path
+        assert cache.misses == 2
+        assert reloaded.get_at((0, 0)) == (0, 0, 255, 255)
+
+    def test_corrupt_entry_falls_back_to_decoding(self, tmp_path):
+        AssetCache(str(tmp_path)).load_image(self.image_path)
+        for name in os.listdir(tmp_path):
+            with open(tmp_path / name, "wb") as entry:
+                entry.write(b"not a cache entry")
+
+        cache = AssetCache(str(tmp_path))
+        image = cache.load_image(self.image_path)
+        assert cache.misses == 1
+        assert image.get_size() == pygame.image.load(self.image_path).get_size()
+
+    def teardown_method(self):
+        pygame.quit()
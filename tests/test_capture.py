@@ -0,0 +1,45 @@
+import os
+import pygame
+from capture import FrameCapture
+
+class TestCapture:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+        self.frame = pygame.Surface((40, 30))
+
+    def test_png_sequence_written_by_worker(self, tmp_path):
+        capture = FrameCapture((40, 30), directory=str(tmp_path), format="png")
+        for shade in (10, 20, 30):
+            self.frame.fill((shade, 0, 0))
+            assert capture.capture(self.frame)
+        capture.close()
+
+        names = sorted(os.listdir(capture.directory))
+        assert names == ["frame-000000.png", "frame-000001.png", "frame-000002.png"]
+        assert pygame.image.load(os.path.join(capture.directory, names[2])).get_at((0, 0))[:3] == (30, 0, 0)
+        assert capture.written == 3 and capture.dropped == 0
+
+    def test_raw_frames_append_to_one_file(self, tmp_path):
+        capture = FrameCapture((40, 30), directory=str(tmp_path), format="raw")
+        for _ in range(4):
+            capture.capture(self.frame)
+        capture.close()
+        assert os.path.getsize(os.path.join(capture.directory, "frames-40x30.rgb")) == 4 * 40 * 30 * 3
+
+    def test_full_ring_drops_instead_of_blocking(self, tmp_path):
+        capture = FrameCapture((40, 30), directory=str(tmp_path), slots=2, threaded=False)
+        results = [capture.capture(self.frame) for _ in range(5)]
+        assert results == [True, True, False, False, False]
+        assert capture.dropped == 3
+
+        capture.pump() # Writing frees the slots again
+        assert capture.capture(self.frame)
+        capture.close()
+        assert capture.written == 3
+
+    def teardown_method(self):
+        pygame.quit()
@@ -0,0 +1,78 @@
+import pygame
+from laser import Laser
+from bomb import Bomb
+from obstacle import Block
+from collision import sweep_groupcollide, sweep_spritecollide
+from assets import mask_for, solid_surface
+
+class TestCollision:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+        self.screen_height = 600
+
+    def test_fast_laser_cannot_tunnel_through_block(self):
+        block = Block(100, 300)
+        blocks = pygame.sprite.Group(block)
+        lasers = pygame.sprite.Group(Laser((101, 330), 40, self.screen_height)) # Just below the block
+        lasers.update() # Ends up entirely above it
+
+        assert not pygame.sprite.groupcollide(lasers, blocks, False, False) # End positions miss
+        hits = sweep_groupcollide(lasers, blocks, True, False)
+        assert list(hits.values()) == [[block]]
+        assert not lasers # Projectile killed like groupcollide would
+
+    def test_target_killed_by_first_projectile_only(self):
+        block = Block(100, 300)
+        blocks = pygame.sprite.Group(block)
+        lasers = pygame.sprite.Group(Laser((101, 305), 7, self.screen_height), Laser((102, 306), 7, self.screen_height))
+        lasers.update()
+
+        hits = sweep_groupcollide(lasers, blocks, True, True)
+        assert len(hits) == 1 and not blocks
+        assert len(lasers) == 1
+
+    def test_fast_bomb_hits_spaceship_it_passed(self):
+        spaceship = pygame.sprite.Sprite()
+        spaceship.rect = pygame.Rect(100, 500, 60, 20)
+        bombs = pygame.sprite.Group(Bomb((130, 480), 60, self.screen_height))
+        bombs.update() # Jumps from above the ship to below it
+
+        assert not pygame.sprite.spritecollide(spaceship, bombs, False)
+        assert len(sweep_spritecollide(spaceship, bombs, True)) == 1
+        assert not bombs
+
+    def make_round_target(self):
+        # 20x20 sprite that is transparent except for a 4x4 square in the middle
+        target = pygame.sprite.Sprite()
+        target.image = pygame.Surface((20, 20), pygame.SRCALPHA)
+        target.image.fill((255, 255, 255, 255), pygame.Rect(8, 8, 4, 4))
+        target.rect = target.image.get_rect(topleft=(100, 100))
+        return target
+
+    def test_pixel_perfect_ignores_transparent_corners(self):
+        target = self.make_round_target()
+        targets = pygame.sprite.Group(target)
+        corner_shot = pygame.sprite.Group(Laser((102, 140), 7, self.screen_height))
+        for _ in range(6):
+            corner_shot.update()
+
+        assert sweep_groupcollide(corner_shot, targets, False, False) # Rects overlap
+        assert not sweep_groupcollide(corner_shot, targets, False, False, pixel_perfect=True)
+
+        centre_shot = pygame.sprite.Group(Laser((110, 140), 7, self.screen_height))
+        for _ in range(6):
+            centre_shot.update()
+        assert sweep_groupcollide(centre_shot, targets, False, False, pixel_perfect=True)
+        assert len(sweep_spritecollide(target, centre_shot, False, pixel_perfect=True)) == 1
+
+    def test_masks_built_once_per_surface(self):
+        target = self.make_round_target()
+        assert mask_for(target.image) is mask_for(target.image)
+        assert mask_for(solid_surface((3, 3), (1, 2, 3))) is None # Solid: the rect test is exact
+
+    def teardown_method(self):
+        pygame.quit()
@@ -0,0 +1,65 @@
+import asyncio
+from frame_limiter import FrameLimiter, STATS_WINDOW_FRAMES, TARGET_FPS_STEP
+
+class FakeClock:
+    # Simulated time: "work" and sleeps only advance it when told to
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += max(seconds, 0.0001) # Even a bare yield takes a moment
+
+class TestFrameLimiter:
+    def setup_method(self):
+        self.clock = FakeClock()
+
+    def make_limiter(self, **kwargs):
+        return FrameLimiter(target_fps=60, min_fps=30, clock=self.clock, sleep=self.clock.sleep, precise=True, **kwargs)
+
+    def run_frames(self, limiter, count, frame_cost):
+        async def loop():
+            for _ in range(count):
+                self.clock.now += frame_cost # Simulated frame work
+                await limiter.wait()
+        asyncio.run(loop())
+
+    def test_sleeps_for_remainder_of_budget(self):
+        limiter = self.make_limiter()
+        self.run_frames(limiter, 3, 0.005)
+
+        # The first wait() starts the clock; after that frames are exactly one budget apart
+        assert abs(self.clock.now - (0.005 + 3 / 60)) < 0.001
+        assert limiter.missed_deadlines == 0
+
+    def test_counts_missed_deadlines(self):
+        limiter = self.make_limiter(adaptive=False)
+        self.run_frames(limiter, 10, 0.030)
+
+        assert limiter.missed_deadlines == 9 # The first frame starts the clock, so it fits
+        assert limiter.target_fps == 60
+
+    def test_lowers_target_when_device_cannot_keep_up(self):
+        limiter = self.make_limiter()
+        self.run_frames(limiter, STATS_WINDOW_FRAMES, 0.020)
+
+        assert limiter.target_fps == 60 - TARGET_FPS_STEP
+        assert 0 < limiter.achieved_fps < 60
+
+    def test_never_drops_below_min_fps(self):
+        limiter = self.make_limiter()
+        self.run_frames(limiter, STATS_WINDOW_FRAMES * 6, 0.100)
+
+        assert limiter.target_fps == 30
+
+    def test_recovers_target_when_frames_get_cheap_again(self):
+        limiter = self.make_limiter()
+        self.run_frames(limiter, STATS_WINDOW_FRAMES, 0.020)
+        assert limiter.target_fps < 60
+
+        self.run_frames(limiter, STATS_WINDOW_FRAMES * 2, 0.002)
+        assert limiter.target_fps == 60
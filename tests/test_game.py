@@ -5,6 +5,8 @@ from spaceship import Spaceship
 from bomb import Bomb
 from explosion import Explosion
 from alien import Alien
+from laser import Laser
+from quality_governor import QUALITY_LEVELS
 from game import FRENZY_ALIEN_COUNT, FRENZY_SHOOT_PROBABILITY, ALIEN_SHOOT_PROBABILITY
 import random
 
@@ -68,6 +70,16 @@ class TestGame:
         first_block = self.game.obstacles[0].blocks_group.sprites()[0]
         assert first_block is not None
 
+    def test_roster_and_spaceship_outlive_their_groups(self):
+        roster = self.game.alien_roster
+        assert len(roster) == len(self.game.aliens_group)
+        roster[0].kill()
+        assert self.game.alien_roster == roster # Dead aliens keep their place
+
+        ship = self.game.spaceship
+        self.game.spaceship_group.empty() # As while waiting to respawn
+        assert self.game.spaceship is ship
+
     def teardown_method(self):
         pygame.quit()
 
@@ -313,3 +325,66 @@ class TestGame:
 
         finally:
             random.random = original_random_random # Restore
+
+    def test_new_round_reuses_entities_and_restores_obstacles_over_frames(self):
+        spaceship = self.game.spaceship_group.sprite
+        aliens = set(self.game.aliens_group)
+        for obstacle in self.game.obstacles:
+            obstacle.destroy()
+        for alien in list(aliens)[:10]:
+            alien.kill()
+        spaceship.rect.x = 0
+
+        self.game.reset_game(new_round_started=True)
+
+        assert self.game.spaceship_group.sprite is spaceship
+        assert spaceship.rect.midbottom == (self.screen_width // 2, self.screen_height)
+        assert set(self.game.aliens_group) == aliens
+        assert not any(obstacle.blocks_group for obstacle in self.game.obstacles) # Not rebuilt on the reset frame
+
+        for _ in self.game.obstacles:
+            self.game.advance_round_setup()
+        assert all(len(obstacle.blocks_group) == len(obstacle.blocks) for obstacle in self.game.obstacles)
+
+    def test_front_line_index_follows_kills(self):
+        front = {alien.column: alien for alien in self.game.aliens_group.front_line()}
+        assert len(front) == 11 and all(alien.row == 4 for alien in front.values())
+
+        front[3].kill()
+        new_front = {alien.column: alien for alien in self.game.aliens_group.front_line()}
+        assert new_front[3].row == 3 and new_front[3].alive()
+
+        for alien in list(self.game.aliens_group.columns[5]):
+            alien.kill()
+        assert 5 not in self.game.aliens_group.columns
+
+        self.game.reset_game(new_round_started=True)
+        assert len(self.game.aliens_group.front_line()) == 11
+
+    def test_only_front_line_aliens_fire(self):
+        rolls = []
+        original_random_random = random.random
+        try:
+            random.random = lambda: rolls.append(1) or 0.0 # Every roll fires
+            self.game.alien_lasers_group.empty()
+            self.game.alien_shoot()
+        finally:
+            random.random = original_random_random
+
+        assert len(rolls) == 11 # One roll per column, not per alien
+        front_line = self.game.aliens_group.front_line()
+        assert sorted(laser.rect.centerx for laser in self.game.alien_lasers_group) == sorted(alien.rect.centerx for alien in front_line)
+        assert all(laser.rect.centery == front_line[0].rect.centery for laser in self.game.alien_lasers_group)
+
+    def test_quality_level_skips_explosions_but_not_kills(self):
+        self.game.quality = QUALITY_LEVELS[-1]
+        self.game.explosions_group.empty()
+        alien = self.game.aliens_group.sprites()[0]
+        laser = Laser(alien.rect.center, 7, self.screen_height)
+        self.game.spaceship_group.sprite.lasers_group.add(laser)
+        score = self.game.score
+
+        self.game.check_collisions()
+
+        assert not alien.alive() and self.game.score == score + 10
+        assert len(self.game.explosions_group) == 0
@@ -0,0 +1,93 @@
+import os
+from high_scores import HighScoreStore, TOP_CAPACITY, RECORD
+
+class TestHighScoreStore:
+    def setup_method(self, method):
+        self.path = f"test_high_scores_{method.__name__}.dat"
+        self.remove_files()
+
+    def remove_files(self):
+        for suffix in ("", ".tmp", ".corrupt"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_submit_returns_rank(self):
+        store = HighScoreStore(self.path, threaded=False)
+        assert store.submit(100) == 1
+        assert store.submit(300) == 1
+        assert store.submit(200) == 2
+        assert store.submit(50) == 4
+        assert store.rank(250) == 2
+        store.close()
+
+    def test_top_is_best_first_and_earliest_on_ties(self):
+        store = HighScoreStore(self.path, threaded=False)
+        for score, name in [(10, "a"), (30, "b"), (30, "c"), (20, "d")]:
+            store.submit(score, name)
+
+        assert [(e.score, e.name) for e in store.top(3)] == [(30, "b"), (30, "c"), (20, "d")]
+        assert store.best().score == 30
+        store.close()
+
+    def test_nothing_is_written_until_the_worker_drains(self):
+        store = HighScoreStore(self.path, threaded=False)
+        store.submit(100)
+        assert not os.path.exists(self.path)
+
+        store.pump()
+        assert os.path.exists(self.path)
+        store.close()
+
+    def test_scores_survive_reopen(self):
+        store = HighScoreStore(self.path, threaded=True)
+        for score in range(0, 1000, 10):
+            store.submit(score, "kiosk-1")
+        store.close()
+
+        reopened = HighScoreStore(self.path, threaded=False)
+        assert len(reopened) == 100
+        assert reopened.best().score == 990
+        assert reopened.best().name == "kiosk-1"
+        assert reopened.rank(995) == 1
+        assert reopened.rank(500) == 50
+        reopened.close()
+
+    def test_compaction_keeps_every_entry(self):
+        store = HighScoreStore(self.path, threaded=False, compact_every=25)
+        for score in range(TOP_CAPACITY + 60):
+            store.submit(score * 7 % 101)
+            store.pump()
+        store.close()
+
+        reopened = HighScoreStore(self.path, threaded=False)
+        assert len(reopened) == TOP_CAPACITY + 60
+        top = reopened.top(TOP_CAPACITY)
+        assert len(top) == TOP_CAPACITY
+        assert [e.score for e in top] == sorted((e.score for e in top), reverse=True)
+        assert top[0].score == 100
+        reopened.close()
+
+    def test_partial_trailing_record_is_dropped(self):
+        store = HighScoreStore(self.path, threaded=False)
+        store.submit(42)
+        store.close()
+        with open(self.path, "ab") as f:
+            f.write(b"\x01" * (RECORD.size // 2)) # Simulate a crash mid-append
+
+        reopened = HighScoreStore(self.path, threaded=False)
+        reopened.submit(7)
+        reopened.close()
+
+        assert len(HighScoreStore(self.path, threaded=False)) == 2
+
+    def test_corrupt_file_is_moved_aside(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a high score file")
+
+        store = HighScoreStore(self.path, threaded=False)
+        assert len(store) == 0
+        assert os.path.exists(self.path + ".corrupt")
+        store.close()
+
+    def teardown_method(self):
+        self.remove_files()
@@ -0,0 +1,55 @@
+import pygame
+from game import Game
+from laser import AlienLaser
+from input_provider import ScriptedInput, BotInput, HeldKeys
+
+class TestInputProviders:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+
+    def test_held_keys_index_like_get_pressed(self):
+        keys = HeldKeys({pygame.K_LEFT})
+        assert keys[pygame.K_LEFT] and not keys[pygame.K_RIGHT]
+
+    def test_scripted_input_flies_the_spaceship(self):
+        script = ScriptedInput([(3, {pygame.K_RIGHT}, [pygame.K_RETURN]), (2, ())])
+        game = Game(800, 600, input_provider=script)
+        spaceship = game.spaceship_group.sprite
+        start_x = spaceship.rect.x
+
+        presses = [script.begin_frame(()) for _ in range(5)]
+        assert presses == [[pygame.K_RETURN], [], [], [], []]
+        assert script.finished
+
+        script = ScriptedInput([(3, {pygame.K_RIGHT})])
+        spaceship.input = script
+        for _ in range(3):
+            script.begin_frame(())
+            spaceship.get_user_input()
+        assert spaceship.rect.x == start_x + 3 * spaceship.speed
+
+    def test_bot_sidesteps_a_laser_falling_on_it(self):
+        bot = BotInput()
+        game = Game(800, 600, input_provider=bot)
+        bot.game = game
+        game.aliens_group.empty()
+        spaceship = game.spaceship_group.sprite
+        game.alien_lasers_group.add(AlienLaser((spaceship.rect.centerx, spaceship.rect.top - 40), 4, 600))
+
+        bot.begin_frame(())
+        held = bot.pressed()
+        assert held[pygame.K_LEFT] or held[pygame.K_RIGHT]
+
+    def test_bot_restarts_after_game_over(self):
+        bot = BotInput()
+        assert bot.begin_frame(()) == [pygame.K_RETURN] # No game yet: start one
+        bot.game = Game(800, 600, input_provider=bot)
+        bot.game.game_over = True
+        assert bot.begin_frame(()) == [pygame.K_n, pygame.K_RETURN]
+
+    def teardown_method(self):
+        pygame.quit()
@@ -0,0 +1,49 @@
+import io
+import pygame
+from game import Game
+from alien import Alien
+from laser import Laser
+from obstacle import Block
+from memory_report import MemoryReport
+
+class TestSlotsAndMemoryReport:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+        self.game = Game(800, 600)
+
+    def test_slotted_sprites_keep_group_behaviour(self):
+        group = pygame.sprite.Group()
+        block = Block(0, 0)
+        laser = Laser((1, 1), 7, 600)
+        group.add(block, laser)
+
+        assert set(pygame.sprite.spritecollide(block, group, False)) == {block, laser}
+        laser.kill()
+        assert laser not in group and block.alive()
+
+    def test_sprites_share_images(self):
+        first, second = Alien(1, 0, 0), Alien(1, 50, 0)
+        assert first.image is second.image
+        assert Block(0, 0).image is Block(3, 0).image
+
+    def test_report_counts_live_entities(self):
+        out = io.StringIO()
+        report = MemoryReport(out=out)
+        try:
+            report.sample(self.game)
+            report.sample(self.game)
+            report.end_round("level 1")
+        finally:
+            report.close()
+
+        text = out.getvalue()
+        assert "Memory report for level 1 (2 frames, 2 samples)" in text
+        alien_line = next(line for line in text.splitlines() if line.startswith("Alien "))
+        assert int(alien_line.split()[1]) == 55
+
+    def teardown_method(self):
+        pygame.quit()
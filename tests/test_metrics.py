@@ -0,0 +1,71 @@
+import urllib.request
+import pygame
+from game import Game
+from metrics import EngineMetrics, MetricsServer, format_prometheus
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestMetrics:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+        self.game = Game(800, 600)
+        self.clock = FakeClock()
+        self.metrics = EngineMetrics(clock=self.clock)
+
+    def run_frames(self, count, frame_time):
+        for _ in range(count):
+            self.game.collision_checks += 100
+            self.metrics.publish(self.game)
+            self.clock.now += frame_time
+
+    def test_publish_swaps_in_a_new_snapshot(self):
+        self.run_frames(2, 0.02)
+        first = self.metrics.snapshot
+        self.run_frames(1, 0.02)
+        assert self.metrics.snapshot is not first
+        assert first["frames_total"] == 1 # Never modified after being published
+
+    def test_prometheus_text(self):
+        self.run_frames(121, 1 / 60)
+        text = format_prometheus(self.metrics.snapshot, resident_kb=1024)
+
+        assert "earth_invaders_fps 60.0" in text
+        assert 'earth_invaders_frame_seconds{quantile="0.5"} 0.016667' in text
+        assert 'earth_invaders_sprites{group="aliens"} 55' in text
+        assert "earth_invaders_level 1" in text
+        assert "earth_invaders_resident_memory_bytes 1048576" in text
+        assert "earth_invaders_collision_checks_per_second 6000.0" in text
+
+    def test_idle_frames_leave_the_frame_window(self):
+        self.run_frames(10, 1 / 60)
+        for _ in range(5): # Idle screens at 10 FPS
+            self.metrics.publish(self.game)
+            self.metrics.reset()
+            self.clock.now += 0.1
+        self.run_frames(10, 1 / 60)
+        frame_times = self.metrics.snapshot["frame_times"]
+        assert len(frame_times) == 9 and max(frame_times) < 0.02
+        assert self.metrics.snapshot["frames_total"] == 19
+
+    def test_endpoint_serves_latest_snapshot(self):
+        server = MetricsServer(self.metrics, 0)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.address[1]}/metrics", timeout=5) as response:
+                assert "earth_invaders_up 0" in response.read().decode()
+            self.run_frames(3, 0.02)
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.address[1]}/metrics", timeout=5) as response:
+                assert "earth_invaders_up 1" in response.read().decode()
+        finally:
+            server.close()
+
+    def teardown_method(self):
+        pygame.quit()
@@ -0,0 +1,53 @@
+import pygame
+from obstacle import Obstacle, BLOCK_COLOR, grid
+
+class TestObstacleSurfaceCache:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((100, 100))
+        except pygame.error:
+            print("Warning: Pygame display could not be initialized in TestObstacleSurfaceCache (headless environment?).")
+        self.obstacle = Obstacle(10, 20)
+
+    def local(self, block):
+        return (block.rect.x - self.obstacle.rect.x, block.rect.y - self.obstacle.rect.y)
+
+    def test_cached_surface_matches_blocks(self):
+        assert self.obstacle.surface.get_size() == (len(grid[0]) * 3, len(grid) * 3)
+        block = self.obstacle.blocks_group.sprites()[0]
+        assert self.obstacle.surface.get_at(self.local(block))[:3] == BLOCK_COLOR
+
+    def test_destroyed_block_clears_only_its_region(self):
+        blocks = self.obstacle.blocks_group.sprites()
+        victim, neighbour = blocks[0], blocks[1]
+
+        victim.take_damage(1)
+        assert self.obstacle.surface.get_at(self.local(victim))[:3] == BLOCK_COLOR # Still alive
+
+        victim.take_damage(1)
+        colorkey = self.obstacle.surface.get_colorkey()
+        assert self.obstacle.surface.get_at(self.local(victim)) == colorkey
+        assert self.obstacle.surface.get_at(self.local(neighbour))[:3] == BLOCK_COLOR
+
+    def test_destroy_clears_everything(self):
+        block = self.obstacle.blocks_group.sprites()[-1]
+        self.obstacle.destroy()
+
+        assert len(self.obstacle.blocks_group) == 0
+        assert self.obstacle.surface.get_at(self.local(block)) == self.obstacle.surface.get_colorkey()
+
+    def test_restore_reuses_blocks_at_full_health(self):
+        original = set(self.obstacle.blocks_group)
+        damaged = self.obstacle.blocks_group.sprites()[0]
+        damaged.take_damage(1)
+        self.obstacle.destroy()
+
+        self.obstacle.restore()
+
+        assert set(self.obstacle.blocks_group) == original
+        assert damaged.health == 2
+        assert self.obstacle.surface.get_at(self.local(damaged))[:3] == BLOCK_COLOR
+
+    def teardown_method(self):
+        pygame.quit()
@@ -0,0 +1,40 @@
+from quality_governor import (QualityGovernor, QUALITY_LEVELS, GOVERNOR_WINDOW_FRAMES, RESTORE_WINDOWS,
+                              DEGRADE_COST_RATIO, RESTORE_COST_RATIO)
+
+BUDGET = 1 / 60
+
+class TestQualityGovernor:
+    def setup_method(self):
+        self.governor = QualityGovernor()
+
+    def run_windows(self, count, load):
+        for _ in range(count * GOVERNOR_WINDOW_FRAMES):
+            self.governor.record(load * BUDGET, BUDGET)
+
+    def test_hot_window_sheds_one_step(self):
+        self.run_windows(1, DEGRADE_COST_RATIO + 0.05)
+        assert self.governor.step == 1
+        assert self.governor.level is QUALITY_LEVELS[1]
+
+    def test_sustained_load_stops_at_lowest_level(self):
+        self.run_windows(len(QUALITY_LEVELS) + 3, 1.5)
+        assert self.governor.step == len(QUALITY_LEVELS) - 1
+        assert self.governor.level.explosion_scale == 0
+
+    def test_restores_only_after_a_run_of_cool_windows(self):
+        self.run_windows(2, 1.5)
+        self.run_windows(RESTORE_WINDOWS - 1, RESTORE_COST_RATIO - 0.1)
+        assert self.governor.step == 2
+        self.run_windows(1, (DEGRADE_COST_RATIO + RESTORE_COST_RATIO) / 2) # In between holds and restarts the run
+        self.run_windows(RESTORE_WINDOWS - 1, RESTORE_COST_RATIO - 0.1)
+        assert self.governor.step == 2
+        self.run_windows(1, RESTORE_COST_RATIO - 0.1)
+        assert self.governor.step == 1
+
+    def test_alternating_load_does_not_oscillate(self):
+        for _ in range(20):
+            self.run_windows(1, 1.2)
+            self.run_windows(1, 0.2)
+        changes_at_bottom = self.governor.changes
+        assert self.governor.step == len(QUALITY_LEVELS) - 1
+        assert changes_at_bottom == len(QUALITY_LEVELS) - 1 # Only ever stepped down
@@ -0,0 +1,43 @@
+import pygame
+from render_pipeline import RenderPipeline
+
+class TestRenderPipeline:
+    def setup_method(self):
+        pygame.init()
+
+    def test_blit_mode_letterboxes_at_whole_multiples_for_nearest(self):
+        pipeline = RenderPipeline((100, 50), window_size=(350, 200), mode="blit", quality="nearest")
+
+        assert pipeline.surface.get_size() == (100, 50)
+        assert pipeline.dest_rect.size == (300, 150)
+        assert pipeline.dest_rect.center == (175, 100)
+
+    def test_blit_mode_uses_fractional_scale_for_smooth_filtering(self):
+        pipeline = RenderPipeline((100, 50), window_size=(350, 200), mode="blit", quality="linear")
+
+        assert pipeline.dest_rect.size == (350, 175)
+
+    def test_present_fills_letterbox_area_only(self):
+        pipeline = RenderPipeline((10, 10), window_size=(40, 20), mode="blit", quality="nearest")
+        pipeline.surface.fill((255, 0, 0))
+
+        pipeline.present()
+
+        window = pygame.display.get_surface()
+        assert window.get_at((20, 10))[:3] == (255, 0, 0) # Inside the 20x20 playfield
+        assert window.get_at((2, 10))[:3] == (0, 0, 0) # Letterbox bar
+
+    def test_native_mode_draws_straight_to_the_window(self):
+        pipeline = RenderPipeline((120, 80), mode="native")
+
+        assert pipeline.surface is pygame.display.get_surface()
+
+    def test_rejects_unknown_mode(self):
+        try:
+            RenderPipeline((10, 10), mode="stretch")
+        except ValueError:
+            return
+        assert False, "Unknown scale modes should be rejected."
+
+    def teardown_method(self):
+        pygame.quit()
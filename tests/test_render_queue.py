@@ -0,0 +1,42 @@
+import pygame
+from game import Game
+from render_queue import RenderQueue, queue_game_scene
+
+class TestRenderQueue:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+        self.game = Game(800, 600)
+        self.queue = RenderQueue()
+
+    def test_scene_collects_every_sprite_once(self):
+        queue_game_scene(self.queue, self.game)
+
+        # Spaceship, aliens and one cached surface per obstacle; nothing else alive yet
+        expected = 1 + len(self.game.aliens_group) + len(self.game.obstacles)
+        assert len(self.queue) == expected
+
+    def test_blinking_spaceship_is_skipped(self):
+        self.game.spaceship_group.sprite.blink_on = False
+        queue_game_scene(self.queue, self.game)
+
+        surfaces = [surface for surface, _ in self.queue.items]
+        assert self.game.spaceship_group.sprite.image not in surfaces
+
+    def test_flush_blits_and_empties_queue(self):
+        target = pygame.Surface((20, 20))
+        red = pygame.Surface((5, 5))
+        red.fill((255, 0, 0))
+        self.queue.add(red, red.get_rect(topleft=(10, 10)))
+
+        self.queue.flush(target)
+
+        assert len(self.queue) == 0
+        assert target.get_at((12, 12))[:3] == (255, 0, 0)
+        assert target.get_at((2, 2))[:3] == (0, 0, 0)
+
+    def teardown_method(self):
+        pygame.quit()
@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+from sampling_profiler import SamplingProfiler
+
+class Busy:
+    def update(self):
+        deadline = time.perf_counter() + 0.2
+        total = 0
+        while time.perf_counter() < deadline:
+            total += 1
+        return total
+
+class OtherBusy(Busy):
+    def update(self):
+        return super().update()
+
+class TestSamplingProfiler:
+    def test_samples_attribute_frames_to_methods(self, tmp_path):
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        Busy().update()
+        profiler.stop()
+
+        assert profiler.samples > 0
+        assert any(stack.endswith("test_sampling_profiler.py:Busy.update") for stack in profiler.stacks)
+
+        path = profiler.write(str(tmp_path))
+        with open(path) as profile_file:
+            line = profile_file.readline()
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
+
+    def test_methods_keep_their_class_without_co_qualname(self):
+        profiler = SamplingProfiler(interval=0.001)
+        profiler._qualnames = False # As on Python 3.10, where labels come from `self`
+        profiler.start()
+        OtherBusy().update()
+        profiler.stop()
+
+        labels = {label for stack in profiler.stacks for label in stack.split(";")}
+        assert "test_sampling_profiler.py:OtherBusy.update" in labels
+        assert "test_sampling_profiler.py:Busy.update" not in labels # Busy.update ran with an OtherBusy self
+        assert "test_sampling_profiler.py:update" not in labels
+
+    def test_samples_another_thread(self):
+        worker = threading.Thread(target=Busy().update, name="simulation")
+        worker.start()
+        profiler = SamplingProfiler(interval=0.001, thread_id=worker.ident)
+        profiler.start()
+        worker.join()
+        profiler.stop()
+
+        assert any(stack.endswith("test_sampling_profiler.py:Busy.update") for stack in profiler.stacks)
+        assert not any("test_samples_another_thread" in stack for stack in profiler.stacks)
+
+    def test_cprofile_fallback_writes_caller_callee_pairs(self, tmp_path):
+        profiler = SamplingProfiler(sampling=False)
+        profiler.start()
+        Busy().update()
+        profiler.stop()
+
+        assert any(stack.split(";")[-1] == "test_sampling_profiler.py:update" for stack in profiler.stacks)
+        assert all(stack.count(";") <= 1 for stack in profiler.stacks)
+        assert os.path.getsize(profiler.write(str(tmp_path))) > 0
@@ -0,0 +1,99 @@
+import socket
+import time
+from score_client import ScoreClient
+from score_server import ScoreServer
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def unused_url():
+    # A port nothing is listening on, so connecting fails straight away
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{probe.getsockname()[1]}"
+
+class TestScoreClient:
+    def setup_method(self):
+        self.server = ScoreServer()
+        self.clock = FakeClock()
+
+    def make_client(self, tmp_path, url=None, **kwargs):
+        return ScoreClient(url or self.server.url, journal_path=str(tmp_path / "journal.jsonl"),
+                           threaded=False, clock=self.clock, **kwargs)
+
+    def test_batches_share_one_keep_alive_connection(self, tmp_path):
+        client = self.make_client(tmp_path, batch_size=50)
+        for score in range(120):
+            client.submit(score, "kiosk-1", level=1)
+        client.pump()
+
+        stats = self.server.leaderboard.stats()
+        assert stats["submissions"] == 120 and stats["requests"] == 3
+        assert client.pool.opened == 1 and stats["connections"] == 1
+        assert client.sent == 120 and client.backlog == 0
+        assert self.server.leaderboard.top(1)[0]["score"] == 119
+        client.close()
+
+    def test_journal_keeps_scores_until_the_server_is_back(self, tmp_path):
+        url = unused_url()
+        client = self.make_client(tmp_path, url=url)
+        client.submit(4200, "kiosk-1")
+        client.pump() # Journaled, then the send fails
+        assert client.failures == 1 and client.backlog == 1
+        client.close()
+
+        restarted = self.make_client(tmp_path) # Next launch, leaderboard reachable
+        assert restarted.backlog == 1
+        restarted.pump()
+        assert [entry["score"] for entry in self.server.leaderboard.top(5)] == [4200]
+        restarted.close()
+        assert self.make_client(tmp_path).backlog == 0 # Acked, so not sent a third time
+
+    def test_backoff_grows_while_sends_fail(self, tmp_path):
+        client = self.make_client(tmp_path, url=unused_url())
+        client.submit(1, "kiosk-1")
+        delays = []
+        for _ in range(4):
+            client.pump()
+            delays.append(client._retry_at - self.clock.now)
+            self.clock.now = client._retry_at
+        assert client.failures == 4
+        assert delays == sorted(delays) and delays[-1] > delays[0]
+
+        client.pump() # Not due yet: no new attempt
+        self.clock.now -= 0.001
+        client.pump()
+        assert client.failures == 5
+        client.close()
+
+    def test_retry_after_lost_reply_is_not_counted_twice(self, tmp_path):
+        client = self.make_client(tmp_path)
+        self.server.lost_reply_rate = 1.0 # Recorded, but answered with 503
+        client.submit(300, "kiosk-1")
+        client.submit(500, "kiosk-1")
+        client.pump()
+        assert client.failures == 1 and client.backlog == 2
+
+        self.server.lost_reply_rate = 0.0
+        self.clock.now = client._retry_at
+        client.pump()
+        stats = self.server.leaderboard.stats()
+        assert stats["submissions"] == 2 and stats["duplicates"] == 2
+        assert client.duplicates == 2 and client.backlog == 0
+        client.close()
+
+    def test_submit_never_waits_on_the_network(self, tmp_path):
+        self.server.close()
+        self.server = ScoreServer(latency_s=0.5) # A slow leaderboard
+        client = ScoreClient(self.server.url, journal_path=str(tmp_path / "journal.jsonl"), threaded=True)
+        started = time.perf_counter()
+        client.submit(10, "kiosk-1")
+        assert time.perf_counter() - started < 0.05
+        client.close()
+
+    def teardown_method(self):
+        self.server.close()
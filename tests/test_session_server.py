@@ -0,0 +1,74 @@
+import asyncio
+import io
+import json
+import pygame
+from session_server import SessionServer, RemoteInput, simulate
+
+class TestSessionServer:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+
+    def test_remote_input_maps_key_names(self):
+        remote = RemoteInput()
+        remote.set_held(["left", "fire", "bogus"])
+        held = remote.pressed()
+        assert held[pygame.K_LEFT] and held[pygame.K_SPACE] and not held[pygame.K_RIGHT]
+
+    def test_simulated_players_get_state_streams(self):
+        async def scenario():
+            server = SessionServer(port=0, tick_hz=30, report_every=0)
+            await server.start()
+            results = await simulate(3, 1.0, port=server.port, out=io.StringIO())
+            ticks = server.stats.ticks
+            await server.close()
+            return results, ticks
+
+        results, ticks = asyncio.run(scenario())
+        assert results["states"] >= 3 * 15
+        assert results["errors"] == 0 and results["rejected"] == 0
+        assert ticks >= 3 * 15
+
+    def test_full_server_rejects_new_sessions(self):
+        async def scenario():
+            server = SessionServer(port=0, tick_hz=30, max_sessions=1, report_every=0)
+            await server.start()
+            results = await simulate(2, 0.5, port=server.port, out=io.StringIO())
+            await server.close()
+            return results, server.stats.sessions_closed
+
+        results, closed = asyncio.run(scenario())
+        assert results["rejected"] == 1
+        assert closed["rejected"] == 1
+
+    def test_bad_messages_close_the_session_cleanly(self):
+        async def send(line):
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            welcome = json.loads(await reader.readline())
+            writer.write(line + b"\n")
+            while True:
+                reply = json.loads(await reader.readline())
+                if reply["type"] == "error":
+                    writer.close()
+                    return welcome, reply
+
+        async def scenario():
+            nonlocal server
+            server = SessionServer(port=0, tick_hz=30, report_every=0, seed=5)
+            await server.start()
+            replies = [await send(line) for line in
+                       (b"[]", b"1", b'"x"', b'{"type":"input","held":[["left"]]}', b'{"type":"input","held":"left"}')]
+            await server.close()
+            return replies
+
+        server = None
+        replies = asyncio.run(scenario())
+        assert all(reply["reason"] for _, reply in replies)
+        assert server.stats.sessions_closed["bad message"] == 5
+        assert all(isinstance(welcome["seed"], int) for welcome, _ in replies)
+
+    def teardown_method(self):
+        pygame.quit()
@@ -0,0 +1,89 @@
+import time
+import pygame
+from game import Game
+from input_provider import ScriptedInput, KeyboardInput
+from render_queue import RenderQueue, queue_game_scene
+from sim_thread import SceneRecorder, SimulationThread
+
+class TestSimThread:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+        self.input = ScriptedInput([])
+        self.game = Game(800, 600, input_provider=self.input)
+
+    def test_snapshot_draws_like_the_render_queue(self):
+        snapshot = SceneRecorder().capture(self.game)
+        queue = RenderQueue()
+        queue_game_scene(queue, self.game)
+        assert [(rect.topleft, surface.get_size()) for surface, rect in queue.items] == \
+            [(position, surface.get_size()) for surface, position in snapshot.items]
+
+    def test_snapshot_unchanged_by_later_updates(self):
+        recorder = SceneRecorder()
+        snapshot = recorder.capture(self.game)
+        positions = [position for _, position in snapshot.items]
+        obstacle = self.game.obstacles[0]
+        frozen = next(surface for surface, position in snapshot.items if position == obstacle.rect.topleft)
+        corner = obstacle.blocks[0].rect.move(-obstacle.rect.x, -obstacle.rect.y).topleft
+        before = frozen.get_at(corner)
+
+        for _ in range(5):
+            self.game.update()
+        obstacle.blocks[0].take_damage(10) # Clears its pixels on the live obstacle surface
+
+        assert [position for _, position in snapshot.items] == positions
+        assert frozen.get_at(corner) == before
+        assert obstacle.surface.get_at(corner) != before
+        next_snapshot = recorder.capture(self.game)
+        assert all(surface is not frozen for surface, _ in next_snapshot.items) # Re-copied once it changed
+
+    def test_updates_only_while_active(self):
+        simulation = SimulationThread(self.game, self.input)
+        simulation.step()
+        assert simulation.updates == 0 and simulation.snapshot.tick == 1
+        simulation.active = True
+        simulation.step()
+        assert simulation.updates == 1 and simulation.snapshot.tick == 2
+
+    def test_after_update_sees_what_the_update_cost(self):
+        costs = []
+        simulation = SimulationThread(self.game, self.input,
+                                      after_update=lambda game: costs.append(simulation.last_update_seconds))
+        simulation.active = True
+        simulation.step()
+        simulation.step()
+        assert len(costs) == 2 and all(cost > 0 for cost in costs)
+        assert costs[-1] == simulation.last_update_seconds
+
+    def test_runs_on_its_own_thread_at_a_fixed_rate(self):
+        simulation = SimulationThread(self.game, self.input, rate_hz=100)
+        simulation.start()
+        simulation.run(setattr, simulation, "active", True)
+        time.sleep(0.25)
+        simulation.stop()
+        assert 10 <= simulation.updates <= 30
+        assert simulation.snapshot.tick == simulation.ticks
+
+    def test_run_happens_between_ticks_and_is_visible_at_once(self):
+        simulation = SimulationThread(self.game, self.input)
+        simulation.start()
+        def set_score():
+            self.game.score = 1234
+            return "done"
+        assert simulation.run(set_score) == "done"
+        assert simulation.snapshot.score == 1234 # Republished before run() returned
+        simulation.stop()
+
+    def test_menu_keys_come_back_from_the_simulation_thread(self):
+        simulation = SimulationThread(self.game, KeyboardInput())
+        simulation.post_events([pygame.event.Event(pygame.KEYDOWN, key=pygame.K_p)])
+        simulation.step()
+        assert simulation.take_keys() == [pygame.K_p]
+        assert simulation.take_keys() == []
+
+    def teardown_method(self):
+        pygame.quit()
@@ -0,0 +1,52 @@
+import pygame
+import pytest
+from game import Game
+from bomb import Bomb
+from state_codec import StateEncoder, StateDecoder, capture, pack_bits, unpack_bits, KEYFRAME, DELTA
+
+class TestStateCodec:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+        self.game = Game(800, 600)
+
+    def test_bits_round_trip(self):
+        bits = (True, False, False, True, True, False, True, False, True)
+        assert len(pack_bits(bits)) == 2
+        assert unpack_bits(pack_bits(bits), len(bits)) == bits
+
+    def test_keyframe_then_deltas_round_trip(self):
+        encoder, decoder = StateEncoder(keyframe_interval=10), StateDecoder()
+        frames = []
+
+        states = [capture(self.game, 0)]
+        self.game.move_aliens()
+        states.append(capture(self.game, 1))
+        victim = self.game.aliens_group.sprites()[3]
+        victim.kill()
+        self.game.obstacles[1].blocks_group.sprites()[0].take_damage(2)
+        self.game.bombs_group.add(Bomb((100, 100), 5, 600))
+        self.game.score = 10
+        self.game.move_aliens()
+        states.append(capture(self.game, 2))
+
+        for state in states:
+            frames.append(encoder.encode(state))
+            assert decoder.decode(frames[-1]) == state
+
+        assert frames[0][0] == KEYFRAME and frames[1][0] == DELTA
+        assert len(frames[1]) < 16 # Only the formation shift changed
+        assert len(frames[2]) < len(frames[0]) / 2
+
+    def test_delta_needs_a_keyframe_first(self):
+        encoder = StateEncoder()
+        encoder.encode(capture(self.game, 0))
+        delta = encoder.encode(capture(self.game, 1))
+        with pytest.raises(ValueError):
+            StateDecoder().decode(delta)
+
+    def teardown_method(self):
+        pygame.quit()
@@ -0,0 +1,49 @@
+import io
+import random
+import pygame
+from game import Game
+from state_digest import verify, snapshot, diff, FrameClock
+
+class DriftingGame(Game):
+    # Behaves like Game until its 40th frame, then nudges one alien lower
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.frames = 0
+
+    def update(self):
+        super().update()
+        self.frames += 1
+        if self.frames == 40:
+            self.aliens_group.sprites()[0].rect.y += 1
+
+class TestStateDigest:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+
+    def test_same_seed_replays_identically(self):
+        assert verify(Game, Game, 200, seed=5, out=io.StringIO()) is None
+
+    def test_reports_first_diverging_frame_and_state(self):
+        out = io.StringIO()
+        assert verify(Game, DriftingGame, 200, seed=5, out=out) == 40
+        report = out.getvalue()
+        assert "Diverged at frame 40" in report and "aliens[" in report
+
+    def test_digest_tracks_block_health_and_timers(self):
+        game = Game(800, 600, clock=FrameClock(), rng=random.Random(1))
+        before = game.state_digest()
+        reference = snapshot(game)
+        game.obstacles[0].blocks[0].health -= 1
+        assert game.state_digest() != before
+        assert diff(reference, snapshot(game)) == ["blocks[0][0]: reference 2, candidate 1"]
+
+        before = game.state_digest()
+        game.timers.call_later(500, lambda: None)
+        assert game.state_digest() != before
+
+    def teardown_method(self):
+        pygame.quit()
@@ -0,0 +1,112 @@
+import glob
+import gzip
+import json
+import os
+import shutil
+import pygame
+from game import Game
+from bomb import Bomb
+from telemetry import Telemetry
+
+TEST_TELEMETRY_DIR = "test_telemetry_output"
+
+def read_events(directory):
+    events = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.jsonl.gz"))):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            events.extend(json.loads(line) for line in f)
+    return events
+
+class TestTelemetry:
+    def setup_method(self):
+        shutil.rmtree(TEST_TELEMETRY_DIR, ignore_errors=True)
+
+    def test_emit_does_no_io_until_flushed(self):
+        telemetry = Telemetry(TEST_TELEMETRY_DIR, capacity=16, threaded=False)
+        telemetry.emit("shot_fired", x=10)
+        assert not os.path.exists(TEST_TELEMETRY_DIR)
+
+        telemetry.close()
+        events = read_events(TEST_TELEMETRY_DIR)
+        assert len(events) == 1
+        assert events[0]["event"] == "shot_fired" and events[0]["x"] == 10
+
+    def test_overrun_drops_oldest_events(self):
+        telemetry = Telemetry(TEST_TELEMETRY_DIR, capacity=8, threaded=False)
+        for i in range(20):
+            telemetry.emit("alien_killed", n=i)
+        telemetry.close()
+
+        events = read_events(TEST_TELEMETRY_DIR)
+        assert [e["n"] for e in events] == list(range(12, 20))
+        assert telemetry.dropped == 12
+
+    def test_threaded_writer_flushes_on_close(self):
+        telemetry = Telemetry(TEST_TELEMETRY_DIR, threaded=True)
+        for i in range(100):
+            telemetry.emit("shot_fired", x=i)
+        telemetry.close()
+
+        assert len(read_events(TEST_TELEMETRY_DIR)) == 100
+
+    def test_capacity_must_be_power_of_two(self):
+        try:
+            Telemetry(TEST_TELEMETRY_DIR, capacity=100, threaded=False)
+        except ValueError:
+            return
+        assert False, "Non power-of-two capacity should be rejected."
+
+    def teardown_method(self):
+        shutil.rmtree(TEST_TELEMETRY_DIR, ignore_errors=True)
+
+class RecordingTelemetry:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, kind, **fields):
+        self.events.append((kind, fields))
+
+    def kinds(self):
+        return [kind for kind, _ in self.events]
+
+class TestGameTelemetry:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+        self.telemetry = RecordingTelemetry()
+        self.game = Game(800, 600, telemetry=self.telemetry)
+
+    def test_bomb_death_reports_cause(self):
+        player_ship = self.game.spaceship_group.sprite
+        self.game.bombs_group.add(Bomb(position=player_ship.rect.center, speed=5, screen_height=600))
+
+        self.game.check_hostile_projectile_collisions()
+
+        assert ("player_died", {"cause": "bomb", "lives": 2, "score": 0}) in self.telemetry.events
+
+    def test_bomb_on_obstacle_reports_shield_destroyed(self):
+        first_block = self.game.obstacles[2].blocks_group.sprites()[0]
+        self.game.bombs_group.add(Bomb(position=first_block.rect.center, speed=5, screen_height=600))
+
+        self.game.check_hostile_projectile_collisions()
+
+        kinds = self.telemetry.kinds()
+        assert "shield_destroyed" in kinds
+        assert self.telemetry.events[kinds.index("shield_destroyed")][1]["obstacle"] == 2
+
+    def test_extra_life_and_round_clear_are_reported(self):
+        self.game.score = 1000
+        self.game._check_and_award_extra_life()
+        self.game.aliens_group.empty()
+        assert self.game.check_round_clear()
+
+        assert self.telemetry.kinds() == ["extra_life", "round_cleared"]
+
+    def test_spaceship_shots_are_reported(self):
+        assert self.game.spaceship_group.sprite.telemetry is self.telemetry
+
+    def teardown_method(self):
+        pygame.quit()
@@ -0,0 +1,130 @@
+import time
+import pygame
+from timers import TimerScheduler
+from game import Game
+from input_provider import ScriptedInput
+from explosion import Explosion
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+class TestTimers:
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.timers = TimerScheduler(self.clock)
+        self.fired = []
+
+    def test_fires_due_timers_in_deadline_order(self):
+        self.timers.call_later(300, lambda: self.fired.append("c"))
+        self.timers.call_later(100, lambda: self.fired.append("a"))
+        self.timers.call_later(100, lambda: self.fired.append("b"))
+        self.clock.now = 99
+        assert self.timers.advance() == 0
+        self.clock.now = 150
+        assert self.timers.advance() == 2
+        assert self.fired == ["a", "b"]
+
+    def test_cancelled_timer_never_fires(self):
+        timer = self.timers.call_later(10, lambda: self.fired.append("x"))
+        timer.cancel()
+        self.clock.now = 20
+        assert self.timers.advance() == 0 and not self.fired
+
+    def test_pause_freezes_every_timer(self):
+        self.timers.call_later(100, lambda: self.fired.append("a"))
+        self.clock.now = 50
+        self.timers.pause()
+        self.clock.now = 5000
+        self.timers.advance()
+        assert not self.fired and self.timers.now() == 50
+        self.timers.resume()
+        self.clock.now = 5049
+        self.timers.advance()
+        assert not self.fired
+        self.clock.now = 5050
+        self.timers.advance()
+        assert self.fired == ["a"]
+
+class TestGameTimers:
+    def setup_method(self):
+        pygame.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+        self.clock = FakeClock()
+        self.game = Game(800, 600, clock=self.clock)
+
+    def test_respawn_and_invincibility_follow_the_game_clock(self):
+        game = self.game
+        game.lives = 2
+        game.spaceship_group.sprite.kill()
+        game._respawn_timer = game.timers.call_later(game.respawn_delay_ms, game.handle_spaceship_respawn)
+
+        self.clock.now = game.respawn_delay_ms - 1
+        game.timers.advance()
+        assert not game.spaceship_group.sprite
+        self.clock.now = game.respawn_delay_ms
+        game.timers.advance()
+        ship = game.spaceship_group.sprite
+        assert ship and ship.invincible
+
+        game.timers.pause()
+        self.clock.now += 10 * ship.invincible_duration_ms
+        game.timers.advance()
+        assert ship.invincible # Paused time doesn't count
+        game.timers.resume()
+        self.clock.now += ship.invincible_duration_ms
+        game.timers.advance()
+        assert not ship.invincible and ship.blink_on
+
+    def test_explosions_expire_without_being_updated(self):
+        game = self.game
+        game._add_explosion((100, 100), pygame.Surface((10, 10)), duration=200)
+        assert len(game.explosions_group) == 1
+        self.clock.now = 201
+        game.timers.advance()
+        assert len(game.explosions_group) == 0
+
+    def teardown_method(self):
+        pygame.quit()
+
+class TestGameWithoutTimerSubsystem:
+    # main.py only starts the display and font subsystems, so pygame.time.get_ticks() stays at 0
+    def setup_method(self):
+        pygame.display.init()
+        pygame.font.init()
+        try:
+            pygame.display.set_mode((800, 600))
+        except pygame.error as e:
+            print(f"Warning: Pygame display could not be initialized: {e}. Graphics-dependent tests might fail.")
+        self.input = ScriptedInput([(1, [pygame.K_SPACE])])
+        self.game = Game(800, 600, input_provider=self.input)
+
+    def test_fired_laser_recharges(self):
+        ship = self.game.spaceship_group.sprite
+        self.input.begin_frame([])
+        self.game.update()
+        assert not ship.laser_ready and len(ship.lasers_group) == 1
+
+        deadline = time.perf_counter() + 2.0
+        while not ship.laser_ready and time.perf_counter() < deadline:
+            time.sleep(0.02)
+            self.input.begin_frame([])
+            self.game.update()
+        assert ship.laser_ready
+        assert pygame.time.get_ticks() == 0 # Recharged on the default clock, not SDL's
+
+    def test_explosion_without_timers_expires(self):
+        explosion = Explosion((100, 100), pygame.Surface((10, 10)), duration=20)
+        group = pygame.sprite.Group(explosion)
+        time.sleep(0.05)
+        group.update()
+        assert not group
+
+    def teardown_method(self):
+        pygame.quit()